@@ -0,0 +1,108 @@
+"""
+Estado agregado del corpus para el procesamiento en streaming.
+
+Cada artículo se incorpora a `CorpusAggregate` en cuanto sale de la etapa de
+NLP y después se descarta, de modo que la memoria crece con el vocabulario y
+no con el tamaño total del corpus. Los enlaces de cada artículo se guardan
+como identificadores enteros de una tabla de títulos (`titles.TitleTable`). Los agregados se pueden combinar con
+`merge` y guardar en disco, para reunir los resultados parciales de varios
+procesos o ejecuciones.
+
+Con `sketch`, las frecuencias de palabras, bigramas y co-ocurrencias se cuentan
+de forma aproximada con memoria acotada (`sketches`).
+"""
+import pickle
+from collections import Counter
+
+import numpy as np
+
+from cooccurrence import CooccurrenceCounter
+from sketches import SketchCooccurrenceCounter, SketchCounter
+from titles import TitleTable
+
+
+class CorpusAggregate:
+    """
+    Frecuencias globales de palabras, co-ocurrencias y bigramas, y enlaces por artículo.
+
+    Parámetros:
+    - window_sizes (Iterable[int]): Tamaños de ventana de co-ocurrencia a contar.
+    - base_url (str): URL base de los artículos enlazados.
+    - sketch (dict): Si se indica, parámetros de `sketches.SketchCounter`
+      (memory_mb, depth, capacity, sample_size, seed) para contar de forma aproximada.
+    """
+
+    def __init__(self, window_sizes=(5,), base_url='https://en.wikipedia.org', sketch=None):
+        self.articles = 0
+        self.sketch = sketch
+        if sketch is None:
+            self.word_freq = Counter()
+            self.bigram_freq = Counter()
+            self.cooccurrence = CooccurrenceCounter(window_sizes=window_sizes)
+        else:
+            self.word_freq = SketchCounter(**sketch)
+            self.bigram_freq = SketchCounter(**sketch)
+            self.cooccurrence = SketchCooccurrenceCounter(window_sizes=window_sizes, **sketch)
+        self.titles = TitleTable(base_url)
+        self.links_data = {}  # Identificador del artículo -> array de identificadores enlazados
+
+    def add_article(self, url, words, bigrams, links):
+        """
+        Incorpora los resultados de un artículo.
+        """
+        self.articles += 1
+        self.word_freq.update(words)
+        self.cooccurrence.add(words)
+        self.bigram_freq.update(bigrams)
+        self.links_data[self.titles.intern(url)] = self.titles.intern_many(links)
+
+    def remove_article(self, url, words, bigrams):
+        """
+        Resta los resultados que un artículo aportó con `add_article` (para
+        sustituirlos por los de una revisión nueva o eliminar el artículo).
+        """
+        if self.sketch is not None:
+            raise ValueError("El conteo aproximado no admite restar artículos; use el conteo exacto.")
+        self.articles -= 1
+        self.word_freq.subtract(words)
+        self.cooccurrence.subtract(words)
+        self.bigram_freq.subtract(bigrams)
+        for counter, items in ((self.word_freq, words), (self.bigram_freq, bigrams)):
+            for item in set(items):
+                if counter[item] <= 0:
+                    del counter[item]
+        self.links_data.pop(self.titles.intern(url), None)
+
+    def merge(self, other):
+        """
+        Combina en este agregado otro agregado parcial (p. ej. de otro proceso).
+        """
+        self.articles += other.articles
+        if self.sketch is None:
+            self.word_freq.update(other.word_freq)
+            self.bigram_freq.update(other.bigram_freq)
+        else:
+            self.word_freq.merge(other.word_freq)
+            self.bigram_freq.merge(other.bigram_freq)
+        self.cooccurrence.merge(other.cooccurrence)
+        mapping = self.titles.merge(other.titles)
+        self.links_data.update(
+            (int(mapping[source]), np.unique(mapping[targets])) for source, targets in other.links_data.items()
+        )
+        return self
+
+    def edge_freq(self, window_size=5):
+        """
+        Retorna:
+        - collections.Counter: Pesos de co-ocurrencia {(palabra1, palabra2): peso}.
+        """
+        return self.cooccurrence.to_counter(window_size)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
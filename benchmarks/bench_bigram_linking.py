@@ -0,0 +1,89 @@
+"""
+Compara la conexión de bigramas que comparten una palabra mediante la
+comparación de todos los pares (bucle original de `pipeline.main`) con el
+índice invertido de `pipeline.shared_word_bigram_pairs`, y comprueba que
+generan los mismos pares en el mismo orden.
+
+Los bigramas se sintetizan combinando palabras de la red publicada en
+`data/words/words_bigrams_nodes.csv` según su frecuencia.
+
+Uso:
+    python benchmarks/bench_bigram_linking.py --sizes 150 1000 5000 20000 50000
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pipeline import shared_word_bigram_pairs
+
+
+def load_bigrams(num_bigrams, seed=0):
+    """
+    Genera `num_bigrams` bigramas distintos muestreando las palabras de la red
+    publicada según su frecuencia, ordenados como `most_common`.
+    """
+    words, freqs = [], []
+    with open(os.path.join(ROOT, 'data/words/words_bigrams_nodes.csv'), encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            if row['Group'] == 'word':
+                words.append(row['Label'])
+                freqs.append(int(row['Attribute']))
+    rng = np.random.default_rng(seed)
+    probabilities = np.array(freqs, dtype=float) / sum(freqs)
+    bigrams = {}
+    while len(bigrams) < num_bigrams:
+        first, second = rng.choice(len(words), size=(2, num_bigrams), p=probabilities)
+        for i, j in zip(first.tolist(), second.tolist()):
+            if i != j:
+                bigrams.setdefault(f"{words[i]} {words[j]}", None)
+    return list(bigrams)[:num_bigrams]
+
+
+def pairs_original(bigrams):
+    pairs = []
+    for i in range(len(bigrams)):
+        for j in range(i + 1, len(bigrams)):
+            bigram1 = bigrams[i]
+            bigram2 = bigrams[j]
+            words1 = set(bigram1.split())
+            words2 = set(bigram2.split())
+            if words1.intersection(words2):
+                pairs.append((bigram1, bigram2))
+    return pairs
+
+
+def measure(function, bigrams):
+    start = time.perf_counter()
+    result = function(bigrams)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[150, 1000, 5000, 20000, 50000],
+                        help="Valores de TOP_N_BIGRAMS a medir")
+    parser.add_argument('--max-original', type=int, default=5000,
+                        help="Tamaño máximo para el que se ejecuta el bucle original")
+    args = parser.parse_args()
+
+    print(f"{'Bigramas':>9} {'Pares':>11} {'Original (s)':>13} {'Índice (s)':>11} {'Idénticos':>10}")
+    for size in args.sizes:
+        bigrams = load_bigrams(size)
+        indexed, t_indexed = measure(lambda b: list(shared_word_bigram_pairs(b)), bigrams)
+        if size <= args.max_original:
+            original, t_original = measure(pairs_original, bigrams)
+            t_original, identical = f"{t_original:.2f}", str(original == indexed)
+        else:
+            t_original, identical = '-', '-'
+        print(f"{size:>9} {len(indexed):>11} {t_original:>13} {t_indexed:>11.2f} {identical:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Compara la detección de comunidades de `src/greedy_mod.py`
+(`greedy_modularity_communities` de NetworkX, sin pesos) con Louvain y la
+propagación de etiquetas ponderadas de `src/community.py` en las redes
+publicadas: tiempo, número de comunidades y modularidad ponderada.
+
+Uso:
+    python benchmarks/bench_community.py --seed 42
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from networkx.algorithms.community import greedy_modularity_communities
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import community
+import graph_store
+
+NETWORKS = {
+    'words_bigrams': ('data/words/words_bigrams_nodes.csv', 'data/words/words_bigrams_edges.csv'),
+    'links': ('data/links/links_nodes.csv', 'data/links/links_edges.csv'),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skip-greedy', action='store_true', help="No ejecutar greedy_modularity_communities")
+    args = parser.parse_args()
+
+    print(f"{'Red':>14} {'Método':>12} {'Tiempo (s)':>11} {'Comunidades':>12} {'Modularidad':>12}")
+    for name, (nodes_path, edges_path) in NETWORKS.items():
+        nodos_df, aristas_df = graph_store.cargar_datos(os.path.join(ROOT, nodes_path), os.path.join(ROOT, edges_path))
+        origenes, destinos, pesos = community.cargar_aristas(nodos_df, aristas_df)
+        matriz = community.matriz_simetrica(origenes, destinos, pesos, len(nodos_df))
+
+        resultados = {}
+        if not args.skip_greedy:
+            start = time.perf_counter()
+            G = graph_store.construir_grafo(nodos_df, aristas_df)
+            comunidades = greedy_modularity_communities(G)
+            elapsed = time.perf_counter() - start
+            posicion = {node_id: i for i, node_id in enumerate(nodos_df['Id'].tolist())}
+            clases = np.empty(len(nodos_df), dtype=np.int64)
+            for clase, comunidad_nodos in enumerate(comunidades):
+                clases[[posicion[node_id] for node_id in comunidad_nodos]] = clase
+            resultados['greedy (nx)'] = (elapsed, clases)
+        for metodo in community.METODOS:
+            start = time.perf_counter()
+            if metodo == 'louvain':
+                clases = community.louvain(*matriz, semilla=args.seed)
+            else:
+                clases = community.propagacion_etiquetas(*matriz, semilla=args.seed)
+            resultados[metodo] = (time.perf_counter() - start, clases)
+
+        for metodo, (elapsed, clases) in resultados.items():
+            q = community.modularidad(*matriz, clases)
+            print(f"{name:>14} {metodo:>12} {elapsed:>11.2f} {int(clases.max()) + 1:>12} {q:>12.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Compara el informe de comunidades original de `src/top_modularity.py` (un
+filtrado y una ordenación completa de la tabla por cada comunidad) con el
+informe en una sola pasada agrupada de `src/community_report.py`, sobre una
+tabla de nodos sintética con muchas comunidades.
+
+Uso:
+    python benchmarks/bench_community_report.py --nodes 1000000 --classes 1000 2000 5000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import community_report
+
+
+def top_por_clase_original(df, k=10):
+    # Bucle de la versión original, aplicado a todas las comunidades
+    tops = []
+    grupos = df.groupby('modularity_class').size().reset_index(name='size')
+    for _, row in grupos.sort_values(by='size', ascending=False).iterrows():
+        grupo = df[df['modularity_class'] == row['modularity_class']]
+        tops.append(grupo.sort_values(by='degree', ascending=False).head(k))
+    return tops
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nodes', type=int, default=1_000_000)
+    parser.add_argument('--classes', type=int, nargs='+', default=[100, 1000, 5000])
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--chunksize', type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'Comunidades':>12} {'Original (s)':>13} {'Agrupado (s)':>13} {'Por bloques (s)':>16}")
+    with tempfile.TemporaryDirectory() as directory:
+        for num_classes in args.classes:
+            df = pd.DataFrame({
+                'Id': np.arange(args.nodes),
+                'Label': [f"nodo_{i}" for i in range(args.nodes)],
+                'modularity_class': rng.integers(0, num_classes, args.nodes),
+                'degree': rng.integers(1, 1000, args.nodes),
+            })
+            path = os.path.join(directory, 'metrics_nodes.csv')
+            df.to_csv(path, index=False)
+
+            start = time.perf_counter()
+            top_por_clase_original(df, args.k)
+            t_original = time.perf_counter() - start
+            start = time.perf_counter()
+            community_report.resumir([df], metricas=['degree'], k=args.k)
+            t_grouped = time.perf_counter() - start
+            start = time.perf_counter()
+            community_report.informe_comunidades(path, metricas=['degree'], k=args.k, chunksize=args.chunksize)
+            t_chunked = time.perf_counter() - start
+            print(f"{num_classes:>12} {t_original:>13.2f} {t_grouped:>13.2f} {t_chunked:>16.2f}")
+
+
+if __name__ == '__main__':
+    main()
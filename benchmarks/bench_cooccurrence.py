@@ -0,0 +1,97 @@
+"""
+Compara el conteo de co-ocurrencias original (`get_cooccurrence_edges` +
+`Counter`) con `cooccurrence.CooccurrenceCounter` en tiempo y memoria, y
+comprueba que los pesos (y su orden) son idénticos.
+
+El corpus se sintetiza a partir de las frecuencias de las palabras de la red
+publicada en `data/words/words_bigrams_nodes.csv`.
+
+Uso:
+    python benchmarks/bench_cooccurrence.py --articles 100 --words 2000
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cooccurrence import CooccurrenceCounter
+from pipeline import get_cooccurrence_edges
+
+
+def load_corpus(num_articles, words_per_article, seed=0):
+    """
+    Genera artículos muestreando las palabras de la red publicada según su frecuencia.
+    """
+    words, freqs = [], []
+    with open(os.path.join(ROOT, 'data/words/words_bigrams_nodes.csv'), encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            if row['Group'] == 'word':
+                words.append(row['Label'])
+                freqs.append(int(row['Attribute']))
+    rng = np.random.default_rng(seed)
+    probabilities = np.array(freqs, dtype=float) / sum(freqs)
+    return [
+        [words[i] for i in rng.choice(len(words), size=words_per_article, p=probabilities)]
+        for _ in range(num_articles)
+    ]
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def count_original(corpus, window_size):
+    edge_freq_global = Counter()
+    for words in corpus:
+        edge_freq_global.update(Counter(get_cooccurrence_edges(words, window_size)))
+    return edge_freq_global
+
+
+def count_vectorized(corpus, window_size, as_counter=True):
+    counter = CooccurrenceCounter(window_sizes=(window_size,))
+    for words in corpus:
+        counter.add(words)
+    if as_counter:
+        return counter.to_counter(window_size)
+    return counter.arrays(window_size)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--articles', type=int, default=100)
+    parser.add_argument('--words', type=int, default=2000, help="Palabras por artículo")
+    parser.add_argument('--window', type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.articles, args.words)
+    print(f"Corpus: {args.articles} artículos x {args.words} palabras, ventana {args.window}\n")
+
+    original, t_original, m_original = measure(lambda: count_original(corpus, args.window))
+    vectorized, t_vectorized, m_vectorized = measure(lambda: count_vectorized(corpus, args.window))
+    _, t_arrays, m_arrays = measure(lambda: count_vectorized(corpus, args.window, as_counter=False))
+
+    print(f"{'Método':>22} {'Tiempo (s)':>11} {'Pico memoria (MB)':>18}")
+    print(f"{'original':>22} {t_original:>11.2f} {m_original / 1024 ** 2:>18.1f}")
+    print(f"{'vectorizado (Counter)':>22} {t_vectorized:>11.2f} {m_vectorized / 1024 ** 2:>18.1f}")
+    print(f"{'vectorizado (arrays)':>22} {t_arrays:>11.2f} {m_arrays / 1024 ** 2:>18.1f}")
+    print(f"\nAristas: {len(original)}")
+    print(f"Pesos idénticos: {original == vectorized}")
+    print(f"Mismo orden de primera aparición: {list(original) == list(vectorized)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Mide el rendimiento (páginas/segundo) del motor de descarga concurrente
+frente al servidor local de prueba, para varios niveles de concurrencia.
+
+Uso:
+    python benchmarks/bench_crawler.py --articles 100 --latency 0.2
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from bs4 import BeautifulSoup
+
+from crawler import ConcurrentFetcher, crawl
+from stub_wiki_server import start_server
+
+
+def run_crawl(base_url, max_articles, max_in_flight):
+    def extract(url, response):
+        soup = BeautifulSoup(response.content, 'html.parser')
+        links = {
+            base_url + a['href'] for a in soup.find_all('a', href=True)
+            if a['href'].startswith('/wiki/') and ':' not in a['href'] and a['href'] != '/wiki/Main_Page'
+        }
+        return links, url
+
+    with ConcurrentFetcher(requests.Session, max_in_flight=max_in_flight, rate_per_host=None) as fetcher:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            total = sum(1 for _ in crawl(f"{base_url}/wiki/Articulo_0", 100, max_articles, fetcher, extract))
+        elapsed = time.perf_counter() - start
+    return total, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--articles', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    server, base_url = start_server(latency=args.latency)
+    try:
+        print(f"Latencia simulada: {args.latency}s, artículos: {args.articles}\n")
+        print(f"{'Concurrencia':>12} {'Artículos':>10} {'Tiempo (s)':>11} {'Páginas/s':>10}")
+        for level in args.levels:
+            total, elapsed = run_crawl(base_url, args.articles, level)
+            print(f"{level:>12} {total:>10} {elapsed:>11.2f} {total / elapsed:>10.2f}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
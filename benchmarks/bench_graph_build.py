@@ -0,0 +1,63 @@
+"""
+Compara la construcción del grafo de `src/greedy_mod.py` con `iterrows` (versión
+original) y con `graph_store.construir_grafo` (inserción en bloque desde las
+columnas), y comprueba que ambos grafos son idénticos.
+
+Usa las redes publicadas en `data/words` y `data/links`.
+
+Uso:
+    python benchmarks/bench_graph_build.py
+"""
+import os
+import sys
+import time
+
+import networkx as nx
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import graph_store
+
+NETWORKS = {
+    'words_bigrams': ('data/words/words_bigrams_nodes.csv', 'data/words/words_bigrams_edges.csv'),
+    'links': ('data/links/links_nodes.csv', 'data/links/links_edges.csv'),
+}
+
+
+def construir_grafo_iterrows(nodos_df, aristas_df):
+    G = nx.Graph()
+    for _, row in nodos_df.iterrows():
+        G.add_node(row['Id'], label=row['Label'], group=row['Group'], attribute=row['Attribute'])
+    for _, row in aristas_df.iterrows():
+        G.add_edge(row['Source'], row['Target'], type=row['Type'], weight=row['Weight'])
+    return G
+
+
+def same_graph(G1, G2):
+    return (
+        list(G1.nodes(data=True)) == list(G2.nodes(data=True))
+        and list(G1.edges(data=True)) == list(G2.edges(data=True))
+    )
+
+
+def measure(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    print(f"{'Red':>14} {'Nodos':>7} {'Aristas':>8} {'iterrows (s)':>13} {'En bloque (s)':>14} {'Idénticos':>10}")
+    for name, (nodes_path, edges_path) in NETWORKS.items():
+        nodos_df = pd.read_csv(os.path.join(ROOT, nodes_path))
+        aristas_df = pd.read_csv(os.path.join(ROOT, edges_path))
+        original, t_original = measure(construir_grafo_iterrows, nodos_df, aristas_df)
+        bulk, t_bulk = measure(graph_store.construir_grafo, nodos_df, aristas_df)
+        print(f"{name:>14} {len(nodos_df):>7} {len(aristas_df):>8} {t_original:>13.2f} {t_bulk:>14.2f} "
+              f"{str(same_graph(original, bulk)):>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Compara el tiempo de carga y el pico de memoria de una red exportada en CSV
+(`pd.read_csv`, como hacían los scripts de `src/`) con su copia binaria
+('npy' con memory-map y 'parquet') cargada mediante `src/graph_store.py`.
+
+La red se sintetiza con `--nodes` nodos y `--edges` aristas y se exporta con
+`pipeline.export_graph`. Cada carga se mide en un proceso nuevo para que el
+pico de memoria (RSS máximo) no se contamine con las anteriores.
+
+Uso:
+    python benchmarks/bench_graph_load.py --nodes 200000 --edges 5000000
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+LOADERS = ('csv', 'npy (DataFrame)', 'npy (mmap)', 'parquet')
+
+
+def write_graph(directory, num_nodes, num_edges, seed=0):
+    """
+    Exporta una red no dirigida aleatoria en CSV, 'npy' y 'parquet' (si pyarrow está instalado).
+    """
+    from csr_graph import CSRGraph, pa, write_binary
+    from pipeline import export_graph
+
+    rng = np.random.default_rng(seed)
+    labels = [f"palabra_{i}" for i in range(num_nodes)]
+    graph = CSRGraph.from_edges(
+        labels, ['word'] * num_nodes, rng.integers(1, 1000, num_nodes),
+        rng.integers(0, num_nodes, num_edges), rng.integers(0, num_nodes, num_edges),
+        rng.integers(1, 100, num_edges), (np.zeros(num_edges, dtype=np.int8), ['Undirected'])
+    )
+    nodes = os.path.join(directory, 'graph_nodes.csv')
+    edges = os.path.join(directory, 'graph_edges.csv')
+    export_graph(graph, nodes, edges, binary_format='npy')
+    if pa is not None:
+        write_binary(graph, nodes, edges, 'parquet')
+    return nodes, edges
+
+
+def load(kind, nodes, edges):
+    """
+    Carga la red con el método `kind` y recorre los pesos para forzar la lectura.
+    """
+    import pandas as pd
+    import graph_store
+
+    if kind == 'csv':
+        nodes_df, edges_df = pd.read_csv(nodes), pd.read_csv(edges)
+        return len(nodes_df), int(edges_df['Weight'].sum())
+    if kind == 'npy (DataFrame)':
+        nodes_df, edges_df = graph_store.cargar_datos(nodes, edges)
+        return len(nodes_df), int(edges_df['Weight'].sum())
+    if kind == 'npy (mmap)':
+        graph = graph_store.cargar_grafo_binario(nodes, edges)
+        return len(graph), int(graph.pesos.sum())
+    _, parquet_nodes, parquet_edges = graph_store.rutas_binarias(nodes, edges)
+    nodes_df, edges_df = pd.read_parquet(parquet_nodes), pd.read_parquet(parquet_edges)
+    return len(nodes_df), int(edges_df['Weight'].sum())
+
+
+def peak_rss_mb():
+    # VmHWM es el pico de este proceso; ru_maxrss en Linux conserva el del padre tras exec
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nodes', type=int, default=200_000)
+    parser.add_argument('--edges', type=int, default=5_000_000)
+    parser.add_argument('--load', choices=LOADERS, help=argparse.SUPPRESS)
+    parser.add_argument('--paths', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.load:
+        # Proceso hijo: una sola carga
+        start = time.perf_counter()
+        num_nodes, total_weight = load(args.load, *args.paths)
+        elapsed = time.perf_counter() - start
+        peak = peak_rss_mb()
+        print(f"{elapsed} {peak} {num_nodes} {total_weight}")
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"Exportando una red de {args.nodes} nodos y {args.edges} aristas...")
+        nodes, edges = write_graph(directory, args.nodes, args.edges)
+        sizes = {
+            'csv': os.path.getsize(nodes) + os.path.getsize(edges),
+            'npy': sum(entry.stat().st_size for entry in os.scandir(os.path.join(directory, 'graph.graph'))),
+        }
+        print(f"Tamaño en disco: CSV {sizes['csv'] / 1024 ** 2:.1f} MB, npy {sizes['npy'] / 1024 ** 2:.1f} MB\n")
+
+        print(f"{'Carga':>16} {'Tiempo (s)':>11} {'Pico RSS (MB)':>14} {'Suma de pesos':>14}")
+        for kind in LOADERS:
+            if kind == 'parquet' and not os.path.exists(os.path.join(directory, 'graph_edges.parquet')):
+                print(f"{kind:>16} {'-':>11} {'-':>14} {'(sin pyarrow)':>14}")
+                continue
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--load', kind, '--paths', nodes, edges],
+                check=True, capture_output=True, text=True
+            ).stdout.split()
+            elapsed, peak, _, total_weight = output[-4:]
+            print(f"{kind:>16} {float(elapsed):>11.2f} {float(peak):>14.0f} {total_weight:>14}")
+
+
+if __name__ == '__main__':
+    main()
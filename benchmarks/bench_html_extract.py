@@ -0,0 +1,84 @@
+"""
+Compara los backends de extracción de HTML (`html_extract.BACKENDS`) sobre
+páginas guardadas: tiempo medio por página y si la salida (texto y enlaces)
+es idéntica a la del backend de referencia 'html.parser', también en unos
+casos de anidamiento incorrecto (bloques dentro de <p>, <p> sin cerrar) en
+los que los analizadores corrigen el árbol de forma distinta.
+
+Sin `--pages` se generan páginas sintéticas con el servidor de prueba.
+
+Uso:
+    python benchmarks/bench_html_extract.py --pages data/pages
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import html_extract
+from stub_wiki_server import render_article
+
+BASE_URL = 'https://en.wikipedia.org'
+
+# Anidamiento que html.parser conserva y lxml corrige cerrando el <p>
+NESTING_CASES = [
+    b'<p>Alpha <b>beta</b><div>gamma <a href="/wiki/Delta">delta</a></div> x</p>',
+    b'<p>one<table><tr><td>cell</td></tr></table>two</p>',
+    b'<p>first<p>second</p>third</p>',
+    b'<p>open paragraph<p>another <a href="/wiki/Link">link</a>',
+    b'<div><p>inside div</p><p>next<span>span</span></div>tail',
+]
+
+
+def load_pages(directory, count):
+    if directory:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+            with open(path, 'rb') as f:
+                pages.append(f.read())
+        return pages
+    return [render_article(f"Articulo_{i}", num_paragraphs=60, num_links=400).encode('utf-8')
+            for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', help="Directorio con páginas .html guardadas")
+    parser.add_argument('--count', type=int, default=50, help="Páginas sintéticas si no se indica --pages")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages, args.count)
+    if not pages:
+        print("No se encontraron páginas.")
+        return
+    size_mb = sum(len(page) for page in pages) / 1024 ** 2
+    print(f"Páginas: {len(pages)} ({size_mb:.1f} MB)\n")
+
+    reference = [html_extract.extract_article(page, BASE_URL, 'html.parser') for page in pages]
+    nesting_reference = [html_extract.extract_article(page, BASE_URL, 'html.parser') for page in NESTING_CASES]
+    print(f"{'Backend':>12} {'ms/página':>10} {'Aceleración':>12} {'Idéntico':>9} {'Anidamiento':>12}")
+    baseline = None
+    for backend in html_extract.BACKENDS:
+        try:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                results = [html_extract.extract_article(page, BASE_URL, backend) for page in pages]
+            elapsed = (time.perf_counter() - start) / args.repeat
+        except ImportError as e:
+            print(f"{backend:>12} omitido: {e}")
+            continue
+        per_page = elapsed / len(pages) * 1000
+        baseline = baseline or per_page
+        identical = sum(result == expected for result, expected in zip(results, reference))
+        nesting = sum(html_extract.extract_article(page, BASE_URL, backend) == expected
+                      for page, expected in zip(NESTING_CASES, nesting_reference))
+        print(f"{backend:>12} {per_page:>10.2f} {baseline / per_page:>11.2f}x {identical:>4}/{len(pages)} "
+              f"{nesting:>9}/{len(NESTING_CASES)}")
+
+
+if __name__ == '__main__':
+    main()
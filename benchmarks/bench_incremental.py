@@ -0,0 +1,110 @@
+"""
+Compara la actualización incremental (`pipeline.refresh_wikipedia`) con un
+rastreo completo tras editar unos pocos artículos en el servidor local de
+prueba, y comprueba que el agregado actualizado coincide con el de los mismos
+artículos descargados y procesados de nuevo desde cero con su revisión actual.
+
+Uso:
+    python benchmarks/bench_incremental.py --articles 200 --edited 5 --latency 0.05
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pipeline
+from aggregate import CorpusAggregate
+from incremental import ArticleStore
+from stub_wiki_server import start_server
+
+
+def full_crawl(base_url, args, store=None):
+    with redirect_stdout(io.StringIO()):
+        return pipeline.crawl_wikipedia(
+            f"{base_url}/wiki/Articulo_0", base_url, max_depth=args.depth, max_articles=args.articles,
+            rate_per_host=None, checkpoint_path=None, store=store
+        )
+
+
+def reprocess(base_url, urls):
+    """
+    Agregado de `urls` descargadas y procesadas desde cero, sin el almacén.
+    """
+    aggregate = CorpusAggregate(window_sizes=(pipeline.COOCCURRENCE_WINDOW,), base_url=base_url)
+    session = pipeline.create_session()
+
+    def texts():
+        for url in urls:
+            text, links, _ = pipeline.extract_page(url, session.get(url), base_url)
+            yield (url, links), text
+
+    with redirect_stdout(io.StringIO()):
+        for (url, links), words, bigrams in pipeline.process_texts(texts()):
+            aggregate.add_article(url, words, bigrams, links)
+    return aggregate
+
+
+def snapshot(aggregate):
+    titles = aggregate.titles
+    links = {titles.title(source): sorted(titles.title(t) for t in targets.tolist())
+             for source, targets in aggregate.links_data.items()}
+    return (aggregate.articles, +aggregate.word_freq, +aggregate.bigram_freq,
+            aggregate.cooccurrence.to_counter(pipeline.COOCCURRENCE_WINDOW), links)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--articles', type=int, default=200)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--edited', type=int, default=5, help="Artículos editados entre rastreos")
+    parser.add_argument('--deleted', type=int, default=1, help="Artículos borrados entre rastreos")
+    parser.add_argument('--latency', type=float, default=0.05)
+    args = parser.parse_args()
+
+    server, base_url = start_server(latency=args.latency)
+    with tempfile.TemporaryDirectory() as directory:
+        store = ArticleStore(os.path.join(directory, 'store.sqlite'))
+        try:
+            start = time.perf_counter()
+            full_crawl(base_url, args, store)
+            initial = time.perf_counter() - start
+
+            # Editar y borrar algunos de los artículos rastreados
+            crawled = [url.rsplit('/', 1)[1] for url in store.revisions()]
+            for title in crawled[1:1 + args.edited]:
+                server.revisions[title] = 2
+            for title in crawled[1 + args.edited:1 + args.edited + args.deleted]:
+                server.revisions[title] = None
+
+            start = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                aggregate, _ = pipeline.refresh_wikipedia(base_url, store, max_depth=args.depth,
+                                                          max_articles=args.articles, rate_per_host=None)
+            refresh = time.perf_counter() - start
+
+            start = time.perf_counter()
+            full_crawl(base_url, args)
+            recrawl = time.perf_counter() - start
+
+            identical = snapshot(aggregate) == snapshot(reprocess(base_url, list(store.revisions())))
+        finally:
+            store.close()
+            server.shutdown()
+
+    print(f"Artículos: {args.articles}, editados: {args.edited}, borrados: {args.deleted}, "
+          f"latencia: {args.latency}s\n")
+    print(f"{'Rastreo':>22} {'Tiempo (s)':>11}")
+    print(f"{'inicial (con almacén)':>22} {initial:>11.2f}")
+    print(f"{'completo':>22} {recrawl:>11.2f}")
+    print(f"{'incremental':>22} {refresh:>11.2f}")
+    print(f"\nAgregado incremental igual al de los mismos artículos procesados desde cero: {identical}")
+
+
+if __name__ == '__main__':
+    main()
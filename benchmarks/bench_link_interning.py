@@ -0,0 +1,103 @@
+"""
+Compara la memoria y el tiempo de la etapa de enlaces con URLs completas
+(conjuntos de cadenas por artículo y `Counter` de URLs, versión original) y con
+títulos internados como enteros (`titles.TitleTable` en `CorpusAggregate` y
+`pipeline.prune_links`).
+
+Los enlaces se sintetizan con una distribución de Zipf sobre `--titles`
+títulos, como los de Wikipedia: pocos artículos muy enlazados y muchos poco.
+
+Uso:
+    python benchmarks/bench_link_interning.py --articles 5000 --links 300
+"""
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import redirect_stdout
+from urllib.parse import urljoin
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from titles import TitleTable
+
+BASE_URL = 'https://en.wikipedia.org'
+
+
+def synthetic_hrefs(num_articles, num_links, num_titles, seed=0):
+    rng = np.random.default_rng(seed)
+    for article in range(num_articles):
+        targets = np.minimum(rng.zipf(1.3, num_links), num_titles) - 1
+        yield f"/wiki/Articulo_{article}", [f"/wiki/Articulo_{target}" for target in targets.tolist()]
+
+
+def prune_urls(links_data, min_freq):
+    # Poda original sobre conjuntos de URLs
+    link_counter = Counter()
+    for _, links in links_data:
+        link_counter.update(links)
+    valid_links = {link for link, freq in link_counter.items() if freq >= min_freq}
+    pruned = {}
+    for source, links in links_data:
+        kept = links.intersection(valid_links)
+        if kept:
+            pruned[source] = kept
+    return pruned
+
+
+def run_urls(args):
+    links_data = []
+    for source, hrefs in synthetic_hrefs(args.articles, args.links, args.titles):
+        links_data.append((urljoin(BASE_URL, source), {urljoin(BASE_URL, href) for href in hrefs}))
+    return links_data, prune_urls(links_data, args.min_freq)
+
+
+def run_titles(args):
+    from pipeline import prune_links
+
+    titles = TitleTable(BASE_URL)
+    links_data = {}
+    for source, hrefs in synthetic_hrefs(args.articles, args.links, args.titles):
+        links_data[titles.intern(urljoin(BASE_URL, source))] = titles.intern_many(
+            urljoin(BASE_URL, href) for href in hrefs
+        )
+    with redirect_stdout(io.StringIO()):
+        return links_data, titles, prune_links(links_data, titles, min_freq=args.min_freq)
+
+
+def measure(function, args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(args)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, current / 1024 ** 2, peak / 1024 ** 2
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--articles', type=int, default=5000)
+    parser.add_argument('--links', type=int, default=300)
+    parser.add_argument('--titles', type=int, default=200_000)
+    parser.add_argument('--min-freq', type=int, default=3)
+    args = parser.parse_args()
+
+    # pipeline carga el modelo de spaCy al importarse: se importa antes de medir
+    import pipeline  # noqa: F401
+
+    print(f"{args.articles} artículos con {args.links} enlaces (Zipf sobre {args.titles} títulos)\n")
+    print(f"{'Enlaces':>10} {'Tiempo (s)':>11} {'Memoria final (MB)':>19} {'Pico (MB)':>10} {'Artículos podados':>18}")
+    for name, function in (('URLs', run_urls), ('internados', run_titles)):
+        result, elapsed, current, peak = measure(function, args)
+        print(f"{name:>10} {elapsed:>11.2f} {current:>19.1f} {peak:>10.1f} {len(result[-1]):>18}")
+
+
+if __name__ == '__main__':
+    main()
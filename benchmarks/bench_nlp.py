@@ -0,0 +1,43 @@
+"""
+Mide el rendimiento (artículos/segundo) de la etapa de NLP por lotes para
+distintos números de procesos. Requiere el modelo `en_core_sci_md`.
+
+Uso:
+    python benchmarks/bench_nlp.py --articles 200 --processes 1 2 4
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+import pipeline
+from stub_wiki_server import render_article
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--articles', type=int, default=200)
+    parser.add_argument('--batch-size', type=int, default=pipeline.NLP_BATCH_SIZE)
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+
+    texts_data = []
+    for i in range(args.articles):
+        soup = BeautifulSoup(render_article(f"Articulo_{i}"), 'html.parser')
+        texts_data.append((f"Articulo_{i}", ' '.join(p.get_text() for p in soup.find_all('p'))))
+
+    print(f"Artículos: {args.articles}, lote: {args.batch_size}\n")
+    print(f"{'Procesos':>8} {'Tiempo (s)':>11} {'Artículos/s':>12}")
+    for n_process in args.processes:
+        start = time.perf_counter()
+        results = list(pipeline.process_texts(texts_data, batch_size=args.batch_size, n_process=n_process))
+        elapsed = time.perf_counter() - start
+        print(f"{n_process:>8} {elapsed:>11.2f} {len(results) / elapsed:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Mide el tiempo de arranque de `pipeline` y el coste de la etapa de NLP en los
+dos modos de `NLP_MODE`:
+
+- Importación del módulo en un proceso nuevo (sin cargar el modelo).
+- Primer artículo de cada modo (incluye la carga del modelo o de las tablas).
+- Coste medio por artículo y coincidencia de las palabras más frecuentes del
+  modo 'fast' con las del modo 'scispacy'.
+
+Los textos son los artículos sintéticos del servidor local de prueba.
+
+Uso:
+    python benchmarks/bench_nlp_modes.py --articles 200
+"""
+import argparse
+import io
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+from contextlib import redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from html_extract import extract_article
+from stub_wiki_server import render_article
+
+
+def import_time():
+    code = ("import time; start = time.perf_counter(); import pipeline; "
+            "print(time.perf_counter() - start, 'spacy' in __import__('sys').modules)")
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True,
+                            text=True, check=True).stdout.split()
+    return float(output[0]), output[1] == 'True'
+
+
+def run(pipeline, mode, texts):
+    text_pipeline = pipeline.configure(mode=mode)
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        results = text_pipeline.process_batch(texts[:1])
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        for position in range(1, len(texts), pipeline.NLP_BATCH_SIZE):
+            results.extend(text_pipeline.process_batch(texts[position:position + pipeline.NLP_BATCH_SIZE]))
+        rest = time.perf_counter() - start
+    word_freq = Counter(word for words, _ in results for word in words)
+    return text_pipeline, first, rest / max(1, len(texts) - 1), word_freq
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--articles', type=int, default=200)
+    parser.add_argument('--top', type=int, default=100, help="Palabras más frecuentes comparadas")
+    args = parser.parse_args()
+
+    seconds, spacy_loaded = import_time()
+    print(f"Importar pipeline: {seconds * 1000:.0f} ms (spaCy importado: {spacy_loaded})\n")
+
+    import pipeline
+    base_url = "http://localhost"
+    texts = [extract_article(render_article(f"Articulo_{i}").encode(), base_url)[0]
+             for i in range(args.articles)]
+
+    results = {mode: run(pipeline, mode, texts) for mode in ('scispacy', 'fast')}
+    print(f"{'Modo':>9} {'Primer artículo (s)':>20} {'ms/artículo':>12} {'Palabras distintas':>19}")
+    for mode, (_, first, per_article, word_freq) in results.items():
+        print(f"{mode:>9} {first:>20.3f} {per_article * 1000:>12.2f} {len(word_freq):>19}")
+
+    fast, _, _, fast_freq = results['fast']
+    full_freq = results['scispacy'][3]
+    shared = {w for w, _ in full_freq.most_common(args.top)} & {w for w, _ in fast_freq.most_common(args.top)}
+    print(f"\nTop {args.top} palabras compartidas: {len(shared)}")
+    for line in fast.report():
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Compara la intermediación (betweenness) de `networkx.betweenness_centrality`
+con la de `src/node_metrics.py`, exacta y aproximada con distintos números de
+pivotes, en la red de palabras publicada: tiempo y error respecto a la exacta.
+También mide las métricas de distancia (excentricidad y cercanías).
+
+Uso:
+    python benchmarks/bench_node_metrics.py --procesos 4 --pivotes 100 500 2000
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+import networkx as nx
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import community
+import graph_store
+import node_metrics
+
+NODES = 'data/words/words_bigrams_nodes.csv'
+EDGES = 'data/words/words_bigrams_edges.csv'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--procesos', type=int, default=multiprocessing.cpu_count())
+    parser.add_argument('--pivotes', type=int, nargs='+', default=[100, 500, 2000])
+    parser.add_argument('--delta', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skip-networkx', action='store_true', help="No ejecutar betweenness_centrality de NetworkX")
+    args = parser.parse_args()
+
+    nodos_df, aristas_df = graph_store.cargar_datos(os.path.join(ROOT, NODES), os.path.join(ROOT, EDGES))
+    n = len(nodos_df)
+    origenes, destinos, pesos = community.cargar_aristas(nodos_df, aristas_df)
+    offsets, vecinos, _ = community.matriz_simetrica(origenes, destinos, pesos, n)
+    print(f"Red de palabras: {n} nodos, {len(aristas_df)} aristas, {args.procesos} procesos\n")
+
+    start = time.perf_counter()
+    node_metrics.metricas_distancia(offsets, vecinos, n_procesos=args.procesos)
+    print(f"Excentricidad y cercanías: {time.perf_counter() - start:.2f} s\n")
+
+    start = time.perf_counter()
+    exacta = node_metrics.intermediacion(offsets, vecinos, n_procesos=args.procesos)
+    resultados = [('exacta', time.perf_counter() - start, exacta, None)]
+    if not args.skip_networkx:
+        start = time.perf_counter()
+        G = nx.Graph()
+        G.add_nodes_from(range(n))
+        G.add_edges_from(zip(origenes.tolist(), destinos.tolist()))
+        valores = nx.betweenness_centrality(G, normalized=False)
+        resultados.insert(0, ('networkx', time.perf_counter() - start,
+                              np.array([valores[i] for i in range(n)]), None))
+    for pivotes in args.pivotes:
+        start = time.perf_counter()
+        estimada = node_metrics.intermediacion(offsets, vecinos, pivotes=pivotes, semilla=args.seed,
+                                               n_procesos=args.procesos)
+        resultados.append((f"{pivotes} pivotes", time.perf_counter() - start, estimada,
+                           node_metrics.error_pivotes(n, pivotes, args.delta)))
+
+    # Errores normalizados por el máximo teórico n·(n-2)/2, comparables con la cota ε
+    escala = n * (n - 2) / 2
+    print(f"{'Intermediación':>16} {'Tiempo (s)':>11} {'Error máx.':>11} {'Error medio':>12} {'Cota ε':>9} {'Top-100 común':>14}")
+    top_exacta = set(np.argsort(-exacta)[:100].tolist())
+    for nombre, elapsed, valores, cota in resultados:
+        error = np.abs(valores - exacta) / escala
+        comunes = len(top_exacta & set(np.argsort(-valores)[:100].tolist()))
+        cota = f"{cota:.4f}" if cota is not None else '-'
+        print(f"{nombre:>16} {elapsed:>11.2f} {error.max():>11.5f} {error.mean():>12.6f} {cota:>9} {comunes:>14}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Mide el efecto de la caché de párrafos (`PARAGRAPH_CACHE_SIZE`) en la etapa de
+NLP sobre artículos sintéticos en los que una parte de los párrafos se repite
+entre artículos (como los párrafos de ficha o de pronunciación de Wikipedia):
+tiempo de `process_texts`, tasa de aciertos y fracción del texto que no pasa
+por el modelo, y si las palabras coinciden con las obtenidas sin caché (con
+los párrafos unidos por espacios, como los extrae el pipeline sin caché).
+
+Uso:
+    python benchmarks/bench_paragraph_cache.py --articles 300 --shared 0.3 --mode scispacy --cache-size 20000
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pipeline
+from html_extract import extract_article
+from stub_wiki_server import VOCABULARY, render_article
+
+
+def make_corpus(num_articles, shared, boilerplate, seed=0):
+    rng = random.Random(seed)
+    pool = [' '.join(rng.choice(VOCABULARY) for _ in range(rng.randint(20, 60))) + '.'
+            for _ in range(boilerplate)]
+    texts = []
+    for i in range(num_articles):
+        paragraphs = extract_article(render_article(f"Articulo_{i}").encode(), "http://localhost",
+                                     separator='\n')[0].split('\n')
+        for position in range(len(paragraphs)):
+            if rng.random() < shared:
+                paragraphs[position] = rng.choice(pool)
+        texts.append((i, paragraphs))
+    return texts
+
+
+def run(texts, mode, **cache_options):
+    text_pipeline = pipeline.configure(mode=mode, **cache_options)
+    texts = [(key, pipeline.paragraph_separator().join(paragraphs)) for key, paragraphs in texts]
+    with redirect_stdout(io.StringIO()):
+        text_pipeline.process_batch([texts[0][1]])  # Carga del modelo e importaciones diferidas (no usa la caché de párrafos)
+        start = time.perf_counter()
+        results = {key: words for key, words, _ in pipeline.process_texts(texts, n_process=1)}
+    return results, time.perf_counter() - start, text_pipeline
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--articles', type=int, default=300)
+    parser.add_argument('--shared', type=float, default=0.3, help="Fracción de párrafos repetidos")
+    parser.add_argument('--boilerplate', type=int, default=50, help="Párrafos distintos que se repiten")
+    parser.add_argument('--mode', default=pipeline.NLP_MODE, choices=('scispacy', 'fast'))
+    parser.add_argument('--cache-size', type=int, default=20_000, help="Párrafos en la caché")
+    args = parser.parse_args()
+
+    texts = make_corpus(args.articles, args.shared, args.boilerplate)
+    baseline, t_baseline, _ = run(texts, args.mode, paragraph_cache_size=0)
+    print(f"Artículos: {args.articles}, párrafos repetidos: {args.shared:.0%}, modo: {args.mode}\n")
+    print(f"{'Caché':>10} {'Tiempo (s)':>11} {'Aceleración':>12} {'Palabras iguales':>17}")
+    print(f"{'sin caché':>10} {t_baseline:>11.2f} {1:>12.2f} {'-':>17}")
+    reports = []
+    for label, skip in (('reutilizar', False), ('omitir', True)):
+        results, elapsed, text_pipeline = run(texts, args.mode, paragraph_cache_size=args.cache_size,
+                                              skip_duplicates=skip)
+        identical = all(sorted(results[key]) == sorted(baseline[key]) for key in baseline)
+        print(f"{label:>10} {elapsed:>11.2f} {t_baseline / elapsed:>12.2f} {str(identical):>17}")
+        reports.extend(f"{label}: {line}" for line in text_pipeline.report())
+    print()
+    print('\n'.join(reports))
+
+
+if __name__ == '__main__':
+    main()
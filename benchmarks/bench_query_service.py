@@ -0,0 +1,127 @@
+"""
+Mide el servicio de consultas de `src/query_service.py` sobre las redes
+publicadas en `data/` frente a cargar los CSV en pandas y NetworkX:
+
+- Arranque: construcción del índice (primera vez), apertura del índice ya
+  construido (memory-map) y carga de los CSV en un grafo de NetworkX.
+- Latencia de cada consulta (p50 y p95 sobre nodos al azar) por HTTP, sobre el
+  índice en el propio proceso y con NetworkX, y si los resultados coinciden.
+
+El índice se construye en una copia temporal de `data/`, sin modificar el repositorio.
+
+Uso:
+    python benchmarks/bench_query_service.py --consultas 200
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import urllib.request
+from urllib.parse import quote
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import query_service
+
+
+def cargar_networkx(nodos_path, aristas_path):
+    nodos = pd.read_csv(nodos_path)
+    aristas = pd.read_csv(aristas_path)
+    etiquetas = dict(zip(nodos['Id'], nodos['Label']))
+    G = nx.Graph()
+    G.add_nodes_from(nodos['Label'])
+    G.add_weighted_edges_from(zip(aristas['Source'].map(etiquetas), aristas['Target'].map(etiquetas),
+                                  aristas['Weight']))
+    return G
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--red', choices=list(query_service.REDES), default='palabras')
+    parser.add_argument('--consultas', type=int, default=200)
+    parser.add_argument('--semilla', type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        shutil.copytree(os.path.join(ROOT, 'data'), os.path.join(directorio, 'data'))
+        os.chdir(directorio)
+        nodos_path, aristas_path, comunidades = query_service.REDES[args.red]
+
+        construir = medir(lambda: query_service.abrir_indice(nodos_path, aristas_path, comunidades), 1)[0]
+        abrir = min(medir(lambda: query_service.abrir_indice(nodos_path, aristas_path, comunidades), 3))
+        inicio = time.perf_counter()
+        G = cargar_networkx(nodos_path, aristas_path)
+        t_networkx = time.perf_counter() - inicio
+        print(f"Red '{args.red}': {G.number_of_nodes()} nodos, {G.number_of_edges()} aristas\n")
+        print(f"{'Arranque':<28} {'Tiempo (s)':>11}")
+        print(f"{'Construir el índice':<28} {construir:>11.3f}")
+        print(f"{'Abrir el índice (mmap)':<28} {abrir:>11.3f}")
+        print(f"{'CSV -> NetworkX':<28} {t_networkx:>11.3f}\n")
+
+        servicio = query_service.ServicioConsultas({args.red: query_service.REDES[args.red]})
+        servidor, url = query_service.iniciar_servidor(servicio, puerto=0)
+        rng = random.Random(args.semilla)
+        etiquetas = sorted(G.nodes())
+        muestra = [(rng.choice(etiquetas), rng.choice(etiquetas)) for _ in range(args.consultas)]
+
+        def pedir(ruta):
+            with urllib.request.urlopen(url + ruta) as respuesta:
+                return json.load(respuesta)
+
+        indice = servicio.indices[args.red]
+        consultas = {
+            'vecinos (k=10)': (
+                lambda a, b: [n['Label'] for n in pedir(f"/vecinos?red={args.red}&nodo={quote(a)}&k=10")['neighbors']],
+                lambda a, b: [n['Label'] for n in indice.vecinos(indice.buscar(a), k=10)['neighbors']],
+                lambda a, b: [v for v, _ in sorted(G[a].items(), key=lambda x: -x[1]['weight'])[:10]]),
+            'ego (radio=1)': (
+                lambda a, b: len(pedir(f"/ego?red={args.red}&nodo={quote(a)}&radio=1&max_nodos=10000")['nodes']),
+                lambda a, b: len(indice.ego(indice.buscar(a), radio=1, max_nodos=10_000)['nodes']),
+                lambda a, b: nx.ego_graph(G, a, radius=1).number_of_nodes()),
+            'camino': (
+                lambda a, b: pedir(f"/camino?red={args.red}&origen={quote(a)}&destino={quote(b)}&direccion=todas")['hops'],
+                lambda a, b: indice.camino(indice.buscar(a), indice.buscar(b))['hops'],
+                lambda a, b: nx.shortest_path_length(G, a, b) if nx.has_path(G, a, b) else None),
+        }
+        print(f"{'Consulta':<16} {'HTTP p50 (ms)':>14} {'p95':>7} {'Índice p50 (ms)':>16} {'p95':>7} "
+              f"{'NetworkX p50 (ms)':>18} {'p95':>7} {'Iguales':>8}")
+        for nombre, funciones in consultas.items():
+            tiempos = [[], [], []]
+            iguales = True
+            for a, b in muestra:
+                resultados = []
+                for funcion, lista in zip(funciones, tiempos):
+                    inicio = time.perf_counter()
+                    resultados.append(funcion(a, b))
+                    lista.append(time.perf_counter() - inicio)
+                if nombre.startswith('vecinos'):
+                    # Los vecinos empatados en peso pueden salir en otro orden: se comparan los pesos
+                    resultados = [[G[a][v]['weight'] for v in resultado] for resultado in resultados]
+                iguales &= resultados[0] == resultados[1] == resultados[2]
+            columnas = ' '.join(f"{np.percentile(lista, 50) * 1000:>{ancho}.2f} {np.percentile(lista, 95) * 1000:>7.2f}"
+                                for lista, ancho in zip(tiempos, (14, 16, 18)))
+            print(f"{nombre:<16} {columnas} {str(iguales):>8}")
+        servidor.shutdown()
+        os.chdir(ROOT)
+
+
+if __name__ == '__main__':
+    main()
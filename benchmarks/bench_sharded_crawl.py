@@ -0,0 +1,75 @@
+"""
+Mide el rendimiento (artículos/segundo, incluida la etapa de NLP) del rastreo
+distribuido (`pipeline.crawl_wikipedia_sharded`) frente al servidor local de
+prueba para distintos números de procesos, y comprueba que el agregado
+combinado coincide con el de un rastreo en un solo proceso.
+
+El rastreo distribuido reparte sobre todo el trabajo de CPU (extracción del
+HTML y NLP), así que escala con el número de núcleos disponibles.
+
+Uso:
+    python benchmarks/bench_sharded_crawl.py --articles 400 --workers 1 2 4
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pipeline
+from stub_wiki_server import start_server
+
+
+def snapshot(aggregate):
+    titles = aggregate.titles
+    links = {titles.title(source): sorted(titles.title(t) for t in targets.tolist())
+             for source, targets in aggregate.links_data.items()}
+    return (aggregate.articles, +aggregate.word_freq, +aggregate.bigram_freq,
+            aggregate.edge_freq(pipeline.COOCCURRENCE_WINDOW), links)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--articles', type=int, default=400, help="Artículos del servidor de prueba")
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+
+    server, base_url = start_server(latency=args.latency, num_articles=args.articles)
+    seed = f"{base_url}/wiki/Articulo_0"
+    try:
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            reference, _ = pipeline.crawl_wikipedia(seed, base_url, args.depth, args.articles,
+                                                    rate_per_host=None, checkpoint_path=None)
+        elapsed = time.perf_counter() - start
+        expected = snapshot(reference)
+
+        print(f"Artículos: {reference.articles}, latencia simulada: {args.latency}s, "
+              f"núcleos: {os.cpu_count()}\n")
+        print(f"{'Procesos':>12} {'Tiempo (s)':>11} {'Artículos/s':>12} {'Aceleración':>12} {'Idéntico':>9}")
+        print(f"{'1 (local)':>12} {elapsed:>11.2f} {reference.articles / elapsed:>12.2f} {1:>12.2f} {'-':>9}")
+        with tempfile.TemporaryDirectory() as directory:
+            for workers in args.workers:
+                start = time.perf_counter()
+                with redirect_stdout(io.StringIO()):
+                    aggregate, _ = pipeline.crawl_wikipedia_sharded(
+                        seed, base_url, args.depth, args.articles, workers=workers,
+                        frontier_path=os.path.join(directory, f"frontier_{workers}.sqlite"),
+                        partials_dir=os.path.join(directory, f"partials_{workers}"), rate_per_host=None
+                    )
+                sharded = time.perf_counter() - start
+                identical = snapshot(aggregate) == expected
+                print(f"{workers:>12} {sharded:>11.2f} {aggregate.articles / sharded:>12.2f} "
+                      f"{elapsed / sharded:>12.2f} {str(identical):>9}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
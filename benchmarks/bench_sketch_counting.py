@@ -0,0 +1,137 @@
+"""
+Informe de precisión del conteo aproximado (`COUNTING_MODE = 'sketch'`) frente
+al conteo exacto: tiempo, pico de memoria de cada contador frente a su
+presupuesto, aristas y nodos de la red de palabras que sobreviven a la poda,
+error de los pesos y cotas de error.
+
+El tiempo se mide sin `tracemalloc` y la memoria en una segunda pasada. Con el
+conteo aproximado la poda usa la cota inferior de cada frecuencia, así que la
+precisión de las aristas debe ser 1 (salvo con probabilidad e^-depth); la
+exhaustividad depende de `--candidates` frente al número de pares distintos.
+
+El corpus se sintetiza a partir de las frecuencias de las palabras de la red
+publicada en `data/words/words_bigrams_nodes.csv` (ver `bench_cooccurrence.py`);
+los bigramas son los pares de palabras consecutivas.
+
+Uso:
+    python benchmarks/bench_sketch_counting.py --articles 200 --words 2000 --memory-mb 128 --candidates 200000
+"""
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pipeline
+from aggregate import CorpusAggregate
+from bench_cooccurrence import load_corpus
+from sketches import SketchCooccurrenceCounter, SketchCounter
+
+
+def articles(corpus):
+    for words in corpus:
+        yield words, [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def count(corpus, window_size, sketch):
+    start = time.perf_counter()
+    aggregate = CorpusAggregate(window_sizes=(window_size,), sketch=sketch)
+    for words, bigrams in articles(corpus):
+        aggregate.add_article('', words, bigrams, [])
+    return aggregate, time.perf_counter() - start
+
+
+def peak_memory(build, update, corpus):
+    # Pico de memoria de un contador sin contar el corpus ya cargado
+    tracemalloc.start()
+    counter = build()
+    for item in articles(corpus):
+        update(counter, *item)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def word_graph(aggregate, window_size, top_bigrams):
+    with redirect_stdout(io.StringIO()):
+        graph = pipeline.build_word_graph(aggregate.word_freq, aggregate.bigram_freq.most_common(top_bigrams),
+                                          aggregate.cooccurrence, window_size=window_size, backend='csr')
+    sources, targets, weights, _ = graph.edges()
+    labels = graph.labels
+    edges = {frozenset((labels[u], labels[v])): w
+             for u, v, w in zip(sources.tolist(), targets.tolist(), weights.tolist())}
+    return set(labels), edges
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--articles', type=int, default=200)
+    parser.add_argument('--words', type=int, default=2000, help="Palabras por artículo")
+    parser.add_argument('--window', type=int, default=pipeline.COOCCURRENCE_WINDOW)
+    parser.add_argument('--top-bigrams', type=int, default=pipeline.TOP_N_BIGRAMS)
+    parser.add_argument('--memory-mb', type=float, default=pipeline.SKETCH_MEMORY_MB,
+                        help="Presupuesto de memoria de cada contador")
+    parser.add_argument('--depth', type=int, default=pipeline.SKETCH_DEPTH)
+    parser.add_argument('--candidates', type=int, default=pipeline.SKETCH_CANDIDATES)
+    parser.add_argument('--sample', type=int, default=pipeline.SKETCH_SAMPLE)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.articles, args.words)
+    sketch = {'memory_mb': args.memory_mb, 'depth': args.depth,
+              'capacity': args.candidates, 'sample_size': args.sample}
+    exact, t_exact = count(corpus, args.window, None)
+    approx, t_approx = count(corpus, args.window, sketch)
+    m_exact = peak_memory(lambda: CorpusAggregate(window_sizes=(args.window,)),
+                          lambda aggregate, words, bigrams: aggregate.add_article('', words, bigrams, []), corpus)
+    m_approx = peak_memory(lambda: CorpusAggregate(window_sizes=(args.window,), sketch=sketch),
+                           lambda aggregate, words, bigrams: aggregate.add_article('', words, bigrams, []), corpus)
+    counters = [
+        ("palabras", lambda: SketchCounter(**sketch), lambda counter, words, bigrams: counter.update(words)),
+        ("bigramas", lambda: SketchCounter(**sketch), lambda counter, words, bigrams: counter.update(bigrams)),
+        ("pares", lambda: SketchCooccurrenceCounter(window_sizes=(args.window,), **sketch),
+         lambda counter, words, bigrams: counter.add(words)),
+    ]
+
+    print(f"Corpus: {args.articles} artículos x {args.words} palabras, ventana {args.window}\n")
+    print(f"{'Conteo':>8} {'Tiempo (s)':>11} {'Pico memoria (MB)':>18}")
+    print(f"{'exacto':>8} {t_exact:>11.2f} {m_exact / 1024 ** 2:>18.1f}")
+    print(f"{'sketch':>8} {t_approx:>11.2f} {m_approx / 1024 ** 2:>18.1f}\n")
+    print(f"{'Contador':>9} {'Presupuesto (MB)':>17} {'Pico memoria (MB)':>18}")
+    for name, build, update in counters:
+        peak = peak_memory(build, update, corpus)
+        print(f"{name:>9} {args.memory_mb:>17.1f} {peak / 1024 ** 2:>18.1f}")
+    print()
+
+    print(approx.word_freq.report("Palabras"))
+    print(approx.bigram_freq.report("Bigramas"))
+    print(approx.cooccurrence.report(args.window))
+
+    exact_pairs = exact.edge_freq(args.window)
+    errors = np.array([weight - exact_pairs[pair] for pair, weight in approx.edge_freq(args.window).items()])
+    print(f"\nPares distintos (exacto): {len(exact_pairs)}; error de los pesos candidatos: "
+          f"máximo {errors.max()}, medio {errors.mean():.3f}, nunca negativo: {bool((errors >= 0).all())}")
+    exact_top = [bigram for bigram, _ in exact.bigram_freq.most_common(args.top_bigrams)]
+    approx_top = [bigram for bigram, _ in approx.bigram_freq.most_common(args.top_bigrams)]
+    print(f"Top {args.top_bigrams} bigramas compartidos: {len(set(exact_top) & set(approx_top))}")
+
+    exact_nodes, exact_edges = word_graph(exact, args.window, args.top_bigrams)
+    approx_nodes, approx_edges = word_graph(approx, args.window, args.top_bigrams)
+    shared = exact_edges.keys() & approx_edges.keys()
+    weight_errors = np.array([approx_edges[edge] - exact_edges[edge] for edge in shared] or [0])
+    print("\nRed de palabras podada:")
+    print(f"- Nodos: exacto {len(exact_nodes)}, sketch {len(approx_nodes)}, compartidos {len(exact_nodes & approx_nodes)}")
+    print(f"- Aristas: exacto {len(exact_edges)}, sketch {len(approx_edges)}, compartidas {len(shared)}")
+    print(f"- Exhaustividad: {len(shared) / max(1, len(exact_edges)):.4f}, "
+          f"precisión: {len(shared) / max(1, len(approx_edges)):.4f}")
+    print(f"- Error de los pesos compartidos: máximo {weight_errors.max()}, medio {weight_errors.mean():.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,503 @@
+"""
+Batería de benchmarks reproducible de las etapas del pipeline y de los scripts
+de análisis de `src/`, sin conexión a la red.
+
+Cada etapa se mide sobre dos tipos de corpus:
+
+- 'synthetic': corpus y red generados por `synthetic_corpus.py` con la semilla
+  indicada, para cada tamaño de `--sizes` (número de artículos y de nodos).
+- 'recorded': páginas de Wikipedia guardadas con `record_pages.py` en `--pages`
+  (si el directorio existe). Solo se miden las etapas que parten del texto.
+  El repositorio no incluye estas páginas (`benchmarks/pages/` está en
+  `.gitignore`): cada máquina graba las suyas, así que las filas 'recorded' solo
+  son comparables entre ejecuciones con el mismo conjunto de páginas.
+
+Las etapas que procesan el texto de cada artículo (análisis del HTML, NLP,
+co-ocurrencias y rastreo) usan como mucho `--text-limit` artículos, ya que su
+coste es lineal y con el modelo de SciSpaCy dominaría la ejecución. El NLP usa
+por defecto el modo 'fast', que no necesita el modelo; con `--nlp-mode scispacy`
+el modelo se carga antes de empezar y, si no está instalado, se muestra el error.
+
+De cada etapa se guarda el mejor tiempo y la media de `--repeat` repeticiones
+(la preparación de los datos no se mide), los elementos por segundo y, salvo
+con `--no-memory`, el pico de memoria de una repetición adicional medido con
+tracemalloc. El resultado se guarda en `benchmarks/results/<commit>.json` junto
+con el commit, las versiones y la máquina, y `--compare` lo compara con el de
+otro commit y señala las regresiones.
+
+Uso:
+    python benchmarks/bench_suite.py --sizes 10000 100000 --repeat 3
+    python benchmarks/bench_suite.py --stages count word_graph export --no-memory
+    python benchmarks/bench_suite.py --compare a196bac
+    python benchmarks/bench_suite.py --compare benchmarks/results/a196bac.json benchmarks/results/2191b64.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from functools import cached_property
+from urllib.parse import unquote
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import greedy_mod
+import pipeline
+import top_modularity
+from aggregate import CorpusAggregate
+from csr_graph import CSRGraph
+from dump_reader import open_dump, title_to_url
+from html_extract import extract_article
+from paragraph_cache import ParagraphCache
+from synthetic_corpus import SyntheticCorpus, synthetic_graph, synthetic_metrics_nodes
+
+BASE_URL = "https://en.wikipedia.org"
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+PAGES_DIR = os.path.join(ROOT, 'benchmarks', 'pages')
+
+
+class Workload:
+    """
+    Datos de entrada de las etapas para un corpus. Cada dato se genera la
+    primera vez que una etapa lo pide y se reutiliza en el resto.
+    """
+    corpus = None
+
+    def __init__(self, size, text_limit, seed, workdir):
+        self.size = size
+        self.text_limit = text_limit
+        self.seed = seed
+        self.workdir = workdir
+
+    @cached_property
+    def texts(self):
+        separator = pipeline.paragraph_separator()
+        return [(url, extract_article(html, BASE_URL, separator=separator)[0]) for url, html in self.pages]
+
+    @cached_property
+    def aggregate(self):
+        aggregate = CorpusAggregate(window_sizes=(pipeline.COOCCURRENCE_WINDOW,), base_url=BASE_URL)
+        for url, words, bigrams, links in self.articles:
+            aggregate.add_article(url, words, bigrams, links)
+        return aggregate
+
+    # Los corpus que no tienen red (las páginas guardadas) devuelven None y sus
+    # etapas de red se omiten
+    graph_frames = None
+    networkx_graph = None
+
+
+class SyntheticWorkload(Workload):
+    corpus = 'synthetic'
+
+    @cached_property
+    def generator(self):
+        return SyntheticCorpus(self.size, seed=self.seed)
+
+    @cached_property
+    def pages(self):
+        return [(BASE_URL + '/wiki/' + self.generator.title(index), self.generator.html(index).encode())
+                for index in range(min(self.size, self.text_limit))]
+
+    @cached_property
+    def articles(self):
+        return [(url, words, pipeline.words_to_bigrams(words)[1], links)
+                for url, words, links in self.generator.words()]
+
+    @cached_property
+    def crawl_source(self):
+        # Corpus propio de `text_limit` artículos: todos sus enlaces tienen página
+        generator = SyntheticCorpus(min(self.size, self.text_limit), seed=self.seed)
+        directory = os.path.join(self.workdir, f'pages_{self.size}')
+        generator.write_pages(directory)
+        return directory, BASE_URL + '/wiki/' + generator.title(0), generator.num_articles
+
+    @cached_property
+    def graph_frames(self):
+        return synthetic_graph(self.size, seed=self.seed)
+
+    @cached_property
+    def networkx_graph(self):
+        # Grafo con los atributos que esperan las funciones de poda de pipeline.py
+        nodes, edges = self.graph_frames
+        graph = nx.Graph()
+        graph.add_nodes_from((label, {'Group': group, 'Attribute': attribute}) for label, group, attribute
+                             in zip(nodes['Label'].tolist(), nodes['Group'].tolist(), nodes['Attribute'].tolist()))
+        labels = nodes['Label'].to_numpy()
+        graph.add_edges_from((u, v, {'Weight': w}) for u, v, w in zip(
+            labels[edges['Source'].to_numpy() - 1].tolist(), labels[edges['Target'].to_numpy() - 1].tolist(),
+            edges['Weight'].tolist()))
+        return graph
+
+    @cached_property
+    def metrics_csv(self):
+        nodes, edges = self.graph_frames
+        path = os.path.join(self.workdir, f'metrics_nodes_{self.size}.csv')
+        synthetic_metrics_nodes(nodes, edges, seed=self.seed).to_csv(path, index=False)
+        return path
+
+
+class RecordedWorkload(Workload):
+    corpus = 'recorded'
+
+    def __init__(self, directory, text_limit, seed, workdir):
+        with open(os.path.join(directory, 'manifest.json'), encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self.directory = directory
+        super().__init__(min(len(self.manifest['pages']), text_limit), text_limit, seed, workdir)
+
+    @cached_property
+    def pages(self):
+        pages = []
+        for name in self.manifest['pages'][:self.size]:
+            with open(os.path.join(self.directory, name), 'rb') as f:
+                pages.append((title_to_url(unquote(name[:-len('.html')]), BASE_URL), f.read()))
+        return pages
+
+    @cached_property
+    def articles(self):
+        links = {url: extract_article(html, BASE_URL)[1] for url, html in self.pages}
+        with redirect_stdout(io.StringIO()):
+            return [(url, words, bigrams, links[url]) for url, words, bigrams in pipeline.process_texts(self.texts)]
+
+    @cached_property
+    def crawl_source(self):
+        return self.directory, title_to_url(self.manifest['seed'], BASE_URL), self.size
+
+
+# === Etapas ===
+# Cada etapa recibe el Workload y devuelve una función sin argumentos que
+# ejecuta la etapa una vez y retorna el número de elementos procesados, o None
+# si el corpus no tiene los datos que necesita. Lo que se hace antes de
+# devolver la función (copias, cargas) no cuenta en el tiempo medido.
+
+def stage_parse(workload):
+    pages = workload.pages
+
+    def run():
+        for url, html in pages:
+            extract_article(html, BASE_URL)
+        return len(pages)
+    return run
+
+
+def _fresh_caches(text_pipeline):
+    # Cada repetición empieza con las cachés de párrafos y de palabras vacías
+    if text_pipeline.paragraph_cache is not None:
+        cache = text_pipeline.paragraph_cache
+        text_pipeline.paragraph_cache = ParagraphCache(cache.max_entries, cache.skip_duplicates)
+    text_pipeline.decide.cache_clear()
+
+
+def stage_clean_text(workload):
+    texts = [text for _, text in workload.texts]
+    pipeline.text_pipeline.process_batch(texts[:1])  # Carga del modelo e importaciones diferidas
+    _fresh_caches(pipeline.text_pipeline)
+
+    def run():
+        for text in texts:
+            pipeline.clean_text(text)
+        return len(texts)
+    return run
+
+
+def stage_process_texts(workload):
+    texts = workload.texts
+    pipeline.text_pipeline.process_batch([texts[0][1]])
+    _fresh_caches(pipeline.text_pipeline)
+
+    def run():
+        return sum(1 for _ in pipeline.process_texts(texts, n_process=1))
+    return run
+
+
+def stage_cooccurrence_edges(workload):
+    articles = workload.articles[:workload.text_limit]
+
+    def run():
+        for _, words, _, _ in articles:
+            pipeline.get_cooccurrence_edges(words, window_size=pipeline.COOCCURRENCE_WINDOW)
+        return len(articles)
+    return run
+
+
+def stage_count(workload):
+    articles = workload.articles
+
+    def run():
+        aggregate = CorpusAggregate(window_sizes=(pipeline.COOCCURRENCE_WINDOW,), base_url=BASE_URL)
+        for url, words, bigrams, links in articles:
+            aggregate.add_article(url, words, bigrams, links)
+        return len(articles)
+    return run
+
+
+def stage_word_graph(workload):
+    aggregate = workload.aggregate
+    top_bigrams = aggregate.bigram_freq.most_common(pipeline.TOP_N_BIGRAMS)
+
+    def run():
+        graph = pipeline.build_word_graph(aggregate.word_freq, top_bigrams, aggregate.cooccurrence)
+        return graph.number_of_nodes() + graph.number_of_edges()
+    return run
+
+
+def stage_prune_edges(workload):
+    if workload.networkx_graph is None:
+        return None
+    graph = workload.networkx_graph.copy()
+
+    def run():
+        items = graph.number_of_edges()
+        pipeline.prune_edges_by_percentile(graph, percentile=pipeline.EDGE_POD_PERCENTILE,
+                                           min_weight=pipeline.MIN_EDGE_WEIGHT)
+        return items
+    return run
+
+
+def stage_prune_nodes(workload):
+    if workload.networkx_graph is None:
+        return None
+    graph = workload.networkx_graph.copy()
+
+    def run():
+        items = graph.number_of_nodes()
+        pipeline.prune_nodes_by_percentile(graph, percentile=pipeline.NODE_POD_PERCENTILE,
+                                           min_freq=pipeline.MIN_NODE_FREQ)
+        return items
+    return run
+
+
+def stage_export(workload):
+    if workload.graph_frames is None:
+        return None
+    nodes, edges = workload.graph_frames
+    graph = CSRGraph.from_edges(nodes['Label'].tolist(), nodes['Group'].tolist(), nodes['Attribute'].to_numpy(),
+                                edges['Source'].to_numpy() - 1, edges['Target'].to_numpy() - 1,
+                                edges['Weight'].to_numpy(), edges['Type'].tolist())
+    prefix = os.path.join(workload.workdir, f'export_{workload.size}')
+
+    def run():
+        pipeline.export_graph(graph, prefix + '_nodes.csv', prefix + '_edges.csv')
+        return graph.number_of_nodes() + graph.number_of_edges()
+    return run
+
+
+def stage_construir_grafo(workload):
+    if workload.graph_frames is None:
+        return None
+    nodes, edges = workload.graph_frames
+
+    def run():
+        greedy_mod.construir_grafo(nodes, edges)
+        return len(nodes) + len(edges)
+    return run
+
+
+def stage_analizar_modularidad(workload):
+    if workload.graph_frames is None:
+        return None
+    path = workload.metrics_csv
+
+    def run():
+        top_modularity.analizar_modularidad(path)
+        return workload.size
+    return run
+
+
+def stage_crawl(workload):
+    directory, seed, max_articles = workload.crawl_source
+    pipeline.text_pipeline.load()
+    _fresh_caches(pipeline.text_pipeline)
+    fetcher = open_dump(directory)
+
+    def run():
+        aggregate, _ = pipeline.crawl_wikipedia(seed, BASE_URL, max_depth=100, max_articles=max_articles,
+                                                checkpoint_path=None, fetcher=fetcher)
+        return aggregate.articles
+    return run
+
+
+STAGES = {
+    'parse': stage_parse,
+    'clean_text': stage_clean_text,
+    'process_texts': stage_process_texts,
+    'cooccurrence_edges': stage_cooccurrence_edges,
+    'count': stage_count,
+    'word_graph': stage_word_graph,
+    'prune_edges': stage_prune_edges,
+    'prune_nodes': stage_prune_nodes,
+    'export': stage_export,
+    'construir_grafo': stage_construir_grafo,
+    'analizar_modularidad': stage_analizar_modularidad,
+    'crawl': stage_crawl,
+}
+
+
+def measure(prepare, workload, repeat, memory):
+    """
+    Retorna:
+    - Optional[dict]: Tiempos, elementos por segundo y pico de memoria de la etapa.
+    """
+    times = []
+    with redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            run = prepare(workload)
+            if run is None:
+                return None
+            start = time.perf_counter()
+            items = run()
+            times.append(time.perf_counter() - start)
+        peak = None
+        if memory:
+            run = prepare(workload)
+            tracemalloc.start()
+            try:
+                run()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    best = min(times)
+    return {'items': items, 'best_seconds': best, 'mean_seconds': sum(times) / len(times),
+            'items_per_second': items / best if best > 0 else None, 'peak_memory_bytes': peak}
+
+
+def git(*args):
+    try:
+        return subprocess.run(['git', *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def run_suite(args):
+    commit = git('rev-parse', '--short', 'HEAD') or 'unknown'
+    dirty = bool(git('status', '--porcelain', '--untracked-files=no'))
+    pipeline.configure(mode=args.nlp_mode)
+    # Fuera de redirect_stdout: si el modelo no está instalado, su error se ve antes de salir
+    pipeline.text_pipeline.load()
+    result = {
+        'commit': commit,
+        'dirty': dirty,
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'networkx': nx.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'nlp_mode': args.nlp_mode,
+        'options': {'sizes': args.sizes, 'repeat': args.repeat, 'text_limit': args.text_limit, 'seed': args.seed},
+        'results': [],
+    }
+
+    print(f"Commit {commit}{' (con cambios sin guardar)' if dirty else ''}, NLP '{args.nlp_mode}'\n")
+    print(f"{'Etapa':<22} {'Corpus':>10} {'Tamaño':>8} {'Elementos':>10} {'Mejor (s)':>10} "
+          f"{'Media (s)':>10} {'Elem./s':>11} {'Memoria (MB)':>13}")
+    with tempfile.TemporaryDirectory() as workdir:
+        workloads = [SyntheticWorkload(size, args.text_limit, args.seed, workdir) for size in args.sizes]
+        if args.pages and os.path.exists(os.path.join(args.pages, 'manifest.json')):
+            workloads.append(RecordedWorkload(args.pages, args.text_limit, args.seed, workdir))
+        for workload in workloads:
+            for name in args.stages:
+                row = measure(STAGES[name], workload, args.repeat, not args.no_memory)
+                if row is None:
+                    continue
+                row = {'stage': name, 'corpus': workload.corpus, 'size': workload.size, **row}
+                result['results'].append(row)
+                memory = f"{row['peak_memory_bytes'] / 2 ** 20:.1f}" if row['peak_memory_bytes'] is not None else '-'
+                rate = f"{row['items_per_second']:.0f}" if row['items_per_second'] else '-'
+                print(f"{name:<22} {workload.corpus:>10} {workload.size:>8} {row['items']:>10} "
+                      f"{row['best_seconds']:>10.3f} {row['mean_seconds']:>10.3f} {rate:>11} {memory:>13}")
+
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(args.output, f"{commit}{'-dirty' if dirty else ''}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2)
+    print(f"\nResultados guardados en {path}")
+    return path
+
+
+def load_results(reference, directory):
+    """Carga un fichero de resultados por su ruta o por el commit (`<directorio>/<commit>.json`)."""
+    path = reference if os.path.exists(reference) else os.path.join(directory, f"{reference}.json")
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(base, head, threshold):
+    """
+    Compara dos ejecuciones etapa a etapa por el mejor tiempo y el pico de memoria.
+
+    Retorna:
+    - int: Número de regresiones (tiempo o memoria más de `threshold` por encima de la base).
+    """
+    print(f"\nBase {base['commit']} ({base['date']}) -> {head['commit']}{'-dirty' if head['dirty'] else ''} "
+          f"({head['date']})")
+    if (base['platform'], base['cpu_count'], base['nlp_mode']) != (head['platform'], head['cpu_count'], head['nlp_mode']):
+        print("Aviso: las ejecuciones son de máquinas o modos de NLP distintos")
+    print(f"{'Etapa':<22} {'Corpus':>10} {'Tamaño':>8} {'Base (s)':>9} {'Nuevo (s)':>10} {'Tiempo':>7} "
+          f"{'Memoria':>8}")
+    base_rows = {(row['stage'], row['corpus'], row['size']): row for row in base['results']}
+    regressions = 0
+    for row in head['results']:
+        previous = base_rows.get((row['stage'], row['corpus'], row['size']))
+        if previous is None:
+            continue
+        time_ratio = row['best_seconds'] / previous['best_seconds'] if previous['best_seconds'] else 1.0
+        memory_ratio = None
+        if row['peak_memory_bytes'] and previous['peak_memory_bytes']:
+            memory_ratio = row['peak_memory_bytes'] / previous['peak_memory_bytes']
+        regression = time_ratio > 1 + threshold or (memory_ratio or 0) > 1 + threshold
+        regressions += regression
+        memory = f"{memory_ratio:.2f}x" if memory_ratio is not None else '-'
+        print(f"{row['stage']:<22} {row['corpus']:>10} {row['size']:>8} {previous['best_seconds']:>9.3f} "
+              f"{row['best_seconds']:>10.3f} {time_ratio:>6.2f}x {memory:>8}{'  REGRESIÓN' if regression else ''}")
+    print(f"\nRegresiones (umbral {threshold:.0%}): {regressions}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10_000],
+                        help="Tamaños del corpus sintético (artículos y nodos de la red)")
+    parser.add_argument('--stages', nargs='+', default=list(STAGES), choices=list(STAGES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--text-limit', type=int, default=2000,
+                        help="Máximo de artículos de las etapas que procesan el texto")
+    parser.add_argument('--no-memory', action='store_true', help="No medir el pico de memoria")
+    parser.add_argument('--nlp-mode', default='fast', choices=('scispacy', 'fast'),
+                        help="Modo de NLP ('scispacy' necesita el modelo instalado)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--pages', default=PAGES_DIR, help="Páginas guardadas con record_pages.py")
+    parser.add_argument('--output', default=RESULTS_DIR, help="Directorio de resultados")
+    parser.add_argument('--compare', nargs='+', metavar='RESULTADOS',
+                        help="Comparar con una ejecución anterior (commit o fichero); con dos, "
+                             "compararlas entre sí sin ejecutar la batería")
+    parser.add_argument('--threshold', type=float, default=0.1, help="Empeoramiento que cuenta como regresión")
+    args = parser.parse_args()
+
+    if args.compare and len(args.compare) == 2:
+        base, head = (load_results(reference, args.output) for reference in args.compare)
+    else:
+        # La base se lee antes de ejecutar: la nueva ejecución puede sobrescribir su fichero
+        base = load_results(args.compare[0], args.output) if args.compare else None
+        head = load_results(run_suite(args), args.output)
+        if base is None:
+            return
+    sys.exit(1 if compare(base, head, args.threshold) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Guarda un conjunto de páginas de Wikipedia para los benchmarks sin conexión.
+
+Rastrea `--articles` artículos a partir de `--seed` (con el mismo crawler y la
+misma caché HTTP que el pipeline) y guarda el HTML de cada uno en `--output`
+con los nombres de `dump_reader.html_path`, de modo que el directorio sirve
+tanto para `bench_suite.py` como para `DUMP_PATH`. El fichero `manifest.json`
+recoge el artículo inicial, la fecha y las páginas en el orden del rastreo.
+
+Con `--offline` las páginas se leen solo de la caché HTTP (`HTTP_CACHE_DIR`),
+p. ej. para volver a generar el conjunto a partir de un rastreo anterior.
+
+Uso:
+    python benchmarks/record_pages.py --seed Fentanyl --articles 500
+    python benchmarks/record_pages.py --seed Fentanyl --articles 500 --offline
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pipeline
+from crawler import ConcurrentFetcher, crawl
+from dump_reader import html_path, normalize_title, title_to_url, url_to_title
+from http_cache import ResponseCache
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--seed', default='Fentanyl', help="Título del artículo inicial")
+    parser.add_argument('--articles', type=int, default=500)
+    parser.add_argument('--depth', type=int, default=pipeline.MAX_DEPTH)
+    parser.add_argument('--base-url', default="https://en.wikipedia.org")
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pages'))
+    parser.add_argument('--cache', default=pipeline.HTTP_CACHE_DIR, help="Caché HTTP (vacío para no usarla)")
+    parser.add_argument('--offline', action='store_true', help="Leer las páginas solo de la caché HTTP")
+    args = parser.parse_args()
+
+    cache = None
+    if args.cache:
+        cache = ResponseCache(args.cache, ttl=pipeline.HTTP_CACHE_TTL,
+                              max_bytes=pipeline.HTTP_CACHE_MAX_MB * 1024 ** 2, offline=args.offline)
+    fetcher = ConcurrentFetcher(lambda: pipeline.create_session(cache), max_in_flight=pipeline.MAX_IN_FLIGHT,
+                                rate_per_host=pipeline.HOST_RATE_LIMIT, burst=pipeline.HOST_BURST, cache=cache)
+    os.makedirs(args.output, exist_ok=True)
+
+    def extract(url, response):
+        page = pipeline.extract_page(url, response, args.base_url)
+        if page is None:
+            return None
+        _, links, page_url = page
+        # Las redirecciones se guardan con el título final del artículo
+        path = html_path(args.output, url_to_title(page_url))
+        with open(path, 'wb') as f:
+            f.write(response.content)
+        return links, os.path.basename(path)
+
+    start = time.perf_counter()
+    with fetcher:
+        pages = list(dict.fromkeys(crawl(title_to_url(args.seed, args.base_url), args.depth, args.articles,
+                                         fetcher, extract)))
+    with open(os.path.join(args.output, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump({'seed': normalize_title(args.seed), 'recorded': time.strftime('%Y-%m-%d'), 'pages': pages},
+                  f, indent=2, ensure_ascii=False)
+    print(f"{len(pages)} páginas guardadas en {args.output} en {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""
+Servidor HTTP local que imita a Wikipedia sirviendo HTML generado.
+
+Cada título `/wiki/Articulo_N` devuelve una página determinista con párrafos
+de texto y enlaces a otros artículos del mismo servidor, de modo que el
+crawler puede ejecutarse sin conexión y con una latencia simulada. Las
+respuestas llevan ETag y atienden peticiones condicionales (304).
+
+Cada artículo tiene un número de revisión (1 por defecto) que se puede cambiar
+con el servidor en marcha (`server.revisions[título] = 2`) para simular
+ediciones; una revisión None simula un artículo borrado. La revisión aparece
+en la página (`wgRevisionId`, como en Wikipedia) y en `/w/api.php`
+(`action=query&prop=revisions`), y cambia el texto y los enlaces generados.
+
+Uso:
+    python benchmarks/stub_wiki_server.py --port 8000 --latency 0.2
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+VOCABULARY = (
+    "fentanyl opioid analgesic receptor dose overdose morphine heroin naloxone "
+    "synthetic potent pain anesthesia patch injection tolerance withdrawal "
+    "respiratory depression addiction treatment prescription drug medication "
+    "pharmacology metabolism liver enzyme brain clinical trial patient hospital"
+).split()
+
+
+def render_article(title, num_articles=1000, num_links=40, num_paragraphs=12, seed=0, revision=1):
+    """
+    Genera el HTML de un artículo de forma determinista a partir de su título y su revisión.
+    """
+    rng = random.Random(f"{seed}:{title}" if revision == 1 else f"{seed}:{title}:{revision}")
+    links = [f"Articulo_{rng.randrange(num_articles)}" for _ in range(num_links)]
+    paragraphs = []
+    for i in range(num_paragraphs):
+        words = [rng.choice(VOCABULARY) for _ in range(rng.randint(40, 90))]
+        target = links[i % len(links)]
+        paragraphs.append(
+            f"<p>{' '.join(words)} <a href=\"/wiki/{target}\">{target.replace('_', ' ')}</a>.</p>"
+        )
+    nav = ''.join(f'<li><a href="/wiki/{link}">{link}</a></li>' for link in links)
+    return (
+        "<!DOCTYPE html><html><head><title>"
+        f"{title} - Wikipedia</title>"
+        f'<script>RLCONF={{"wgRevisionId":{revision}}};</script></head><body>'
+        '<div id="mw-navigation"><a href="/wiki/Main_Page">Main Page</a>'
+        '<a href="/wiki/Special:Random">Random</a></div>'
+        f'<div id="mw-content-text"><h1>{title}</h1>{"".join(paragraphs)}<ul>{nav}</ul></div>'
+        "</body></html>"
+    )
+
+
+class StubWikiHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    num_articles = 1000
+    revisions = {}
+
+    def do_GET(self):
+        if self.path.startswith('/w/api.php'):
+            self.send_revisions()
+            return
+        if not self.path.startswith('/wiki/'):
+            self.send_error(404)
+            return
+        time.sleep(self.latency)
+        title = unquote(self.path[len('/wiki/'):])
+        revision = self.revisions.get(title, 1)
+        if revision is None:
+            self.send_error(404)
+            return
+        body = render_article(title, num_articles=self.num_articles, revision=revision).encode('utf-8')
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=UTF-8')
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_revisions(self):
+        # Subconjunto de action=query&prop=revisions&rvprop=ids con formatversion=2
+        params = parse_qs(urlsplit(self.path).query)
+        pages = []
+        for title in params.get('titles', [''])[0].split('|'):
+            revision = self.revisions.get(title.replace(' ', '_'), 1)
+            if revision is None:
+                pages.append({'title': title, 'missing': True})
+            else:
+                pages.append({'title': title, 'revisions': [{'revid': revision}]})
+        body = json.dumps({'batchcomplete': True, 'query': {'pages': pages}}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(port=0, latency=0.0, num_articles=1000, revisions=None):
+    """
+    Arranca el servidor en un hilo en segundo plano.
+
+    Parámetros:
+    - revisions (Dict[str, Optional[int]]): Revisión de cada título (por defecto 1);
+      el diccionario se comparte con el servidor como `server.revisions`.
+
+    Retorna:
+    - Tuple[ThreadingHTTPServer, str]: El servidor y su URL base.
+    """
+    revisions = {} if revisions is None else revisions
+    handler = type('Handler', (StubWikiHandler,), {
+        'latency': latency, 'num_articles': num_articles, 'revisions': revisions
+    })
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.revisions = revisions
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--articles', type=int, default=1000)
+    args = parser.parse_args()
+    server, base_url = start_server(args.port, args.latency, args.articles)
+    print(f"Servidor de prueba escuchando en {base_url}/wiki/Articulo_0")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,206 @@
+"""
+Generador determinista de corpus y redes sintéticos para los benchmarks.
+
+- `SyntheticCorpus`: artículos con un vocabulario de frecuencias de Zipf
+  (mezclado con stopwords, como el texto real) y enlaces a otros artículos con
+  popularidad de ley de potencias. Genera tanto las listas de palabras (para
+  las etapas de conteo, sin pasar por el HTML) como páginas HTML con la
+  estructura de Wikipedia (`html`, `write_pages`), en el formato del
+  directorio de páginas de `dump_reader` (`DUMP_PATH`).
+- `synthetic_graph`: red de palabras y bigramas con grados de ley de potencias
+  (modelo de Chung-Lu) en el esquema de los CSV exportados.
+- `synthetic_metrics_nodes`: tabla de nodos con `modularity_class` y `degree`,
+  como `*_metrics_nodes.csv`.
+
+El resultado solo depende de los parámetros y de la semilla, de modo que los
+resultados de distintos commits son comparables.
+
+Uso:
+    python benchmarks/synthetic_corpus.py --articles 10000 --output /tmp/paginas
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dump_reader import html_path
+
+# Stopwords frecuentes intercaladas en el texto (la etapa de NLP las descarta)
+STOPWORDS = ("the of and in to a is was for as with by on that from are an be it at or which this "
+             "has its have been also were not their but can more other used".split())
+SYLLABLES = ("ba be bi bo bu ca ce ci co cu da de di do du fa fe fi fo fu la le li lo lu "
+             "ma me mi mo mu na ne ni no nu pa pe pi po pu ra re ri ro ru ta te ti to tu").split()
+
+
+def synthetic_word(index):
+    """Palabra pronunciable y única para cada índice (p. ej. 0 -> 'babax')."""
+    parts = []
+    index += len(SYLLABLES)  # Al menos dos sílabas
+    while index:
+        index, syllable = divmod(index, len(SYLLABLES))
+        parts.append(SYLLABLES[syllable])
+    return ''.join(parts) + 'x'
+
+
+def zipf_probabilities(size, exponent=1.1):
+    weights = 1.0 / np.arange(1, size + 1) ** exponent
+    return weights / weights.sum()
+
+
+class SyntheticCorpus:
+    """
+    Parámetros:
+    - num_articles (int): Número de artículos.
+    - words_per_article (int): Palabras de contenido por artículo (sin stopwords).
+    - vocabulary (int): Tamaño del vocabulario (por defecto crece con el corpus).
+    - links_per_article (int): Enlaces de cada artículo.
+    - paragraphs (int): Párrafos de cada página HTML.
+    - seed (int): Semilla.
+    """
+
+    def __init__(self, num_articles, words_per_article=200, vocabulary=None, links_per_article=40,
+                 paragraphs=12, seed=0):
+        self.num_articles = num_articles
+        self.words_per_article = words_per_article
+        self.vocabulary = [synthetic_word(i) for i in range(vocabulary or max(2000, num_articles // 2))]
+        self.links_per_article = links_per_article
+        self.paragraphs = paragraphs
+        self.seed = seed
+        # Distribuciones acumuladas: muestrear con searchsorted no recorre el vocabulario en cada artículo
+        self.word_cdf = np.cumsum(zipf_probabilities(len(self.vocabulary)))
+        self.link_cdf = np.cumsum(zipf_probabilities(num_articles, exponent=0.8))
+
+    def title(self, index):
+        return f"Articulo_{index}"
+
+    def _rng(self, index):
+        return np.random.default_rng((self.seed, index))
+
+    def article(self, index):
+        """
+        Retorna:
+        - Tuple[List[str], List[int]]: Palabras de contenido e índices de los artículos enlazados.
+        """
+        rng = self._rng(index)
+        words = np.searchsorted(self.word_cdf, rng.random(self.words_per_article) * self.word_cdf[-1])
+        links = np.searchsorted(self.link_cdf, rng.random(self.links_per_article) * self.link_cdf[-1])
+        return [self.vocabulary[i] for i in words.tolist()], links.tolist()
+
+    def words(self, limit=None):
+        """
+        Retorna:
+        - Iterator[Tuple[str, List[str], Set[str]]]: (URL, palabras, URLs enlazadas) de cada artículo.
+        """
+        base_url = "https://en.wikipedia.org/wiki/"
+        for index in range(min(limit or self.num_articles, self.num_articles)):
+            words, links = self.article(index)
+            yield base_url + self.title(index), words, {base_url + self.title(link) for link in links}
+
+    def html(self, index):
+        """
+        Página HTML del artículo `index` con la estructura de Wikipedia: las
+        palabras de contenido repartidas en párrafos con stopwords intercaladas.
+        """
+        words, links = self.article(index)
+        # Una stopword tras cada dos palabras de contenido
+        tokens = [f"{word} {STOPWORDS[(index + i) % len(STOPWORDS)]}" if i % 2 else word
+                  for i, word in enumerate(words)]
+        size = max(1, len(tokens) // self.paragraphs)
+        paragraphs = []
+        for number, start in enumerate(range(0, len(tokens), size)):
+            target = self.title(links[number % len(links)])
+            paragraphs.append(f"<p>{' '.join(tokens[start:start + size]).capitalize()}. "
+                              f"<a href=\"/wiki/{target}\">{target.replace('_', ' ')}</a>.</p>")
+        nav = ''.join(f'<li><a href="/wiki/{self.title(link)}">{self.title(link)}</a></li>' for link in links)
+        title = self.title(index)
+        return (
+            f"<!DOCTYPE html><html><head><title>{title} - Wikipedia</title>"
+            f'<link rel="canonical" href="https://en.wikipedia.org/wiki/{title}">'
+            '<script>RLCONF={"wgRevisionId":1};</script></head><body>'
+            '<div id="mw-navigation"><a href="/wiki/Main_Page">Main Page</a></div>'
+            f'<div id="mw-content-text"><h1>{title}</h1>{"".join(paragraphs)}<ul>{nav}</ul></div>'
+            "</body></html>"
+        )
+
+    def write_pages(self, directory, limit=None):
+        """
+        Guarda las páginas HTML en `directory` con los nombres que espera
+        `dump_reader.HtmlDirectoryFetcher`.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for index in range(min(limit or self.num_articles, self.num_articles)):
+            with open(html_path(directory, self.title(index)), 'w', encoding='utf-8') as f:
+                f.write(self.html(index))
+
+
+def synthetic_graph(num_nodes, average_degree=8, bigram_share=0.1, seed=0):
+    """
+    Red de palabras y bigramas con grados de ley de potencias (Chung-Lu).
+
+    Retorna:
+    - Tuple[pandas.DataFrame, pandas.DataFrame]: Nodos (`Id,Label,Group,Attribute`)
+      y aristas (`Source,Target,Type,Weight`, Source < Target, sin repetir).
+    """
+    rng = np.random.default_rng(seed)
+    expected = zipf_probabilities(num_nodes, exponent=0.7)
+    num_edges = num_nodes * average_degree // 2
+    sources = rng.choice(num_nodes, size=num_edges * 2, p=expected)
+    targets = rng.choice(num_nodes, size=num_edges * 2, p=expected)
+    low, high = np.minimum(sources, targets), np.maximum(sources, targets)
+    keys = np.unique((low[low != high].astype(np.int64) << 32) | high[low != high])
+    rng.shuffle(keys)
+    keys = keys[:num_edges]
+    sources, targets = (keys >> 32).astype(np.int64), (keys & 0xFFFFFFFF).astype(np.int64)
+
+    groups = np.where(rng.random(num_nodes) < bigram_share, 'bigram', 'word')
+    labels = [synthetic_word(i) if group == 'word' else f"{synthetic_word(i)} {synthetic_word(i + 1)}"
+              for i, group in enumerate(groups.tolist())]
+    nodes = pd.DataFrame({
+        'Id': np.arange(1, num_nodes + 1),
+        'Label': labels,
+        'Group': groups,
+        'Attribute': (rng.zipf(1.8, size=num_nodes) + 4).clip(max=10 ** 6),
+    })
+    edges = pd.DataFrame({
+        'Source': sources + 1,
+        'Target': targets + 1,
+        'Type': 'Undirected',
+        'Weight': rng.zipf(2.0, size=len(sources)).clip(max=10 ** 6),
+    })
+    return nodes, edges
+
+
+def synthetic_metrics_nodes(nodes, edges, communities=None, seed=0):
+    """
+    Tabla de nodos con `degree` y `modularity_class` (comunidades de tamaño de
+    ley de potencias), como los ficheros `*_metrics_nodes.csv`.
+    """
+    rng = np.random.default_rng(seed)
+    degree = np.bincount(np.concatenate([edges['Source'].to_numpy(), edges['Target'].to_numpy()]) - 1,
+                         minlength=len(nodes))
+    communities = communities or max(2, len(nodes) // 50)
+    classes = rng.choice(communities, size=len(nodes), p=zipf_probabilities(communities))
+    metrics = nodes[['Id', 'Label']].copy()
+    metrics['modularity_class'] = classes
+    metrics['degree'] = degree
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera páginas HTML sintéticas para DUMP_PATH.")
+    parser.add_argument('--articles', type=int, default=10_000)
+    parser.add_argument('--words', type=int, default=200, help="Palabras de contenido por artículo")
+    parser.add_argument('--output', required=True, help="Directorio de salida")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    SyntheticCorpus(args.articles, words_per_article=args.words, seed=args.seed).write_pages(args.output)
+    print(f"{args.articles} páginas guardadas en {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+"""
+Conteo vectorizado de co-ocurrencias de palabras en ventanas deslizantes.
+
+Las palabras se internan en un vocabulario de enteros y, para cada distancia
+d < ventana, los pares (i, i + d) se forman desplazando el array de IDs. Cada
+par se empaqueta en una clave int64 (id_menor << 32 | id_mayor) y se acumula
+con NumPy en lugar de crear una tupla de cadenas por par y ventana.
+
+El resultado es idéntico al de `pipeline.get_cooccurrence_edges` + `Counter`,
+incluido el orden de primera aparición de los pares, para una o varias
+ventanas en una sola pasada.
+"""
+from collections import Counter
+
+import numpy as np
+
+ID_BITS = 32
+ID_MASK = (1 << ID_BITS) - 1
+
+
+class Vocabulary:
+    """
+    Tabla bidireccional palabra <-> ID entero (en orden de primera aparición).
+    """
+
+    def __init__(self):
+        self.index = {}
+        self.tokens = []
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def add(self, token):
+        token_id = self.index.get(token)
+        if token_id is None:
+            token_id = self.index[token] = len(self.tokens)
+            self.tokens.append(token)
+        return token_id
+
+    def encode(self, words):
+        """
+        Retorna:
+        - numpy.ndarray: IDs (int64) de `words`, añadiendo al vocabulario las nuevas.
+        """
+        return np.fromiter((self.add(word) for word in words), dtype=np.int64, count=len(words))
+
+
+def window_pairs(ids, window_size):
+    """
+    Calcula los pares de una secuencia de IDs dentro de una ventana deslizante.
+
+    Un par en las posiciones (p, p + d) aparece en tantas ventanas como
+    posiciones de inicio i cumplen max(0, p + d - w + 1) <= i <= min(p, n - w).
+
+    Retorna:
+    - Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: Claves empaquetadas,
+      número de apariciones y orden de la primera aparición de cada par
+      (ventana de inicio y posición del par dentro de ella).
+    """
+    n = len(ids)
+    w = window_size
+    if n < w or w < 2:
+        # Una ventana de menos de dos palabras no contiene pares
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+
+    keys, counts, orders = [], [], []
+    positions = np.arange(n, dtype=np.int64)
+    # Rango de cada par (j, k) dentro de una ventana, en el orden de los bucles originales
+    pair_rank = np.zeros((w, w), dtype=np.int64)
+    rank = 0
+    for j in range(w):
+        for k in range(j + 1, w):
+            pair_rank[j, k] = rank
+            rank += 1
+    pairs_per_window = rank
+
+    for d in range(1, w):
+        p = positions[:n - d]
+        first_window = np.maximum(0, p + d - w + 1)
+        last_window = np.minimum(p, n - w)
+        multiplicity = last_window - first_window + 1
+        a = ids[:n - d]
+        b = ids[d:]
+        low = np.minimum(a, b)
+        high = np.maximum(a, b)
+        keys.append((low << ID_BITS) | high)
+        counts.append(multiplicity)
+        j = p - first_window
+        orders.append(first_window * pairs_per_window + pair_rank[j, j + d])
+
+    return np.concatenate(keys), np.concatenate(counts), np.concatenate(orders)
+
+
+def _reduce(keys, counts, orders):
+    # Agrupa claves repetidas: suma sus apariciones y conserva su primera aparición
+    if len(keys) == 0:
+        return keys, counts, orders
+    sort = np.argsort(keys, kind='stable')
+    keys = keys[sort]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    return keys[starts], np.add.reduceat(counts[sort], starts), np.minimum.reduceat(orders[sort], starts)
+
+
+class CooccurrenceCounter:
+    """
+    Acumulador de co-ocurrencias para uno o varios tamaños de ventana.
+
+    Parámetros:
+    - window_sizes (Iterable[int]): Tamaños de ventana a contar en la misma pasada.
+    - compact_every (int): Número de pares en búfer tras el que se agrupan las claves.
+    """
+
+    def __init__(self, window_sizes=(5,), compact_every=5_000_000):
+        self.window_sizes = tuple(dict.fromkeys(window_sizes))
+        self.compact_every = compact_every
+        self.vocab = Vocabulary()
+        self.windows_seen = {w: 0 for w in self.window_sizes}
+        self.buffers = {w: [] for w in self.window_sizes}
+        self.buffered = {w: 0 for w in self.window_sizes}
+        self.tables = {w: _reduce(*(np.empty(0, dtype=np.int64),) * 3) for w in self.window_sizes}
+
+    def add(self, words):
+        """
+        Añade las co-ocurrencias de la lista de palabras de un artículo.
+        """
+        ids = self.vocab.encode(words)
+        for w in self.window_sizes:
+            keys, counts, orders = window_pairs(ids, w)
+            if len(keys) == 0:
+                continue
+            # El orden es global: las ventanas de este artículo van después de las anteriores
+            pairs_per_window = w * (w - 1) // 2
+            orders += self.windows_seen[w] * pairs_per_window
+            self.windows_seen[w] += len(ids) - w + 1
+            self.buffers[w].append(_reduce(keys, counts, orders))
+            self.buffered[w] += len(keys)
+            if self.buffered[w] >= self.compact_every:
+                self._compact(w)
+
+    def subtract(self, words):
+        """
+        Resta las co-ocurrencias de la lista de palabras de un artículo añadido
+        antes (actualización incremental). Los pares que quedan sin apariciones
+        se eliminan; el orden de primera aparición de los demás no cambia.
+        """
+        ids = self.vocab.encode(words)
+        for w in self.window_sizes:
+            keys, counts, orders = window_pairs(ids, w)
+            if len(keys) == 0:
+                continue
+            # Orden máximo: la resta no adelanta la primera aparición de ningún par
+            orders = np.full(len(keys), np.iinfo(np.int64).max, dtype=np.int64)
+            self.buffers[w].append(_reduce(keys, -counts, orders))
+            self.buffered[w] += len(keys)
+            if self.buffered[w] >= self.compact_every:
+                self._compact(w)
+
+    def _compact(self, w):
+        if not self.buffers[w]:
+            return
+        parts = [self.tables[w]] + self.buffers[w]
+        keys, counts, orders = _reduce(*(np.concatenate(column) for column in zip(*parts)))
+        # Pares cuyas apariciones se han restado por completo
+        present = counts != 0
+        self.tables[w] = (keys[present], counts[present], orders[present])
+        self.buffers[w] = []
+        self.buffered[w] = 0
+
+    def merge(self, other):
+        """
+        Suma a este contador las co-ocurrencias de `other`, como si sus
+        artículos se hubieran añadido a continuación de los de este.
+        """
+        remap = self.vocab.encode(other.vocab.tokens)
+        for w in self.window_sizes:
+            if w not in other.window_sizes:
+                raise ValueError(f"El contador a combinar no tiene la ventana {w}")
+            other._compact(w)
+            keys, counts, orders = other.tables[w]
+            if len(keys) == 0:
+                continue
+            a = remap[keys >> ID_BITS]
+            b = remap[keys & ID_MASK]
+            keys = (np.minimum(a, b) << ID_BITS) | np.maximum(a, b)
+            orders = orders + self.windows_seen[w] * (w * (w - 1) // 2)
+            self.windows_seen[w] += other.windows_seen[w]
+            self.buffers[w].append(_reduce(keys, counts.copy(), orders))
+            self.buffered[w] += len(keys)
+            if self.buffered[w] >= self.compact_every:
+                self._compact(w)
+
+    def arrays(self, window_size=5):
+        """
+        Devuelve las aristas acumuladas en el orden de primera aparición.
+
+        Retorna:
+        - Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: IDs de origen y destino
+          (según el vocabulario) y pesos.
+        """
+        self._compact(window_size)
+        keys, counts, orders = self.tables[window_size]
+        sort = np.argsort(orders, kind='stable')
+        keys = keys[sort]
+        return keys >> ID_BITS, keys & ID_MASK, counts[sort]
+
+    def to_counter(self, window_size=5):
+        """
+        Retorna:
+        - collections.Counter: {(palabra1, palabra2): peso} con cada par ordenado
+          alfabéticamente, como `Counter(get_cooccurrence_edges(words))`.
+        """
+        sources, targets, weights = self.arrays(window_size)
+        tokens = self.vocab.tokens
+        counter = Counter()
+        for source, target, weight in zip(sources.tolist(), targets.tolist(), weights.tolist()):
+            word1, word2 = tokens[source], tokens[target]
+            counter[(word1, word2) if word1 <= word2 else (word2, word1)] = weight
+        return counter
+
+    def nbytes(self):
+        """
+        Memoria ocupada por los arrays de conteo (sin contar el vocabulario).
+        """
+        total = 0
+        for w in self.window_sizes:
+            total += sum(column.nbytes for column in self.tables[w])
+            total += sum(column.nbytes for part in self.buffers[w] for column in part)
+        return total
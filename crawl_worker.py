@@ -0,0 +1,38 @@
+"""
+Proceso de rastreo externo para el modo distribuido (`CRAWL_WORKERS` en
+`pipeline.py`).
+
+`pipeline.crawl_wikipedia_sharded` crea la frontera compartida y lanza los
+procesos locales; los demás se pueden ejecutar con este script en otras
+máquinas que compartan el sistema de ficheros (la frontera y el directorio de
+agregados parciales). El sistema de ficheros debe admitir los bloqueos de SQLite.
+
+Uso:
+    python crawl_worker.py --worker 3 --workers 4
+"""
+import argparse
+
+import pipeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Proceso de rastreo con una frontera compartida.")
+    parser.add_argument('--worker', type=int, required=True, help="Número de este proceso (0 .. workers - 1)")
+    parser.add_argument('--workers', type=int, default=pipeline.CRAWL_WORKERS)
+    parser.add_argument('--seed', default="https://en.wikipedia.org/wiki/Fentanyl")
+    parser.add_argument('--base-url', default="https://en.wikipedia.org")
+    parser.add_argument('--max-depth', type=int, default=pipeline.MAX_DEPTH)
+    parser.add_argument('--max-articles', type=int, default=pipeline.MAX_ARTICLES)
+    parser.add_argument('--frontier', default=pipeline.SHARED_FRONTIER_PATH)
+    parser.add_argument('--partials', default=pipeline.PARTIALS_DIR)
+    args = parser.parse_args()
+
+    pipeline.run_crawl_worker(
+        args.worker, args.workers, args.seed, args.base_url, args.max_depth, args.max_articles,
+        frontier_path=args.frontier, partials_dir=args.partials, dump_path=pipeline.DUMP_PATH,
+        cache_dir=None if pipeline.DUMP_PATH else pipeline.HTTP_CACHE_DIR
+    )
+
+
+if __name__ == '__main__':
+    main()
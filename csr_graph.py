@@ -0,0 +1,350 @@
+"""
+Grafo compacto en formato CSR (Compressed Sparse Row) respaldado por arrays de NumPy.
+
+Alternativa a `networkx.Graph`/`DiGraph` para las redes exportadas: los nodos
+se guardan como una tabla de etiquetas con su grupo y atributo, y las aristas
+como arrays `offsets`/`targets`/`weights`/`types` (unos pocos bytes por arista
+frente a los cientos de los diccionarios de NetworkX).
+
+El orden de las listas de adyacencia reproduce el de NetworkX (orden de
+inserción de las aristas), de modo que `write_csv` genera exactamente los
+mismos ficheros `Id,Label,Group,Attribute` / `Source,Target,Type,Weight` que
+`pipeline.export_graph` con un grafo de NetworkX.
+
+Además del CSV, el grafo se puede guardar en formato binario por columnas para
+que los scripts de análisis (`src/graph_store.py`) lo carguen sin analizar texto:
+- 'npy': un directorio `<prefijo>.graph/` con un array `.npy` por columna (las
+  aristas se pueden abrir con memory-map) y `meta.json` con las tablas de nombres.
+- 'parquet': `<prefijo>_nodes.parquet` y `<prefijo>_edges.parquet` con las mismas
+  columnas que el CSV. Requiere `pip install pyarrow`.
+"""
+import csv
+import json
+import os
+from itertools import islice
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow es opcional
+    pa = None
+
+BINARY_FORMATS = ('npy', 'parquet')
+NPY_FORMAT_VERSION = 1
+
+
+def _codes(values, names=None):
+    # Codifica una secuencia de cadenas como enteros pequeños y su tabla de nombres
+    names = list(names or [])
+    index = {name: code for code, name in enumerate(names)}
+    codes = []
+    for value in values:
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(names)
+            names.append(value)
+        codes.append(code)
+    return np.array(codes, dtype=np.int8), names
+
+
+class CSRGraph:
+    """
+    Grafo con nodos etiquetados y aristas ponderadas y tipadas en formato CSR.
+
+    Parámetros:
+    - labels (List[str]): Etiqueta de cada nodo (su índice es la posición).
+    - groups (numpy.ndarray): Código de grupo de cada nodo (índice en `group_names`).
+    - group_names (List[str]): Nombres de los grupos ('word', 'bigram', 'link'...).
+    - attributes (numpy.ndarray): Atributo (frecuencia) de cada nodo.
+    - offsets (numpy.ndarray): Inicio de la adyacencia de cada nodo en `targets` (n + 1).
+    - targets, weights, types (numpy.ndarray): Vecino, peso y código de tipo de cada entrada.
+    - type_names (List[str]): Nombres de los tipos de arista.
+    - directed (bool): En un grafo no dirigido cada arista aparece en la adyacencia
+      de sus dos extremos (una sola vez si es un bucle).
+    """
+
+    def __init__(self, labels, groups, group_names, attributes, offsets, targets, weights, types,
+                 type_names, directed=False):
+        self.labels = labels
+        self.groups = groups
+        self.group_names = group_names
+        self.attributes = attributes
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.types = types
+        self.type_names = type_names
+        self.directed = directed
+
+    @classmethod
+    def from_edges(cls, labels, groups, attributes, sources, targets, weights, types, directed=False):
+        """
+        Construye el grafo a partir de las aristas en orden de inserción.
+
+        Una arista repetida se combina como en NetworkX: conserva la posición de
+        su primera inserción y el peso y el tipo de la última.
+
+        Parámetros:
+        - labels (List[str]): Etiquetas de los nodos.
+        - groups (Iterable[str]): Grupo de cada nodo.
+        - attributes (Iterable[int]): Atributo de cada nodo.
+        - sources, targets (Iterable[int]): Índices de los extremos de cada arista.
+        - weights (Iterable[int]): Peso de cada arista.
+        - types (Iterable[str] | Tuple[numpy.ndarray, List[str]]): Tipo de cada arista,
+          como cadenas o ya codificado (códigos, nombres).
+        - directed (bool): Si el grafo es dirigido.
+        """
+        n = len(labels)
+        group_codes, group_names = _codes(groups)
+        if isinstance(types, tuple):
+            type_codes, type_names = np.asarray(types[0], dtype=np.int8), list(types[1])
+        else:
+            type_codes, type_names = _codes(types)
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.int64)
+
+        if len(sources):
+            if directed:
+                keys = (sources << 32) | targets
+            else:
+                keys = (np.minimum(sources, targets) << 32) | np.maximum(sources, targets)
+            sort = np.argsort(keys, kind='stable')
+            starts = np.flatnonzero(np.r_[True, keys[sort][1:] != keys[sort][:-1]])
+            if len(starts) < len(keys):
+                # Posición de la primera inserción, atributos de la última
+                first = sort[starts]
+                last = sort[np.r_[starts[1:], len(sort)] - 1]
+                order = np.argsort(first, kind='stable')
+                first, last = first[order], last[order]
+                sources, targets = sources[first], targets[first]
+                weights, type_codes = weights[last], type_codes[last]
+
+        edge_ids = np.arange(len(sources), dtype=np.int64)
+        if directed:
+            rows, cols, ids = sources, targets, edge_ids
+        else:
+            # Cada arista entra en la adyacencia de ambos extremos, salvo los bucles
+            loops = sources == targets
+            rows = np.concatenate([sources, targets[~loops]])
+            cols = np.concatenate([targets, sources[~loops]])
+            ids = np.concatenate([edge_ids, edge_ids[~loops]])
+        # Adyacencia de cada nodo en el orden de inserción de sus aristas, como en NetworkX
+        order = np.lexsort((ids, rows))
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=offsets[1:])
+        index_dtype = np.int32 if n < 2 ** 31 else np.int64
+        return cls(
+            labels, group_codes, group_names, np.asarray(attributes, dtype=np.int64), offsets,
+            cols[order].astype(index_dtype), weights[ids[order]], type_codes[ids[order]],
+            type_names, directed
+        )
+
+    @classmethod
+    def from_networkx(cls, graph):
+        """
+        Convierte un `networkx.Graph`/`DiGraph` con atributos 'Group', 'Attribute',
+        'Type' y 'Weight' conservando el orden de nodos y aristas.
+        """
+        labels = list(graph.nodes)
+        index = {label: i for i, label in enumerate(labels)}
+        data = [graph.nodes[label] for label in labels]
+        default_type = 'Directed' if graph.is_directed() else 'Undirected'
+        edges = list(graph.edges(data=True))
+        return cls.from_edges(
+            labels, [d['Group'] for d in data], [d['Attribute'] for d in data],
+            [index[u] for u, _, _ in edges], [index[v] for _, v, _ in edges],
+            [d.get('Weight', 1) for _, _, d in edges], [d.get('Type', default_type) for _, _, d in edges],
+            directed=graph.is_directed()
+        )
+
+    def number_of_nodes(self):
+        return len(self.labels)
+
+    def number_of_edges(self):
+        if self.directed:
+            return len(self.targets)
+        rows = self._rows()
+        return int(np.count_nonzero(self.targets >= rows))
+
+    def nbytes(self):
+        """
+        Memoria ocupada por los arrays (sin contar las etiquetas).
+        """
+        arrays = (self.groups, self.attributes, self.offsets, self.targets, self.weights, self.types)
+        return sum(array.nbytes for array in arrays)
+
+    def _rows(self):
+        return np.repeat(np.arange(len(self.labels), dtype=self.targets.dtype), np.diff(self.offsets))
+
+    def neighbors(self, node):
+        """
+        Retorna:
+        - numpy.ndarray: Índices de los vecinos (sucesores si es dirigido) de `node`.
+        """
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def edges(self):
+        """
+        Devuelve las aristas en el orden en que las recorre NetworkX.
+
+        Retorna:
+        - Tuple[numpy.ndarray, ...]: Índices de origen y destino, pesos y códigos de tipo.
+        """
+        rows = self._rows()
+        if self.directed:
+            return rows, self.targets, self.weights, self.types
+        # Cada arista no dirigida se emite desde el extremo que aparece primero
+        mask = self.targets >= rows
+        return rows[mask], self.targets[mask], self.weights[mask], self.types[mask]
+
+    def to_networkx(self):
+        """
+        Convierte el grafo en un `networkx.Graph` (o `DiGraph`) equivalente.
+        """
+        import networkx as nx
+
+        graph = nx.DiGraph() if self.directed else nx.Graph()
+        group_names = self.group_names
+        graph.add_nodes_from(
+            (label, {'Group': group_names[group], 'Attribute': attribute})
+            for label, group, attribute in zip(self.labels, self.groups.tolist(), self.attributes.tolist())
+        )
+        labels = self.labels
+        type_names = self.type_names
+        sources, targets, weights, types = self.edges()
+        graph.add_edges_from(
+            (labels[source], labels[target], {'Type': type_names[edge_type], 'Weight': weight})
+            for source, target, weight, edge_type in zip(
+                sources.tolist(), targets.tolist(), weights.tolist(), types.tolist()
+            )
+        )
+        return graph
+
+    def write_nodes_csv(self, path, chunk_size=100_000):
+        """
+        Escribe los nodos como `Id,Label,Group,Attribute` (Id = posición + 1).
+        """
+        group_names = self.group_names
+        rows = zip(
+            range(1, len(self.labels) + 1), self.labels,
+            (group_names[group] for group in self.groups.tolist()), self.attributes.tolist()
+        )
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Id', 'Label', 'Group', 'Attribute'])
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                writer.writerows(chunk)
+
+    def write_edges_csv(self, path, chunk_size=100_000):
+        """
+        Escribe las aristas como `Source,Target,Type,Weight`, por bloques de `chunk_size`.
+        """
+        sources, targets, weights, types = self.edges()
+        type_names = self.type_names
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Source', 'Target', 'Type', 'Weight'])
+            for start in range(0, len(sources), chunk_size):
+                end = start + chunk_size
+                writer.writerows(zip(
+                    (sources[start:end] + 1).tolist(), (targets[start:end] + 1).tolist(),
+                    [type_names[edge_type] for edge_type in types[start:end].tolist()],
+                    weights[start:end].tolist()
+                ))
+
+    def write_csv(self, output_nodes, output_edges, chunk_size=100_000):
+        self.write_nodes_csv(output_nodes, chunk_size)
+        self.write_edges_csv(output_edges, chunk_size)
+
+    def write_npy(self, directory):
+        """
+        Guarda el grafo como un directorio de arrays `.npy` en el orden del CSV.
+
+        Nodos: `labels.bin` (etiquetas UTF-8 concatenadas) y `label_offsets.npy`,
+        `groups.npy` y `attributes.npy`. Aristas: `sources.npy` y `targets.npy`
+        (posición del nodo, es decir, Id - 1), `weights.npy` y `types.npy`.
+        """
+        os.makedirs(directory, exist_ok=True)
+        encoded = [label.encode('utf-8') for label in self.labels]
+        label_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(label) for label in encoded], out=label_offsets[1:])
+        with open(os.path.join(directory, 'labels.bin'), 'wb') as f:
+            f.write(b''.join(encoded))
+        sources, targets, weights, types = self.edges()
+        arrays = {
+            'label_offsets': label_offsets, 'groups': self.groups, 'attributes': self.attributes,
+            'sources': sources, 'targets': targets, 'weights': weights, 'types': types,
+        }
+        for name, array in arrays.items():
+            np.save(os.path.join(directory, name + '.npy'), array)
+        meta = {
+            'version': NPY_FORMAT_VERSION, 'directed': self.directed,
+            'group_names': self.group_names, 'type_names': self.type_names,
+            'nodes': len(self.labels), 'edges': len(sources),
+        }
+        with open(os.path.join(directory, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    def write_parquet(self, output_nodes, output_edges):
+        """
+        Guarda los nodos y las aristas como dos ficheros Parquet con las columnas del CSV.
+        """
+        if pa is None:
+            raise ImportError("El formato 'parquet' requiere instalar pyarrow: pip install pyarrow")
+        n = len(self.labels)
+        nodes = pa.table({
+            'Id': np.arange(1, n + 1, dtype=np.int64),
+            'Label': pa.array(self.labels, type=pa.string()),
+            'Group': pa.DictionaryArray.from_arrays(self.groups, self.group_names),
+            'Attribute': self.attributes,
+        })
+        sources, targets, weights, types = self.edges()
+        edges = pa.table({
+            'Source': sources.astype(np.int64) + 1,
+            'Target': targets.astype(np.int64) + 1,
+            'Type': pa.DictionaryArray.from_arrays(types, self.type_names),
+            'Weight': weights,
+        })
+        pq.write_table(nodes, output_nodes)
+        pq.write_table(edges, output_edges)
+
+
+def binary_paths(output_nodes, output_edges, binary_format):
+    """
+    Rutas del formato binario correspondientes a los CSV `output_nodes`/`output_edges`.
+
+    Retorna:
+    - Tuple[str, str]: Para 'npy', el directorio `<prefijo>.graph` (dos veces);
+      para 'parquet', los ficheros de nodos y aristas con extensión `.parquet`.
+    """
+    if binary_format == 'npy':
+        prefix = output_nodes[:-len('_nodes.csv')] if output_nodes.endswith('_nodes.csv') \
+            else os.path.splitext(output_nodes)[0]
+        directory = prefix + '.graph'
+        return directory, directory
+    if binary_format == 'parquet':
+        return os.path.splitext(output_nodes)[0] + '.parquet', os.path.splitext(output_edges)[0] + '.parquet'
+    raise ValueError(f"Formato binario desconocido '{binary_format}'. Opciones: {BINARY_FORMATS}")
+
+
+def write_binary(graph, output_nodes, output_edges, binary_format):
+    """
+    Guarda `graph` (CSRGraph o grafo de NetworkX) en `binary_format` junto a sus CSV.
+
+    Retorna:
+    - Tuple[str, str]: Rutas escritas (ver `binary_paths`).
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_networkx(graph)
+    nodes_path, edges_path = binary_paths(output_nodes, output_edges, binary_format)
+    if binary_format == 'npy':
+        graph.write_npy(nodes_path)
+    else:
+        graph.write_parquet(nodes_path, edges_path)
+    return nodes_path, edges_path
@@ -0,0 +1,342 @@
+"""
+Ingesta sin conexión desde un volcado local de Wikipedia.
+
+Se admiten dos tipos de volcado:
+- XML de páginas (`pages-articles*.xml` o `.xml.bz2`): se recorre en streaming
+  con `iterparse`, liberando cada página tras procesarla, y se guarda en un
+  índice SQLite (título -> redirección, revisión y wikitexto comprimido). El
+  índice se construye una sola vez y se reutiliza mientras el volcado no cambie.
+- Directorio de páginas HTML guardadas (`<Título>.html`, con el título
+  codificado como en la URL).
+
+En ambos casos se ofrece un "fetcher" compatible con `crawler.crawl`, de modo
+que el recorrido en anchura desde el artículo inicial, la extracción de texto
+y enlaces y la construcción de los grafos son los mismos que en el rastreo en
+vivo, pero a velocidad de disco.
+"""
+import bz2
+import os
+import re
+import sqlite3
+import zlib
+from concurrent.futures import Future
+from urllib.parse import quote, unquote
+from xml.etree import ElementTree
+
+import requests
+
+# Caracteres que MediaWiki no codifica en las URLs de los artículos
+TITLE_SAFE_CHARS = ";@$!*(),/~:"
+
+WIKITEXT_CONTENT_TYPE = 'text/x-wiki; charset=utf-8'
+# Cabecera con la que las respuestas locales indican la revisión del artículo
+REVISION_HEADER = 'X-Wiki-Revision'
+
+COMMENT_RE = re.compile(r'<!--.*?-->', re.S)
+REF_RE = re.compile(r'<ref[^>]*/>|<ref[^>]*>.*?</ref>', re.S | re.I)
+INNER_LINK_RE = re.compile(r'\[\[([^\[\]]*)\]\]')
+TEMPLATE_RE = re.compile(r'\{\{[^{}]*\}\}')
+TABLE_RE = re.compile(r'\{\|(?:(?!\{\|).)*?\|\}', re.S)
+EXTERNAL_LINK_RE = re.compile(r'\[(?:https?:)?//[^\s\]]+\s*([^\]]*)\]')
+TAG_RE = re.compile(r'<[^>]+>')
+QUOTES_RE = re.compile(r"'{2,}")
+# Líneas que en el HTML no forman parte de un párrafo <p>
+NON_PARAGRAPH_PREFIXES = ('=', '*', '#', ':', ';', '|', '!', '{', '}', '__')
+
+
+def normalize_title(title):
+    """
+    Normaliza un título como MediaWiki: guiones bajos y primera letra en mayúscula.
+    """
+    title = re.sub(r'[\s_]+', '_', title.strip()).strip('_')
+    return title[:1].upper() + title[1:]
+
+
+def title_to_url(title, base_url):
+    return f"{base_url}/wiki/{quote(normalize_title(title), safe=TITLE_SAFE_CHARS)}"
+
+
+def url_to_title(url):
+    return normalize_title(unquote(url.split('/wiki/', 1)[-1]))
+
+
+def _replace_links(wikitext, targets=None):
+    # Sustituye los enlaces internos (de dentro hacia fuera) por su texto visible;
+    # los enlaces con espacio de nombres (File:, Category:...) se eliminan
+    def replace(match):
+        target, _, label = match.group(1).partition('|')
+        if ':' in target:
+            return ''
+        if targets is not None:
+            targets.append(target)
+        return label or target
+
+    previous = None
+    while previous != wikitext:
+        previous = wikitext
+        wikitext = INNER_LINK_RE.sub(replace, wikitext)
+    return wikitext
+
+
+def _strip_nested(pattern, wikitext):
+    previous = None
+    while previous != wikitext:
+        previous = wikitext
+        wikitext = pattern.sub('', wikitext)
+    return wikitext
+
+
+def extract_wikitext_links(wikitext, base_url):
+    """
+    Extrae los enlaces a otros artículos del wikitexto con los mismos filtros que
+    `extract_wikipedia_links` aplica a los enlaces del HTML.
+
+    Solo se ven los enlaces escritos en el propio artículo: los que en el HTML
+    proceden de plantillas expandidas (navboxes) no aparecen en el volcado.
+    """
+    targets = []
+    _replace_links(COMMENT_RE.sub('', wikitext), targets)
+    links = set()
+    for target in targets:
+        if '#' in target or not target.strip():
+            continue
+        title = normalize_title(target)
+        if title == 'Main_Page':
+            continue
+        links.add(title_to_url(title, base_url))
+    return links
+
+
+def wikitext_to_text(wikitext):
+    """
+    Convierte wikitexto en el texto plano equivalente a los párrafos <p> del HTML:
+    elimina comentarios, referencias, plantillas, tablas y marcado, y descarta
+    títulos de sección, listas y ficheros.
+    """
+    text = COMMENT_RE.sub('', wikitext)
+    text = REF_RE.sub('', text)
+    text = _replace_links(text)
+    text = _strip_nested(TEMPLATE_RE, text)
+    text = _strip_nested(TABLE_RE, text)
+    text = EXTERNAL_LINK_RE.sub(r'\1', text)
+    text = TAG_RE.sub('', text)
+    text = QUOTES_RE.sub('', text)
+    paragraphs = [
+        line.strip() for line in text.splitlines()
+        if line.strip() and not line.lstrip().startswith(NON_PARAGRAPH_PREFIXES)
+    ]
+    return '\n'.join(paragraphs)
+
+
+def _open_dump(path):
+    if path.endswith('.bz2'):
+        return bz2.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def iter_xml_pages(path):
+    """
+    Recorre en streaming las páginas de un volcado XML de MediaWiki.
+
+    Retorna:
+    - Iterator[Tuple[str, int, Optional[str], Optional[int], str]]:
+      (título, espacio de nombres, destino de la redirección, revisión, wikitexto).
+    """
+    with _open_dump(path) as f:
+        context = ElementTree.iterparse(f, events=('start', 'end'))
+        _, root = next(context)
+        namespace = root.tag[:root.tag.index('}') + 1] if root.tag.startswith('{') else ''
+        page_tag = namespace + 'page'
+        for event, elem in context:
+            if event != 'end' or elem.tag != page_tag:
+                continue
+            redirect = elem.find(namespace + 'redirect')
+            revision = elem.find(namespace + 'revision')
+            revision_id = revision.findtext(namespace + 'id') if revision is not None else None
+            text = revision.findtext(namespace + 'text') if revision is not None else None
+            yield (
+                elem.findtext(namespace + 'title'),
+                int(elem.findtext(namespace + 'ns') or 0),
+                redirect.get('title') if redirect is not None else None,
+                int(revision_id) if revision_id else None,
+                text or '',
+            )
+            # Liberar las páginas ya procesadas para mantener la memoria constante
+            root.clear()
+
+
+def build_dump_index(dump_path, index_path, batch_size=1000):
+    """
+    Construye (o reutiliza) el índice SQLite de los artículos de un volcado XML.
+
+    Retorna:
+    - str: Ruta del índice.
+    """
+    dump_stat = os.stat(dump_path)
+    signature = f"{os.path.abspath(dump_path)}:{dump_stat.st_size}:{dump_stat.st_mtime}"
+    conn = sqlite3.connect(index_path)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE IF NOT EXISTS pages (title TEXT PRIMARY KEY, redirect TEXT, revision INTEGER, text BLOB);
+    """)
+    row = conn.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+    if row is not None and row[0] == signature:
+        conn.close()
+        return index_path
+
+    print(f"Indexando el volcado {dump_path}...")
+    conn.executescript("DELETE FROM meta; DELETE FROM pages;")
+    batch = []
+    total = 0
+    for title, ns, redirect, revision, text in iter_xml_pages(dump_path):
+        if ns != 0:
+            continue
+        batch.append((
+            normalize_title(title),
+            normalize_title(redirect) if redirect else None,
+            revision,
+            None if redirect else zlib.compress(text.encode('utf-8')),
+        ))
+        if len(batch) >= batch_size:
+            conn.executemany("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?)", batch)
+            total += len(batch)
+            batch = []
+            print(f"Páginas indexadas: {total}")
+    conn.executemany("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?)", batch)
+    total += len(batch)
+    conn.execute("INSERT INTO meta VALUES ('signature', ?)", (signature,))
+    conn.commit()
+    conn.close()
+    print(f"Índice completado: {total} páginas en {index_path}\n")
+    return index_path
+
+
+def _local_response(url, content, content_type):
+    response = requests.Response()
+    response.url = url
+    if content is None:
+        response.status_code = 404
+        response.reason = 'Not Found'
+        response._content = b''
+    else:
+        response.status_code = 200
+        response.reason = 'OK'
+        response._content = content
+        response.headers['Content-Type'] = content_type
+        response.encoding = 'utf-8'
+    return response
+
+
+class _LocalFetcher:
+    """
+    Base de los fetchers locales: resuelven cada URL de forma síncrona y
+    devuelven un Future ya completado, como espera `crawler.crawl`.
+    """
+    max_in_flight = 1
+
+    def submit(self, url):
+        future = Future()
+        try:
+            response = self._fetch(url)
+            response.raise_for_status()
+            future.set_result(response)
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class DumpFetcher(_LocalFetcher):
+    """
+    Sirve el wikitexto de los artículos desde el índice de un volcado XML.
+    Las redirecciones se resuelven como en Wikipedia: la URL de la redirección
+    devuelve el contenido del artículo de destino.
+    """
+
+    def __init__(self, index_path, max_redirects=5):
+        self.conn = sqlite3.connect(index_path)
+        self.max_redirects = max_redirects
+
+    def lookup(self, title):
+        """
+        Retorna:
+        - Optional[Tuple[str, int, str]]: (título final, revisión, wikitexto) o None.
+        """
+        for _ in range(self.max_redirects + 1):
+            row = self.conn.execute(
+                "SELECT redirect, revision, text FROM pages WHERE title = ?", (title,)
+            ).fetchone()
+            if row is None:
+                return None
+            redirect, revision, text = row
+            if redirect is None:
+                return title, revision, zlib.decompress(text).decode('utf-8')
+            title = redirect
+        return None
+
+    def _fetch(self, url):
+        page = self.lookup(url_to_title(url))
+        if page is None:
+            return _local_response(url, None, WIKITEXT_CONTENT_TYPE)
+        # Como tras una redirección HTTP, la respuesta lleva la URL del artículo final
+        final_url = title_to_url(page[0], url.split('/wiki/', 1)[0])
+        response = _local_response(final_url, page[2].encode('utf-8'), WIKITEXT_CONTENT_TYPE)
+        if page[1] is not None:
+            response.headers[REVISION_HEADER] = str(page[1])
+        return response
+
+    def revision(self, url):
+        """
+        Retorna:
+        - Optional[str]: Revisión actual del artículo de `url` (None si no existe).
+        """
+        page = self.lookup(url_to_title(url))
+        return str(page[1]) if page is not None else None
+
+    def close(self):
+        self.conn.close()
+
+
+class HtmlDirectoryFetcher(_LocalFetcher):
+    """
+    Sirve las páginas HTML guardadas en un directorio (`<Título>.html`).
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _fetch(self, url):
+        path = html_path(self.directory, url_to_title(url))
+        content = None
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                content = f.read()
+        return _local_response(url, content, 'text/html; charset=UTF-8')
+
+
+def html_path(directory, title):
+    """
+    Ruta del fichero HTML guardado para `title` dentro de `directory`.
+    """
+    return os.path.join(directory, quote(normalize_title(title), safe='') + '.html')
+
+
+def open_dump(path):
+    """
+    Abre un volcado local y devuelve el fetcher correspondiente.
+
+    Parámetros:
+    - path (str): Directorio de páginas HTML o volcado XML (opcionalmente .bz2).
+      El índice de un volcado XML se guarda junto a él como `<volcado>.index.sqlite`.
+    """
+    if os.path.isdir(path):
+        return HtmlDirectoryFetcher(path)
+    return DumpFetcher(build_dump_index(path, path + '.index.sqlite'))
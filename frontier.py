@@ -0,0 +1,515 @@
+"""
+Frontera de rastreo y estado persistente del crawler.
+
+`Frontier` ofrece extracciones en tiempo constante (cola FIFO) o logarítmico
+(orden por prioridad) y registra cada URL encolada, de modo que un enlace que
+aparece en cientos de artículos se encola una sola vez.
+
+`CrawlState` guarda en SQLite los artículos visitados, la frontera y el texto
+y los enlaces extraídos de cada artículo, lo que permite reanudar un rastreo
+interrumpido en lugar de empezar de nuevo desde el artículo inicial.
+
+`SharedFrontier` es una frontera en SQLite compartida por varios procesos de
+rastreo (en una máquina o en varias con el mismo sistema de ficheros): cada
+URL se encola y se asigna una sola vez entre todos ellos.
+"""
+import heapq
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter, deque
+
+PRIORITIES = ('fifo', 'depth', 'inlinks')
+STATE_VERSION = 2   # Versión del esquema de `CrawlState` (PRAGMA user_version)
+
+
+class Frontier:
+    """
+    Cola de URLs pendientes con deduplicación al encolar.
+
+    Parámetros:
+    - priority (str): 'fifo' (orden de llegada), 'depth' (menor profundidad primero)
+      o 'inlinks' (más enlaces entrantes vistos hasta el momento primero).
+    """
+
+    def __init__(self, priority='fifo'):
+        if priority not in PRIORITIES:
+            raise ValueError(f"Prioridad desconocida '{priority}'. Opciones: {PRIORITIES}")
+        self.priority = priority
+        self.enqueued = set()   # Todas las URLs encoladas alguna vez
+        self.queued = {}        # URL -> profundidad de las que siguen pendientes
+        self.inlinks = Counter()
+        self.queue = deque()
+        self.heap = []
+        self.sequence = itertools.count()
+
+    def __len__(self):
+        return len(self.queued)
+
+    def __bool__(self):
+        return bool(self.queued)
+
+    def __contains__(self, url):
+        return url in self.enqueued
+
+    def _heap_push(self, url, depth):
+        if self.priority == 'depth':
+            key = depth
+        else:
+            key = -self.inlinks[url]
+        heapq.heappush(self.heap, (key, next(self.sequence), url, depth))
+
+    def push(self, url, depth):
+        """
+        Encola `url` si nunca antes se había encolado.
+
+        Retorna:
+        - bool: True si la URL se ha añadido a la cola.
+        """
+        if self.priority == 'inlinks':
+            self.inlinks[url] += 1
+            if url in self.queued:
+                # Entrada con la prioridad actualizada; la anterior queda obsoleta
+                self._heap_push(url, self.queued[url])
+                return False
+        if url in self.enqueued:
+            return False
+        self.enqueued.add(url)
+        self.queued[url] = depth
+        if self.priority == 'fifo':
+            self.queue.append(url)
+        else:
+            self._heap_push(url, depth)
+        return True
+
+    def pop(self):
+        """
+        Extrae la siguiente URL pendiente.
+
+        Retorna:
+        - Tuple[str, int]: (URL, profundidad).
+        """
+        if self.priority == 'fifo':
+            url = self.queue.popleft()
+            return url, self.queued.pop(url)
+        while True:
+            key, _, url, depth = heapq.heappop(self.heap)
+            if url not in self.queued:
+                continue
+            if self.priority == 'inlinks' and key != -self.inlinks[url]:
+                continue
+            del self.queued[url]
+            return url, depth
+
+    def entries(self):
+        """
+        Devuelve las URLs pendientes en el orden en que se extraerían.
+
+        Retorna:
+        - List[Tuple[str, int, int]]: (URL, profundidad, enlaces entrantes).
+        """
+        if self.priority == 'fifo':
+            urls = list(self.queue)
+        else:
+            seen = set()
+            urls = []
+            for key, _, url, _ in sorted(self.heap):
+                if url in self.queued and url not in seen:
+                    if self.priority == 'inlinks' and key != -self.inlinks[url]:
+                        continue
+                    seen.add(url)
+                    urls.append(url)
+        return [(url, self.queued[url], self.inlinks[url]) for url in urls]
+
+    def wait(self):
+        """
+        Llamado por `crawler.crawl` cuando la frontera está vacía y no hay descargas
+        en curso. Una frontera local no puede recibir más URLs.
+
+        Retorna:
+        - bool: True si hay nuevas URLs pendientes.
+        """
+        return False
+
+    def restore(self, entries, seen):
+        """
+        Reconstruye la frontera a partir de `entries()` y del conjunto de URLs ya vistas.
+        """
+        self.enqueued.update(seen)
+        for url, depth, inlinks in entries:
+            self.inlinks[url] = inlinks
+            self.enqueued.add(url)
+            self.queued[url] = depth
+            if self.priority == 'fifo':
+                self.queue.append(url)
+            else:
+                self._heap_push(url, depth)
+
+
+class CrawlState:
+    """
+    Estado de rastreo persistente en una base de datos SQLite.
+
+    Los artículos procesados se registran con `record_article` y se confirman,
+    junto con la frontera y los visitados, en cada `checkpoint`. Si el proceso
+    se interrumpe, los artículos posteriores al último checkpoint se vuelven a
+    rastrear al reanudar. Un rastreo terminado se marca con `complete` y no se
+    reanuda: la siguiente ejecución empieza de cero.
+
+    Parámetros:
+    - path (str): Ruta del fichero SQLite.
+    - seed (str): URL inicial; si no coincide con la guardada se empieza de cero.
+    - resume (bool): Si es False se descarta cualquier estado anterior.
+    """
+
+    def __init__(self, path, seed, resume=True):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != STATE_VERSION:
+            # Estado de una versión anterior con otro esquema: se descarta
+            self.conn.executescript("""
+                DROP TABLE IF EXISTS meta; DROP TABLE IF EXISTS visited; DROP TABLE IF EXISTS frontier;
+                DROP TABLE IF EXISTS articles; DROP TABLE IF EXISTS redirects;
+            """)
+            self.conn.execute(f"PRAGMA user_version = {STATE_VERSION}")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS visited (url TEXT PRIMARY KEY);
+            CREATE TABLE IF NOT EXISTS frontier (seq INTEGER PRIMARY KEY, url TEXT, depth INTEGER, inlinks INTEGER);
+            CREATE TABLE IF NOT EXISTS articles (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT UNIQUE,
+                text TEXT, links TEXT
+            );
+            CREATE TABLE IF NOT EXISTS redirects (source TEXT PRIMARY KEY, target TEXT);
+        """)
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'seed'").fetchone()
+        finished = self.conn.execute("SELECT 1 FROM meta WHERE key = 'complete'").fetchone()
+        if not resume or finished is not None or (row is not None and row[0] != seed):
+            self.reset()
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('seed', ?)", (seed,))
+        self.conn.commit()
+
+    def reset(self):
+        self.conn.executescript("""
+            DELETE FROM meta; DELETE FROM visited; DELETE FROM frontier; DELETE FROM articles;
+            DELETE FROM redirects;
+        """)
+        self.conn.commit()
+
+    def has_checkpoint(self):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'total'").fetchone()
+        finished = self.conn.execute("SELECT 1 FROM meta WHERE key = 'complete'").fetchone()
+        return row is not None and finished is None
+
+    def complete(self):
+        """
+        Marca el rastreo como terminado, de modo que no se reanude en la próxima ejecución.
+        """
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('complete', '1')")
+
+    def record_article(self, url, text, links):
+        """
+        Registra el texto y los enlaces extraídos de un artículo (se confirman en el
+        próximo checkpoint).
+        """
+        self.conn.execute(
+            "INSERT OR REPLACE INTO articles (url, text, links) VALUES (?, ?, ?)",
+            (url, text, json.dumps(sorted(links)))
+        )
+
+    def record_redirect(self, source, target):
+        """
+        Registra que la URL `source` redirige a `target` (se confirma en el próximo checkpoint).
+        """
+        self.conn.execute("INSERT OR REPLACE INTO redirects VALUES (?, ?)", (source, target))
+
+    def redirects(self):
+        """
+        Retorna:
+        - List[Tuple[str, str]]: Redirecciones confirmadas (origen, destino).
+        """
+        return self.conn.execute("SELECT source, target FROM redirects").fetchall()
+
+    def checkpoint(self, frontier_entries, visited, total_articles):
+        """
+        Confirma en disco la frontera, los visitados y los artículos registrados.
+        """
+        with self.conn:
+            self.conn.execute("DELETE FROM frontier")
+            self.conn.executemany(
+                "INSERT INTO frontier (url, depth, inlinks) VALUES (?, ?, ?)", frontier_entries
+            )
+            self.conn.executemany("INSERT OR IGNORE INTO visited VALUES (?)", ((url,) for url in visited))
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('total', ?)", (str(total_articles),))
+
+    def restore(self):
+        """
+        Retorna:
+        - Tuple[List[Tuple[str, int, int]], Set[str], int]: Frontera, visitados y total de artículos.
+        """
+        entries = self.conn.execute("SELECT url, depth, inlinks FROM frontier ORDER BY seq").fetchall()
+        visited = {url for (url,) in self.conn.execute("SELECT url FROM visited")}
+        total = int(self.conn.execute("SELECT value FROM meta WHERE key = 'total'").fetchone()[0])
+        return entries, visited, total
+
+    def articles(self):
+        """
+        Recorre los artículos confirmados en orden de procesamiento, sin cargarlos
+        todos en memoria.
+
+        Retorna:
+        - Iterator[Tuple[str, str, Set[str]]]: (URL, texto, enlaces).
+        """
+        cursor = self.conn.execute("SELECT url, text, links FROM articles ORDER BY seq")
+        while True:
+            rows = cursor.fetchmany(100)
+            if not rows:
+                break
+            for url, text, links in rows:
+                yield url, text, set(json.loads(links))
+
+    def close(self):
+        self.conn.close()
+
+
+class SharedFrontier:
+    """
+    Frontera FIFO en SQLite compartida por `workers` procesos de rastreo.
+
+    Cada URL se asigna a un fragmento según su hash; el proceso `worker` extrae
+    primero las URLs de su fragmento y, si no le quedan, las de los demás. Una
+    URL se encola una sola vez entre todos los procesos (clave única) y se
+    entrega a un único proceso. Con `max_urls`, no se entregan más URLs en total.
+
+    Los enlaces encolados con `push` se escriben por lotes al extraer la
+    siguiente URL. Un proceso sin URLs pendientes espera en `wait` mientras algún
+    otro siga activo (puede encolar más); las URLs asignadas a un proceso que deja
+    de dar señales durante `lease` segundos se vuelven a encolar. Mientras la
+    frontera está abierta, un hilo renueva la señal del proceso cada `lease / 4`
+    segundos, aunque tarde en descargar o procesar una URL.
+
+    Parámetros:
+    - path (str): Ruta del fichero SQLite (creado con `SharedFrontier.create`).
+    - worker (int): Número de este proceso (0 .. workers - 1).
+    - workers (int): Número total de procesos (y de fragmentos).
+    - max_urls (int): Máximo de URLs entregadas entre todos los procesos.
+    - poll_interval (float): Segundos entre consultas mientras se espera.
+    - lease (float): Segundos sin actividad tras los que un proceso se da por caído.
+    """
+
+    def __init__(self, path, worker=0, workers=1, max_urls=None, poll_interval=0.05, lease=300):
+        self.path = path
+        self.worker = worker
+        self.workers = workers
+        self.max_urls = max_urls
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.enqueued = set()  # URLs ya enviadas a la base de datos por este proceso
+        self.pushes = []
+        self.inlinks = Counter()
+        self.next = None
+        self._write("INSERT OR REPLACE INTO workers VALUES (?, 0, ?)", (worker, time.time()))
+        self._stop = threading.Event()
+        self._heartbeat = threading.Thread(target=self._beat, daemon=True)
+        self._heartbeat.start()
+
+    @staticmethod
+    def create(path, seed, workers=1):
+        """
+        Crea (o vacía) la frontera compartida y encola la URL inicial.
+        """
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = sqlite3.connect(path, timeout=60)
+        with conn:
+            conn.executescript("""
+                DROP TABLE IF EXISTS urls;
+                DROP TABLE IF EXISTS workers;
+                CREATE TABLE urls (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT UNIQUE, shard INTEGER,
+                    depth INTEGER, status INTEGER DEFAULT 0, worker INTEGER
+                );
+                CREATE INDEX urls_pending ON urls (status, shard, seq);
+                CREATE TABLE workers (worker INTEGER PRIMARY KEY, idle INTEGER, heartbeat REAL);
+            """)
+            conn.execute("INSERT INTO urls (url, shard, depth) VALUES (?, ?, 0)",
+                         (seed, SharedFrontier.shard(seed, workers)))
+        conn.close()
+
+    @staticmethod
+    def heartbeats(path):
+        """
+        Retorna:
+        - Dict[int, float]: Última señal (time.time()) de cada proceso registrado.
+        """
+        conn = sqlite3.connect(path, timeout=60)
+        try:
+            return dict(conn.execute("SELECT worker, heartbeat FROM workers"))
+        finally:
+            conn.close()
+
+    @staticmethod
+    def shard(url, workers):
+        return zlib.crc32(url.encode('utf-8')) % workers
+
+    def _write(self, sql, params=()):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute(sql, params)
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def _beat(self):
+        # Conexión propia: las de SQLite no se comparten entre hilos
+        conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        try:
+            while not self._stop.wait(self.lease / 4):
+                conn.execute("UPDATE workers SET heartbeat = ? WHERE worker = ?", (time.time(), self.worker))
+        finally:
+            conn.close()
+
+    def __len__(self):
+        pending = self.conn.execute("SELECT COUNT(*) FROM urls WHERE status = 0").fetchone()[0]
+        return pending + (self.next is not None)
+
+    def __bool__(self):
+        if self.next is None:
+            self.next = self._claim()
+        return self.next is not None
+
+    def __contains__(self, url):
+        return url in self.enqueued or self.conn.execute(
+            "SELECT 1 FROM urls WHERE url = ?", (url,)
+        ).fetchone() is not None
+
+    def push(self, url, depth):
+        """
+        Encola `url` (se escribe en la base de datos al extraer la siguiente URL).
+
+        Retorna:
+        - bool: False si este proceso ya la había encolado.
+        """
+        if url in self.enqueued:
+            return False
+        self.enqueued.add(url)
+        self.pushes.append((url, self.shard(url, self.workers), depth))
+        return True
+
+    def _claim(self):
+        # Escribe los enlaces pendientes y se asigna la siguiente URL en una sola transacción
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self.pushes:
+                conn.executemany("INSERT OR IGNORE INTO urls (url, shard, depth) VALUES (?, ?, ?)", self.pushes)
+                self.pushes = []
+            row = None
+            if self.max_urls is None or conn.execute(
+                    "SELECT COUNT(*) FROM urls WHERE status > 0").fetchone()[0] < self.max_urls:
+                row = conn.execute(
+                    "SELECT seq, url, depth FROM urls WHERE status = 0 AND shard = ? ORDER BY seq LIMIT 1",
+                    (self.worker % self.workers,)
+                ).fetchone() or conn.execute(
+                    "SELECT seq, url, depth FROM urls WHERE status = 0 ORDER BY seq LIMIT 1"
+                ).fetchone()
+            if row is not None:
+                conn.execute("UPDATE urls SET status = 1, worker = ? WHERE seq = ?", (self.worker, row[0]))
+                conn.execute("UPDATE workers SET idle = 0, heartbeat = ? WHERE worker = ?",
+                             (time.time(), self.worker))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return None if row is None else (row[1], row[2])
+
+    def pop(self):
+        """
+        Extrae la siguiente URL asignada a este proceso.
+
+        Retorna:
+        - Tuple[str, int]: (URL, profundidad).
+        """
+        if not self:
+            raise IndexError("No hay URLs pendientes en la frontera compartida")
+        entry, self.next = self.next, None
+        return entry
+
+    def _finish(self, idle):
+        # Marca como terminadas las URLs asignadas a este proceso
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self.pushes:
+                conn.executemany("INSERT OR IGNORE INTO urls (url, shard, depth) VALUES (?, ?, ?)", self.pushes)
+                self.pushes = []
+            conn.execute("UPDATE urls SET status = 2 WHERE status = 1 AND worker = ?", (self.worker,))
+            conn.execute("UPDATE workers SET idle = ?, heartbeat = ? WHERE worker = ?",
+                         (int(idle), time.time(), self.worker))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _others_active(self):
+        now = time.time()
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # URLs de procesos caídos: se vuelven a encolar
+            stale = [worker for (worker,) in conn.execute(
+                "SELECT worker FROM workers WHERE idle = 0 AND heartbeat < ?", (now - self.lease,)
+            )]
+            for worker in stale:
+                conn.execute("UPDATE urls SET status = 0, worker = NULL WHERE status = 1 AND worker = ?", (worker,))
+                conn.execute("UPDATE workers SET idle = 1 WHERE worker = ?", (worker,))
+            active = conn.execute(
+                "SELECT COUNT(*) FROM workers WHERE idle = 0 AND worker != ?", (self.worker,)
+            ).fetchone()[0]
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return active > 0
+
+    def wait(self):
+        """
+        Espera a que haya URLs pendientes mientras algún otro proceso siga activo.
+
+        Retorna:
+        - bool: True si hay una URL asignada a este proceso; False si el rastreo ha terminado.
+        """
+        self._finish(idle=True)
+        while True:
+            if self:
+                return True
+            if not self._others_active():
+                return bool(self)
+            time.sleep(self.poll_interval)
+
+    def entries(self):
+        """
+        Retorna:
+        - List[Tuple[str, int, int]]: URLs pendientes (URL, profundidad, enlaces entrantes).
+        """
+        rows = self.conn.execute("SELECT url, depth FROM urls WHERE status = 0 ORDER BY seq").fetchall()
+        return [(url, depth, 0) for url, depth in rows]
+
+    def close(self):
+        """
+        Devuelve a la cola la URL asignada sin procesar y marca este proceso como inactivo.
+        """
+        self._stop.set()
+        self._heartbeat.join()
+        if self.next is not None:
+            self._write("UPDATE urls SET status = 0, worker = NULL WHERE url = ?", (self.next[0],))
+            self.next = None
+        self._finish(idle=True)
+        self.conn.close()
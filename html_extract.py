@@ -0,0 +1,117 @@
+"""
+Extracción del texto de los párrafos y de los enlaces de una página de Wikipedia.
+
+Backends disponibles (`extract_article(..., backend=...)`):
+- 'html.parser': árbol completo de BeautifulSoup con `html.parser` y dos
+  recorridos (`find_all('p')` y `find_all('a', href=True)`). Es la referencia.
+- 'strainer': BeautifulSoup con un `SoupStrainer` que solo construye los
+  elementos <p> y <a>, y un único recorrido para ambos. Misma salida que la
+  referencia en HTML bien formado como el de Wikipedia y con bloques dentro de
+  <p>; solo difiere si un <p> sin cerrar acaba con el cierre de su padre (el
+  texto que sigue al padre se suma al párrafo).
+- 'lxml': analizador en C de lxml y un único recorrido. Es el más rápido, pero
+  corrige el anidamiento de otra forma: cierra el <p> al encontrar un elemento
+  de bloque (<div>, <table>...) dentro de él o un <p> sin cerrar, por lo que su
+  texto puede diferir de la referencia. Solo se usa si se elige expresamente;
+  `benchmarks/bench_html_extract.py` compara la salida de los tres. Requiere
+  `pip install lxml`.
+"""
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+except ImportError:  # lxml es opcional
+    lxml = None
+
+# Elementos cuyo contenido no forma parte del texto (BeautifulSoup tampoco lo incluye en get_text)
+NON_TEXT_TAGS = ('script', 'style', 'template')
+
+
+def is_article_href(href):
+    """
+    Indica si `href` apunta a otro artículo de Wikipedia.
+    """
+    return href.startswith('/wiki/') and ':' not in href and not href.startswith('/wiki/Main_Page') and '#' not in href
+
+
+def _extract_html_parser(content, base_url):
+    soup = BeautifulSoup(content, 'html.parser')
+    paragraphs = soup.find_all('p')
+    texts = [para.get_text() for para in paragraphs]
+    links = set()
+    for link in soup.find_all('a', href=True):
+        href = link['href']
+        if is_article_href(href):
+            links.add(urljoin(base_url, href))
+    return texts, links
+
+
+def _extract_strainer(content, base_url):
+    soup = BeautifulSoup(content, 'html.parser', parse_only=SoupStrainer(['p', 'a']))
+    texts = []
+    links = set()
+    for tag in soup.find_all(['p', 'a']):
+        if tag.name == 'p':
+            texts.append(tag.get_text())
+        else:
+            href = tag.get('href')
+            if href is not None and is_article_href(href):
+                links.add(urljoin(base_url, href))
+    return texts, links
+
+
+def _lxml_text(element):
+    parts = [element.text or '']
+    for child in element:
+        # Los comentarios tienen `tag` no textual y, como <script>/<style>, no aportan texto
+        if isinstance(child.tag, str) and child.tag not in NON_TEXT_TAGS:
+            parts.append(_lxml_text(child))
+        if child.tail:
+            parts.append(child.tail)
+    return ''.join(parts)
+
+
+def _extract_lxml(content, base_url):
+    if lxml is None:
+        raise ImportError("El backend 'lxml' requiere instalar lxml: pip install lxml")
+    document = lxml.html.document_fromstring(content)
+    texts = []
+    links = set()
+    for element in document.iter('p', 'a'):
+        if element.tag == 'p':
+            texts.append(_lxml_text(element))
+        else:
+            href = element.get('href')
+            if href is not None and is_article_href(href):
+                links.add(urljoin(base_url, href))
+    return texts, links
+
+
+BACKENDS = {
+    'html.parser': _extract_html_parser,
+    'strainer': _extract_strainer,
+    'lxml': _extract_lxml,
+}
+
+
+def extract_article(content, base_url, backend='strainer', separator=' '):
+    """
+    Extrae de una página HTML de Wikipedia el texto de sus párrafos y sus enlaces.
+
+    Parámetros:
+    - content (bytes | str): HTML de la página.
+    - base_url (str): URL base para resolver los enlaces relativos.
+    - backend (str): 'html.parser', 'strainer' o 'lxml'.
+    - separator (str): Separador entre párrafos ('\n' para conservar uno por línea).
+
+    Retorna:
+    - Tuple[str, Set[str]]: Texto de los párrafos y enlaces a otros artículos.
+    """
+    try:
+        extract = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Backend de extracción desconocido '{backend}'. Opciones: {list(BACKENDS)}")
+    texts, links = extract(content, base_url)
+    return separator.join(texts), links
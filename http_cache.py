@@ -0,0 +1,264 @@
+"""
+Caché HTTP local para las descargas del crawler.
+
+`ResponseCache` guarda los cuerpos de las respuestas comprimidos con zlib y
+direccionados por contenido (SHA-256), con un índice SQLite por URL que
+conserva ETag/Last-Modified, la fecha de descarga y el último acceso. Las
+entradas caducan tras `ttl` segundos y se revalidan con peticiones
+condicionales; cuando el tamaño total supera `max_bytes` se desalojan las
+menos usadas recientemente (LRU).
+
+`CachingAdapter` se monta en la sesión de `requests` en lugar de
+`HTTPAdapter`, conservando la misma estrategia de reintentos.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Cabeceras que se conservan junto al cuerpo (el cuerpo se guarda ya descomprimido)
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+class ResponseCache:
+    """
+    Almacén en disco de respuestas HTTP.
+
+    Parámetros:
+    - directory (str): Directorio de la caché.
+    - ttl (float): Segundos durante los que una entrada se sirve sin revalidar.
+    - max_bytes (int): Tamaño máximo (comprimido) de los cuerpos almacenados.
+    - offline (bool): Servir siempre desde la caché, sin acceder a la red.
+    """
+
+    def __init__(self, directory, ttl=7 * 24 * 3600, max_bytes=1024 ** 3, offline=False):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.stats = Counter()
+        self.lock = threading.Lock()
+        os.makedirs(os.path.join(directory, 'objects'), exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(directory, 'index.sqlite'), check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS objects (digest TEXT PRIMARY KEY, size INTEGER);
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY, digest TEXT, headers TEXT,
+                stored_at REAL, accessed_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS entries_digest ON entries (digest);
+            CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at);
+        """)
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+
+    def _object_path(self, digest):
+        return os.path.join(self.directory, 'objects', digest[:2], digest + '.z')
+
+    def lookup(self, url):
+        """
+        Retorna:
+        - Optional[Tuple[dict, float]]: Cabeceras guardadas y fecha de descarga, o None.
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT headers, stored_at FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def is_fresh(self, stored_at):
+        return self.offline or time.time() - stored_at < self.ttl
+
+    def has_fresh(self, url):
+        """
+        Indica si `url` se servirá desde la caché sin acceder a la red.
+        """
+        cached = self.lookup(url)
+        return cached is not None and self.is_fresh(cached[1])
+
+    def load(self, url):
+        """
+        Devuelve el cuerpo guardado para `url` y actualiza su último acceso.
+        """
+        with self.lock:
+            row = self.conn.execute("SELECT digest FROM entries WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE entries SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+        try:
+            with open(self._object_path(row[0]), 'rb') as f:
+                return zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            return None
+
+    def refresh(self, url, headers):
+        """
+        Marca como recién validada la entrada de `url` (respuesta 304).
+        """
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute("SELECT headers FROM entries WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return
+            stored = json.loads(row[0])
+            stored.update({name: headers[name] for name in STORED_HEADERS if name in headers})
+            self.conn.execute(
+                "UPDATE entries SET headers = ?, stored_at = ?, accessed_at = ? WHERE url = ?",
+                (json.dumps(stored), now, now, url)
+            )
+            self.conn.commit()
+
+    def expire(self, url):
+        """
+        Marca como caducada la entrada de `url`: la próxima petición se revalida
+        con el servidor (p. ej. porque se sabe que el artículo ha cambiado).
+        """
+        with self.lock:
+            self.conn.execute("UPDATE entries SET stored_at = 0 WHERE url = ?", (url,))
+            self.conn.commit()
+
+    def store(self, url, headers, body):
+        """
+        Guarda `body` para `url` y desaloja entradas si se supera el tamaño máximo.
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        stored = {name: headers[name] for name in STORED_HEADERS if name in headers}
+        now = time.time()
+        with self.lock:
+            if self.conn.execute("SELECT 1 FROM objects WHERE digest = ?", (digest,)).fetchone() is None:
+                data = zlib.compress(body)
+                path = self._object_path(digest)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'wb') as f:
+                    f.write(data)
+                self.conn.execute("INSERT INTO objects VALUES (?, ?)", (digest, len(data)))
+                self.total_bytes += len(data)
+            previous = self.conn.execute("SELECT digest FROM entries WHERE url = ?", (url,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (url, digest, json.dumps(stored), now, now)
+            )
+            if previous is not None and previous[0] != digest:
+                self._release(previous[0])
+            self._evict()
+            self.conn.commit()
+
+    def _release(self, digest):
+        # Borrar el objeto si ninguna URL lo referencia ya
+        if self.conn.execute("SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)).fetchone():
+            return
+        row = self.conn.execute("SELECT size FROM objects WHERE digest = ?", (digest,)).fetchone()
+        if row is None:
+            return
+        self.conn.execute("DELETE FROM objects WHERE digest = ?", (digest,))
+        self.total_bytes -= row[0]
+        try:
+            os.remove(self._object_path(digest))
+        except OSError:
+            pass
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes:
+            row = self.conn.execute(
+                "SELECT url, digest FROM entries ORDER BY accessed_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self.conn.execute("DELETE FROM entries WHERE url = ?", (row[0],))
+            self._release(row[1])
+            self.stats['evictions'] += 1
+
+    def count(self, event):
+        """
+        Suma una aparición de `event` a las estadísticas (desde cualquier hilo de descarga).
+        """
+        with self.lock:
+            self.stats[event] += 1
+
+    def report(self):
+        """
+        Resumen de aciertos y fallos de la caché durante la ejecución.
+        """
+        return (f"Caché HTTP: {self.stats['hits']} aciertos, {self.stats['misses']} fallos, "
+                f"{self.stats['revalidated']} revalidadas (304), {self.stats['stale']} obsoletas servidas "
+                f"sin conexión, {self.stats['evictions']} desalojadas "
+                f"({self.total_bytes / 1024 ** 2:.1f} MB en disco)")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class CachingAdapter(HTTPAdapter):
+    """
+    Adaptador HTTP que sirve las peticiones GET desde `ResponseCache` y
+    revalida con If-None-Match/If-Modified-Since las entradas caducadas.
+    """
+
+    def __init__(self, cache, **kwargs):
+        self.cache = cache
+        super().__init__(**kwargs)
+
+    def _cached_response(self, request, headers, body):
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def send(self, request, **kwargs):
+        if request.method != 'GET':
+            return super().send(request, **kwargs)
+
+        cache = self.cache
+        cached = cache.lookup(request.url)
+        if cached is not None:
+            headers, stored_at = cached
+            if cache.is_fresh(stored_at):
+                body = cache.load(request.url)
+                if body is not None:
+                    cache.count('hits')
+                    return self._cached_response(request, headers, body)
+            if 'ETag' in headers:
+                request.headers['If-None-Match'] = headers['ETag']
+            if 'Last-Modified' in headers:
+                request.headers['If-Modified-Since'] = headers['Last-Modified']
+        elif cache.offline:
+            raise requests.exceptions.ConnectionError(f"Sin conexión y sin copia en caché: {request.url}")
+
+        try:
+            response = super().send(request, **kwargs)
+        except requests.exceptions.ConnectionError:
+            body = cache.load(request.url) if cached is not None else None
+            if body is None:
+                raise
+            cache.count('stale')
+            return self._cached_response(request, cached[0], body)
+
+        if response.status_code == 304 and cached is not None:
+            body = cache.load(request.url)
+            if body is not None:
+                cache.refresh(request.url, response.headers)
+                cache.count('revalidated')
+                return self._cached_response(request, cached[0], body)
+
+        cache.count('misses')
+        if response.status_code == 200:
+            cache.store(request.url, response.headers, response.content)
+        return response
@@ -0,0 +1,251 @@
+"""
+Almacén de contribuciones por artículo para actualizar las redes sin volver a
+rastrear todo el corpus.
+
+Por cada artículo procesado se guarda su revisión y el resultado de la etapa
+de NLP (la secuencia de palabras y los bigramas) junto con sus enlaces: de ahí
+salen sus frecuencias de palabras, sus co-ocurrencias y sus bigramas. En una
+actualización se consultan las revisiones actuales (API de MediaWiki por
+lotes de 50 títulos o el índice del volcado) y solo los artículos editados o
+nuevos se descargan y se procesan: sus contribuciones antiguas se restan del
+agregado y se suman las nuevas.
+
+El agregado resultante se guarda junto al almacén (`<almacén>.aggregate.pkl`)
+con un número de generación; si no coincide con el del almacén (p. ej. tras
+una interrupción), se reconstruye a partir de las contribuciones guardadas,
+sin red ni NLP.
+"""
+import hashlib
+import json
+import os
+import pickle
+import re
+import sqlite3
+import zlib
+
+from aggregate import CorpusAggregate
+from dump_reader import REVISION_HEADER
+from titles import canonical_title
+
+REVISION_RE = re.compile(rb'"wgRevisionId":\s*(\d+)')
+API_BATCH_SIZE = 50  # Títulos por consulta a la API de MediaWiki
+
+
+def page_revision(response):
+    """
+    Revisión de una página descargada: `wgRevisionId` del HTML de Wikipedia, la
+    cabecera de revisión de un volcado local o, si no hay ninguna, un hash del contenido.
+    """
+    revision = response.headers.get(REVISION_HEADER)
+    if revision:
+        return revision
+    match = REVISION_RE.search(response.content)
+    if match:
+        return match.group(1).decode('ascii')
+    return 'sha1:' + hashlib.sha1(response.content).hexdigest()
+
+
+def fetch_revisions(session, base_url, urls, batch_size=API_BATCH_SIZE):
+    """
+    Consulta las revisiones actuales de los artículos en la API de MediaWiki.
+
+    Retorna:
+    - Dict[str, Optional[str]]: Revisión de cada URL (None si el artículo ya no
+      existe); las URLs sin respuesta de la API no aparecen.
+    """
+    by_title = {}
+    for url in urls:
+        by_title.setdefault(canonical_title(url), []).append(url)
+    titles = list(by_title)
+    revisions = {}
+    for start in range(0, len(titles), batch_size):
+        batch = titles[start:start + batch_size]
+        response = session.get(f"{base_url}/w/api.php", params={
+            'action': 'query', 'prop': 'revisions', 'rvprop': 'ids', 'format': 'json',
+            'formatversion': 2, 'redirects': 1, 'titles': '|'.join(batch),
+        }, timeout=30)
+        response.raise_for_status()
+        query = response.json().get('query', {})
+        # Títulos normalizados y redirecciones resueltas por la API
+        normalized = {canonical_title(entry['from']): canonical_title(entry['to'])
+                      for entry in query.get('normalized', [])}
+        redirects = {canonical_title(entry['from']): canonical_title(entry['to'])
+                     for entry in query.get('redirects', [])}
+        requested = {}
+        for title in batch:
+            final = normalized.get(title, title)
+            requested.setdefault(redirects.get(final, final), []).append(title)
+        for page in query.get('pages', []):
+            revision = None if page.get('missing') else str(page['revisions'][0]['revid'])
+            for title in requested.get(canonical_title(page['title']), []):
+                for url in by_title[title]:
+                    revisions[url] = revision
+    return revisions
+
+
+def _pack(value):
+    return zlib.compress(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+
+
+def _unpack(blob):
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+
+class ArticleStore:
+    """
+    Revisiones y contribuciones de cada artículo en SQLite.
+
+    Los cambios (`put`, `delete`) se confirman con `commit`, junto con el agregado.
+
+    Parámetros:
+    - path (str): Ruta del fichero SQLite.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.aggregate_path = path + '.aggregate.pkl'
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS articles (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT UNIQUE, revision TEXT,
+                words BLOB, bigrams BLOB, links BLOB
+            );
+            CREATE TABLE IF NOT EXISTS redirects (source TEXT PRIMARY KEY, target TEXT);
+        """)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def __contains__(self, url):
+        return self.conn.execute("SELECT 1 FROM articles WHERE url = ?", (url,)).fetchone() is not None
+
+    def generation(self):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        return int(row[0]) if row else 0
+
+    def parameters(self):
+        """
+        Retorna:
+        - Optional[dict]: Parámetros del rastreo guardado (ver `set_parameters`).
+        """
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'parameters'").fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_parameters(self, parameters):
+        """
+        Guarda los parámetros del rastreo (artículo inicial, profundidad, número
+        máximo de artículos...); se confirman en el próximo `commit`.
+        """
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('parameters', ?)",
+                          (json.dumps(parameters, sort_keys=True),))
+
+    def revisions(self):
+        """
+        Retorna:
+        - Dict[str, str]: Revisión guardada de cada artículo, en orden de procesamiento.
+        """
+        return dict(self.conn.execute("SELECT url, revision FROM articles ORDER BY seq"))
+
+    def get(self, url):
+        """
+        Retorna:
+        - Optional[Tuple[str, List[str], List[str], Set[str]]]: Revisión, palabras,
+          bigramas y enlaces guardados del artículo.
+        """
+        row = self.conn.execute(
+            "SELECT revision, words, bigrams, links FROM articles WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        revision, words, bigrams, links = row
+        return revision, _unpack(words), _unpack(bigrams), set(_unpack(links))
+
+    def put(self, url, revision, words, bigrams, links):
+        """
+        Guarda (o sustituye) las contribuciones de un artículo.
+        """
+        self.conn.execute(
+            "INSERT INTO articles (url, revision, words, bigrams, links) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET revision = excluded.revision, words = excluded.words, "
+            "bigrams = excluded.bigrams, links = excluded.links",
+            (url, revision, _pack(list(words)), _pack(list(bigrams)), _pack(sorted(links)))
+        )
+
+    def delete(self, url):
+        self.conn.execute("DELETE FROM articles WHERE url = ?", (url,))
+
+    def clear(self):
+        """
+        Elimina todos los artículos y redirecciones (antes de un rastreo completo).
+        """
+        self.conn.execute("DELETE FROM articles")
+        self.conn.execute("DELETE FROM redirects")
+
+    def put_redirect(self, source, target):
+        """
+        Guarda que la URL `source` redirige a `target`.
+        """
+        self.conn.execute("INSERT OR REPLACE INTO redirects VALUES (?, ?)", (source, target))
+
+    def redirects(self):
+        return self.conn.execute("SELECT source, target FROM redirects").fetchall()
+
+    def articles(self):
+        """
+        Recorre las contribuciones guardadas en orden de procesamiento.
+
+        Retorna:
+        - Iterator[Tuple[str, List[str], List[str], Set[str]]]: (URL, palabras, bigramas, enlaces).
+        """
+        cursor = self.conn.execute("SELECT url, words, bigrams, links FROM articles ORDER BY seq")
+        while True:
+            rows = cursor.fetchmany(100)
+            if not rows:
+                break
+            for url, words, bigrams, links in rows:
+                yield url, _unpack(words), _unpack(bigrams), set(_unpack(links))
+
+    def commit(self, aggregate):
+        """
+        Guarda el agregado y confirma los cambios del almacén con una nueva generación.
+        """
+        generation = self.generation() + 1
+        temporary = self.aggregate_path + '.tmp'
+        with open(temporary, 'wb') as f:
+            pickle.dump((generation, aggregate), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, self.aggregate_path)
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('generation', ?)", (str(generation),))
+
+    def rebuild_aggregate(self, window_sizes=(5,), base_url='https://en.wikipedia.org'):
+        """
+        Reconstruye el agregado a partir de las contribuciones guardadas.
+        """
+        aggregate = CorpusAggregate(window_sizes=window_sizes, base_url=base_url)
+        for source, target in self.redirects():
+            aggregate.titles.add_redirect(source, target)
+        for url, words, bigrams, links in self.articles():
+            aggregate.add_article(url, words, bigrams, links)
+        return aggregate
+
+    def load_aggregate(self, window_sizes=(5,), base_url='https://en.wikipedia.org'):
+        """
+        Carga el agregado guardado con `commit`, o lo reconstruye si falta o no
+        corresponde a la última generación confirmada del almacén.
+
+        Retorna:
+        - Optional[CorpusAggregate]: None si el almacén está vacío.
+        """
+        if not len(self):
+            return None
+        if os.path.exists(self.aggregate_path):
+            with open(self.aggregate_path, 'rb') as f:
+                generation, aggregate = pickle.load(f)
+            if generation == self.generation() and set(window_sizes) <= set(aggregate.cooccurrence.window_sizes):
+                return aggregate
+        print("El agregado guardado no corresponde al almacén; reconstruyéndolo a partir de las contribuciones...")
+        return self.rebuild_aggregate(window_sizes, base_url)
+
+    def close(self):
+        self.conn.close()
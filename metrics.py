@@ -0,0 +1,302 @@
+"""
+Instrumentación de las etapas del pipeline.
+
+`RunMetrics` acumula durante una ejecución:
+- Tiempo y número de llamadas de cada etapa (`stage`: descarga, análisis del
+  HTML, NLP, conteo, construcción de las redes, exportación...). Las etapas
+  anidadas se cuentan también en la exterior.
+- Contadores (`count`): bytes descargados, tokens procesados, aristas
+  generadas y retenidas, filas exportadas...
+- Histogramas con cubetas fijas (`observe`), p. ej. la latencia de las descargas.
+- Opcionalmente, un perfil de cProfile acumulado por etapa (`profile_stages`)
+  y el pico de memoria de cada etapa con tracemalloc (`trace_memory`).
+
+`write` guarda todo al final de la ejecución en JSON o en el formato de texto
+de Prometheus, y los perfiles en ficheros `.prof` junto a él (se leen con
+`python -m pstats` o snakeviz). Los contadores y los histogramas se pueden
+actualizar desde los hilos de descarga; las etapas se miden en el hilo
+principal. Las métricas de otros procesos se combinan con `merge`.
+
+La instancia `metrics` del módulo es la que usan el crawler y el pipeline.
+"""
+import bisect
+import cProfile
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Cubetas (segundos) de los histogramas de latencia, como las de Prometheus
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Prefijo de los nombres en el formato de Prometheus
+PROMETHEUS_PREFIX = 'wikiscraper_'
+
+
+class Histogram:
+    """
+    Histograma acumulado con cubetas fijas (`counts[i]` cuenta los valores
+    <= `buckets[i]` y mayores que la cubeta anterior; el último, los mayores que todas).
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """
+        Cota superior del cuantil `q` (límite de la cubeta que lo contiene;
+        None si cae en la última, que no tiene límite).
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def merge(self, other):
+        if other.buckets != self.buckets:
+            raise ValueError("Los histogramas tienen cubetas distintas")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.sum += other.sum
+        self.count += other.count
+
+    def to_dict(self):
+        return {'buckets': list(self.buckets), 'counts': self.counts, 'sum': self.sum, 'count': self.count,
+                'mean': self.sum / self.count if self.count else 0.0,
+                'p50': self.quantile(0.5), 'p95': self.quantile(0.95), 'p99': self.quantile(0.99)}
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data['buckets'])
+        histogram.counts = list(data['counts'])
+        histogram.sum = data['sum']
+        histogram.count = data['count']
+        return histogram
+
+
+class RunMetrics:
+    """
+    Métricas de una ejecución del pipeline.
+
+    Parámetros:
+    - profile_stages (Iterable[str]): Etapas que se perfilan con cProfile. Solo
+      hay un perfil activo a la vez: una etapa anidada en otra perfilada no
+      tiene perfil propio.
+    - trace_memory (bool): Registrar el pico de memoria de cada etapa con
+      tracemalloc (ralentiza la ejecución).
+    """
+
+    def __init__(self, profile_stages=(), trace_memory=False):
+        self._lock = threading.Lock()
+        self._tracing = False  # tracemalloc iniciado por `configure`
+        self.configure(profile_stages, trace_memory)
+        self.reset()
+
+    def configure(self, profile_stages=(), trace_memory=False):
+        self.profile_stages = set(profile_stages)
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        elif not trace_memory and self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def reset(self):
+        """Descarta las métricas acumuladas (p. ej. al empezar un proceso creado con 'fork')."""
+        self.started = time.time()
+        self.timers = {}         # etapa -> [segundos, llamadas]
+        self.counters = {}
+        self.histograms = {}
+        self.memory_peaks = {}   # etapa -> bytes
+        self.profiles = {}       # etapa -> cProfile.Profile
+        self._active = []
+        self._profiling = False
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Mide el bloque como una llamada de la etapa `name`.
+        """
+        profiler = None
+        if name in self.profile_stages and not self._profiling:
+            profiler = self.profiles.setdefault(name, cProfile.Profile())
+            self._profiling = True
+            profiler.enable()
+        if self.trace_memory:
+            # El pico se reinicia al entrar: antes se anota en las etapas exteriores
+            self._record_peak(self._active)
+            tracemalloc.reset_peak()
+        self._active.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if self.trace_memory:
+                self._record_peak(self._active)
+            self._active.pop()
+            if profiler is not None:
+                profiler.disable()
+                self._profiling = False
+            self.add_time(name, elapsed)
+
+    def _record_peak(self, stages):
+        peak = tracemalloc.get_traced_memory()[1]
+        for name in stages:
+            self.memory_peaks[name] = max(self.memory_peaks.get(name, 0), peak)
+
+    def add_time(self, name, seconds, calls=1):
+        """Suma a la etapa `name` un tiempo medido en otro sitio (p. ej. en un proceso del pool)."""
+        with self._lock:
+            timer = self.timers.setdefault(name, [0.0, 0])
+            timer[0] += seconds
+            timer[1] += calls
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(buckets)
+            histogram.observe(value)
+
+    def seconds(self, name):
+        return self.timers.get(name, (0.0, 0))[0]
+
+    def merge(self, data):
+        """
+        Suma las métricas de otro proceso (`to_dict` o el JSON de `write`).
+        """
+        with self._lock:
+            for name, stage in data.get('stages', {}).items():
+                timer = self.timers.setdefault(name, [0.0, 0])
+                timer[0] += stage['seconds']
+                timer[1] += stage['calls']
+                if 'peak_memory_bytes' in stage:
+                    self.memory_peaks[name] = max(self.memory_peaks.get(name, 0), stage['peak_memory_bytes'])
+            for name, value in data.get('counters', {}).items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            for name, histogram in data.get('histograms', {}).items():
+                if name in self.histograms:
+                    self.histograms[name].merge(Histogram.from_dict(histogram))
+                else:
+                    self.histograms[name] = Histogram.from_dict(histogram)
+
+    def to_dict(self, rates=None):
+        """
+        Parámetros:
+        - rates (Dict[str, Tuple[str, str]]): Ritmos derivados, nombre -> (contador,
+          etapa); p. ej. tokens de NLP por segundo de la etapa de NLP.
+
+        Retorna:
+        - dict: Etapas, contadores, histogramas y ritmos.
+        """
+        stages = {}
+        for name, (seconds, calls) in self.timers.items():
+            stages[name] = {'seconds': seconds, 'calls': calls}
+            if name in self.memory_peaks:
+                stages[name]['peak_memory_bytes'] = self.memory_peaks[name]
+        return {
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'duration_seconds': time.time() - self.started,
+            'stages': stages,
+            'counters': dict(self.counters),
+            'histograms': {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+            'rates': {name: self.counters.get(counter, 0) / self.seconds(stage)
+                      for name, (counter, stage) in (rates or {}).items() if self.seconds(stage) > 0},
+        }
+
+    def to_prometheus(self, rates=None):
+        """
+        Retorna:
+        - str: Las métricas en el formato de texto de Prometheus.
+        """
+        data = self.to_dict(rates)
+        p = PROMETHEUS_PREFIX
+        lines = [f'# TYPE {p}run_duration_seconds gauge', f'{p}run_duration_seconds {data["duration_seconds"]}']
+        lines.append(f'# TYPE {p}stage_seconds_total counter')
+        lines += [f'{p}stage_seconds_total{{stage="{name}"}} {stage["seconds"]}' for name, stage in data['stages'].items()]
+        lines.append(f'# TYPE {p}stage_calls_total counter')
+        lines += [f'{p}stage_calls_total{{stage="{name}"}} {stage["calls"]}' for name, stage in data['stages'].items()]
+        if self.memory_peaks:
+            lines.append(f'# TYPE {p}stage_peak_memory_bytes gauge')
+            lines += [f'{p}stage_peak_memory_bytes{{stage="{name}"}} {peak}' for name, peak in self.memory_peaks.items()]
+        for name, value in data['counters'].items():
+            lines += [f'# TYPE {p}{name}_total counter', f'{p}{name}_total {value}']
+        for name, histogram in data['histograms'].items():
+            lines.append(f'# TYPE {p}{name} histogram')
+            cumulative = 0
+            for bound, count in zip(histogram['buckets'] + ['+Inf'], histogram['counts']):
+                cumulative += count
+                lines.append(f'{p}{name}_bucket{{le="{bound}"}} {cumulative}')
+            lines += [f'{p}{name}_sum {histogram["sum"]}', f'{p}{name}_count {histogram["count"]}']
+        for name, value in data['rates'].items():
+            lines += [f'# TYPE {p}{name} gauge', f'{p}{name} {value}']
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path, fmt='json', rates=None):
+        """
+        Guarda las métricas en `path` ('json' o 'prometheus') y los perfiles de
+        cProfile en `profile_<etapa>.prof` en el mismo directorio.
+
+        Retorna:
+        - List[str]: Rutas de los ficheros escritos.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        paths = [path]
+        for name, profiler in self.profiles.items():
+            profile_path = os.path.join(directory, f"profile_{name}.prof")
+            profiler.dump_stats(profile_path)
+            paths.append(profile_path)
+        if fmt == 'json':
+            content = json.dumps(self.to_dict(rates), indent=2, ensure_ascii=False, allow_nan=False)
+        elif fmt == 'prometheus':
+            content = self.to_prometheus(rates)
+        else:
+            raise ValueError(f"Formato de métricas desconocido: {fmt}")
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(path + '.tmp', path)
+        return paths
+
+    def report(self):
+        """
+        Retorna:
+        - List[str]: Resumen legible del tiempo de cada etapa y de los histogramas.
+        """
+        lines = [f"{'Etapa':<14} {'Tiempo (s)':>11} {'Llamadas':>9}"]
+        for name, (seconds, calls) in sorted(self.timers.items(), key=lambda item: -item[1][0]):
+            lines.append(f"{name:<14} {seconds:>11.2f} {calls:>9}")
+        for name, histogram in self.histograms.items():
+            p50, p95 = (histogram.quantile(q) for q in (0.5, 0.95))
+            lines.append(f"{name}: {histogram.count} observaciones, media {histogram.sum / max(1, histogram.count):.3f}, "
+                         f"p50 {_bound(p50, histogram)}, p95 {_bound(p95, histogram)}")
+        return lines
+
+
+def _bound(quantile, histogram):
+    # Cota de un cuantil para el resumen: la última cubeta no tiene límite superior
+    return f"<= {quantile}" if quantile is not None else f"> {histogram.buckets[-1]}"
+
+
+metrics = RunMetrics()
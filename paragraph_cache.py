@@ -0,0 +1,80 @@
+"""
+Caché de la etapa de NLP por párrafo.
+
+Los artículos de un mismo tema comparten mucho texto (párrafos de tipo ficha,
+pronunciación o coordenadas, frases repetidas). `ParagraphCache` guarda el
+resultado de la etapa de NLP de cada párrafo (palabras y entidades) indexado
+por un hash de su texto, de modo que los párrafos repetidos en el rastreo no
+vuelven a pasar por el modelo: su resultado se reutiliza o, con
+`skip_duplicates`, se omiten. Las entradas se desalojan por orden de uso (LRU)
+cuando se supera `max_entries`.
+"""
+import hashlib
+import sys
+from collections import OrderedDict
+
+
+class ParagraphCache:
+    """
+    LRU de resultados de NLP por párrafo.
+
+    Parámetros:
+    - max_entries (int): Número máximo de párrafos guardados.
+    - skip_duplicates (bool): Omitir los párrafos repetidos en lugar de reutilizar
+      su resultado (las palabras de cada párrafo solo cuentan la primera vez).
+    """
+
+    def __init__(self, max_entries=20_000, skip_duplicates=False):
+        self.max_entries = max_entries
+        self.skip_duplicates = skip_duplicates
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.hit_chars = 0
+        self.miss_chars = 0
+
+    @staticmethod
+    def key(paragraph):
+        return hashlib.blake2b(paragraph.encode('utf-8'), digest_size=16).digest()
+
+    def get(self, key):
+        """
+        Retorna:
+        - Optional[Tuple[List[str], List[str]]]: Palabras y entidades del párrafo, o None.
+        """
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        words, entities = value
+        # Las palabras se repiten entre párrafos: internarlas reduce la memoria de la caché
+        self.entries[key] = ([sys.intern(word) for word in words], [sys.intern(entity) for entity in entities])
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def record(self, paragraph, hit):
+        if hit:
+            self.hits += 1
+            self.hit_chars += len(paragraph)
+        else:
+            self.misses += 1
+            self.miss_chars += len(paragraph)
+
+    def hit_rate(self):
+        return self.hits / max(1, self.hits + self.misses)
+
+    def saved_fraction(self):
+        """Fracción del texto (en caracteres) que no pasó por la etapa de NLP."""
+        return self.hit_chars / max(1, self.hit_chars + self.miss_chars)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def report(self):
+        action = "omitidos" if self.skip_duplicates else "reutilizados"
+        return (f"Caché de párrafos: {self.hits} {action}, {self.misses} procesados "
+                f"(tasa de aciertos {self.hit_rate():.1%}, {self.saved_fraction():.1%} del texto "
+                f"sin procesar), {len(self)} en caché")
@@ -1,20 +1,33 @@
 import requests
-from bs4 import BeautifulSoup
-import spacy
 # import scispacy  # No es necesario si no se usa directamente
 import networkx as nx
 import csv
+import json
 from urllib.parse import urljoin
-from collections import Counter
+from collections import Counter, deque
 import re
-import time
-import random
 import os
-from nltk.util import ngrams
 import sys  # Importado para usar sys.exit()
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import numpy as np  # Importar NumPy para cálculos estadísticos
+import multiprocessing
+import bisect
+import subprocess
+import time
+from functools import lru_cache
+from crawler import ConcurrentFetcher, crawl
+from frontier import CrawlState, Frontier, SharedFrontier
+from http_cache import CachingAdapter, ResponseCache
+from paragraph_cache import ParagraphCache
+from dump_reader import extract_wikitext_links, open_dump, wikitext_to_text
+from html_extract import extract_article, is_article_href
+from aggregate import CorpusAggregate
+from cooccurrence import ID_BITS
+from csr_graph import CSRGraph, write_binary
+from titles import canonical_link, canonical_title, canonical_url
+from incremental import ArticleStore, fetch_revisions, page_revision
+from metrics import metrics
 
 # === Parámetros de Configuración ===
 MAX_ARTICLES = 100           # Número máximo de artículos a procesar
@@ -25,33 +38,291 @@ EDGE_POD_PERCENTILE = 45     # Percentil para poda de aristas
 NODE_POD_PERCENTILE = 15     # Percentil para poda de nodos
 MIN_NODE_FREQ = 5            # Frecuencia mínima para retener un nodo
 MIN_EDGE_WEIGHT = 5          # Peso mínimo para retener una arista
+MAX_IN_FLIGHT = 8            # Número máximo de solicitudes HTTP simultáneas
+HOST_RATE_LIMIT = 2.0        # Solicitudes por segundo permitidas por host
+HOST_BURST = 4               # Ráfaga máxima de solicitudes por host
+FRONTIER_PRIORITY = 'fifo'   # Orden de la frontera: 'fifo', 'depth' o 'inlinks'
+CHECKPOINT_PATH = 'data/crawl_state.sqlite'  # Estado del rastreo (None para desactivar)
+CHECKPOINT_EVERY = 10        # Artículos procesados entre checkpoints
+RESUME_CRAWL = True          # Reanudar un rastreo interrumpido (los terminados no se reanudan)
+HTTP_CACHE_DIR = 'data/http_cache'  # Caché local de respuestas HTTP (None para desactivar)
+HTTP_CACHE_TTL = 7 * 24 * 3600      # Segundos antes de revalidar una respuesta en caché
+HTTP_CACHE_MAX_MB = 1024            # Tamaño máximo de la caché antes de desalojar (LRU)
+HTTP_CACHE_OFFLINE = False          # Servir solo desde la caché, sin acceder a la red
+NLP_BATCH_SIZE = 16          # Artículos por lote en nlp.pipe
+NLP_N_PROCESS = 1            # Procesos para la etapa de NLP (1 = en el proceso principal)
+DUMP_PATH = None             # Volcado local (XML, XML.bz2 o directorio de HTML); None = Wikipedia en vivo
+HTML_BACKEND = 'strainer'    # Extracción de HTML: 'html.parser', 'strainer' o 'lxml'
+COOCCURRENCE_WINDOW = 5      # Tamaño de la ventana deslizante de co-ocurrencia
+GRAPH_BACKEND = 'csr'        # Representación de las redes: 'csr' (arrays NumPy) o 'networkx'
+GRAPH_BINARY_FORMAT = 'npy'  # Copia binaria de las redes exportadas: 'npy', 'parquet' o None
+NODE_METRICS = False        # Calcular las métricas de nodos (intermediación exacta por defecto) tras exportar
+NODE_METRICS_OVERWRITE = False  # Sobrescribir data/*/*_metrics_nodes.csv (si no, *_metrics_nodes_pipeline.csv)
+METRICS_N_PROCESS = os.cpu_count() or 1  # Procesos para las métricas de todos los pares
+BETWEENNESS_PIVOTS = None   # Pivotes para la intermediación aproximada (None = exacta)
+COUNTING_MODE = 'exact'      # Conteo de frecuencias: 'exact' (Counter) o 'sketch' (aproximado, memoria acotada)
+SKETCH_MEMORY_MB = 128       # Presupuesto de memoria de cada contador en modo 'sketch' (tabla, candidatos y muestra)
+SKETCH_DEPTH = 4             # Filas (funciones hash) de cada Count-Min sketch
+SKETCH_CANDIDATES = 200_000  # Elementos frecuentes que conserva cada contador en modo 'sketch'
+SKETCH_SAMPLE = 10_000       # Tamaño de la muestra para estimar los percentiles de poda
+CRAWL_WORKERS = 1            # Procesos de rastreo con una frontera compartida (1 = un solo proceso)
+SHARED_FRONTIER_PATH = 'data/shared_frontier.sqlite'  # Frontera compartida del rastreo distribuido
+PARTIALS_DIR = 'data/partials'  # Agregados parciales de cada proceso de rastreo
+WORKER_TIMEOUT = 300         # Segundos sin señales tras los que un proceso de rastreo se da por caído
+ARTICLE_STORE_PATH = 'data/article_store.sqlite'  # Revisiones y contribuciones por artículo (None para desactivar)
+INCREMENTAL_REFRESH = False  # Con un almacén previo, procesar solo los artículos editados o nuevos
+METRICS_PATH = 'data/metrics/run_metrics.json'  # Métricas de la ejecución por etapa (None para desactivar)
+METRICS_FORMAT = 'json'      # Formato de las métricas: 'json' o 'prometheus' (formato de texto)
+PROFILE_STAGES = ()          # Etapas perfiladas con cProfile, p. ej. ('parse', 'nlp', 'export')
+TRACE_MEMORY = False         # Pico de memoria de cada etapa con tracemalloc (más lento)
+NLP_MODE = 'scispacy'        # Etapa de NLP: 'scispacy' (modelo completo) o 'fast' (regex + stopwords + lemas en caché)
+SPACY_MODEL = 'en_core_sci_md'  # Modelo de SciSpaCy (se carga al procesar el primer artículo)
+PARAGRAPH_CACHE_SIZE = 0    # Párrafos cuyo resultado de NLP se reutiliza si se repiten (0 = artículos completos)
+SKIP_DUPLICATE_PARAGRAPHS = False  # Omitir los párrafos repetidos en lugar de reutilizar su resultado
+TOKEN_CACHE_SIZE = 100_000   # Decisiones por palabra (stopword, lema, verbo de baja información) en caché, modo 'fast'
+
+# Componentes de SciSpaCy necesarios: POS (tagger + attribute_ruler), lemas y entidades
+NLP_COMPONENTS = ('tok2vec', 'tagger', 'attribute_ruler', 'lemmatizer', 'ner')
+
+# Ritmos derivados de las métricas: nombre -> (contador, etapa)
+METRIC_RATES = {
+    'parse_pages_per_second': ('pages_parsed', 'parse'),
+    'nlp_tokens_per_second': ('nlp_tokens', 'nlp'),
+    'count_words_per_second': ('words_counted', 'count'),
+    'export_rows_per_second': ('export_rows', 'export'),
+}
 
 # === Configuración de la Sesión HTTP con Reintentos ===
-session = requests.Session()
-retry_strategy = Retry(
-    total=3,                                     # Total de reintentos
-    backoff_factor=1,                           # Factor de retroceso
-    status_forcelist=[429, 500, 502, 503, 504],  # Códigos de estado que activan reintentos
-    allowed_methods=["HEAD", "GET", "OPTIONS"]   # Métodos HTTP permitidos para reintentos
-)
-adapter = HTTPAdapter(max_retries=retry_strategy)
-session.mount("https://", adapter)
-session.mount("http://", adapter)
-
-# === Cargar el Modelo de SciSpaCy ===
-try:
-    # Reemplaza 'en_core_sci_md' con el modelo que hayas instalado
-    nlp = spacy.load('en_core_sci_md', disable=['parser'])  
-except Exception as e:
-    print(f"Error al cargar SciSpaCy o el modelo 'en_core_sci_md': {e}")
-    print("Intenta instalar el modelo ejecutando:")
-    print("pip install https://s3-us-west-2.amazonaws.com/ai2-s2-scispacy/releases/v0.5.0/en_core_sci_md-0.5.0.tar.gz")
-    sys.exit(1)  # Usar sys.exit() en lugar de exit()
-
-# Obtener las stopwords de spaCy y añadir stopwords médicas personalizadas si es necesario
-stopwords_set = nlp.Defaults.stop_words
-# Ejemplo: Añadir términos médicos que deseas excluir
-# stopwords_set.update({'term1', 'term2'})  # Añade términos personalizados si es necesario
+def create_session(cache=None):
+    """
+    Crea una sesión HTTP con la estrategia de reintentos para 429/5xx.
+    Cada hilo de descarga del crawler crea la suya con esta función.
+    Si se indica `cache` (ResponseCache), las respuestas se sirven y guardan en ella.
+    """
+    session = requests.Session()
+    retry_strategy = Retry(
+        total=3,                                     # Total de reintentos
+        backoff_factor=1,                           # Factor de retroceso
+        status_forcelist=[429, 500, 502, 503, 504],  # Códigos de estado que activan reintentos
+        allowed_methods=["HEAD", "GET", "OPTIONS"]   # Métodos HTTP permitidos para reintentos
+    )
+    if cache is not None:
+        adapter = CachingAdapter(cache, max_retries=retry_strategy)
+    else:
+        adapter = HTTPAdapter(max_retries=retry_strategy)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+# === Etapa de NLP con Carga Perezosa ===
+class TextPipeline:
+    """
+    Configuración de la etapa de NLP y de la sesión HTTP compartida. El modelo de
+    SciSpaCy y la sesión se crean la primera vez que se usan, de modo que importar
+    `pipeline` (p. ej. desde las herramientas de análisis o los procesos de
+    rastreo) no paga la carga del modelo.
+
+    Modos:
+    - 'scispacy': etiquetado, lemas y entidades del modelo `model`.
+    - 'fast': sin modelo; tokenización con expresiones regulares, stopwords de
+      spaCy y lemas de una tabla de búsqueda. No extrae entidades y descarta los
+      verbos de baja información por su lema, sin etiquetado. La decisión sobre
+      cada palabra se guarda en una caché LRU de `token_cache_size` entradas.
+
+    Con `paragraph_cache_size` > 0, `process_texts` procesa cada párrafo por
+    separado y reutiliza (u omite, con `skip_duplicates`) el resultado de los
+    párrafos repetidos en el rastreo (ver `ParagraphCache`).
+
+    Parámetros:
+    - mode (str): 'scispacy' o 'fast'.
+    - model (str): Nombre del modelo de SciSpaCy.
+    - components (Tuple[str, ...]): Componentes del modelo que se ejecutan.
+    - paragraph_cache_size (int): Párrafos guardados en la caché (0 para desactivarla).
+    - skip_duplicates (bool): Omitir los párrafos repetidos.
+    - token_cache_size (int): Palabras guardadas en la caché de decisiones del modo 'fast'.
+    """
+
+    def __init__(self, mode='scispacy', model='en_core_sci_md', components=NLP_COMPONENTS,
+                 paragraph_cache_size=0, skip_duplicates=False, token_cache_size=100_000):
+        if mode not in ('scispacy', 'fast'):
+            raise ValueError(f"Modo de NLP desconocido: {mode}")
+        self.mode = mode
+        self.model = model
+        self.components = components
+        self.paragraph_cache = (ParagraphCache(paragraph_cache_size, skip_duplicates)
+                                if paragraph_cache_size else None)
+        self.decide = lru_cache(maxsize=token_cache_size)(self._decide)
+        self.load_seconds = 0.0
+        self._nlp = None
+        self._session = None
+        self._stopwords = None
+        self._lemmas = None
+
+    @property
+    def session(self):
+        if self._session is None:
+            self._session = create_session()
+        return self._session
+
+    @property
+    def nlp(self):
+        """Modelo de SciSpaCy; se carga en el primer acceso."""
+        if self._nlp is None:
+            start = time.perf_counter()
+            try:
+                import spacy
+                # Reemplaza 'en_core_sci_md' con el modelo que hayas instalado
+                self._nlp = spacy.load(self.model, disable=['parser'])
+            except Exception as e:
+                print(f"Error al cargar SciSpaCy o el modelo '{self.model}': {e}")
+                print("Intenta instalar el modelo ejecutando:")
+                print("pip install https://s3-us-west-2.amazonaws.com/ai2-s2-scispacy/releases/v0.5.0/en_core_sci_md-0.5.0.tar.gz")
+                sys.exit(1)  # Usar sys.exit() en lugar de exit()
+            self.load_seconds += time.perf_counter() - start
+            print(f"Modelo '{self.model}' cargado en {self.load_seconds:.2f} s")
+        return self._nlp
+
+    @property
+    def stopwords(self):
+        """Stopwords de spaCy (las del modelo en modo 'scispacy')."""
+        if self._stopwords is None:
+            if self.mode == 'scispacy':
+                self._stopwords = self.nlp.Defaults.stop_words
+            else:
+                from spacy.lang.en.stop_words import STOP_WORDS
+                self._stopwords = STOP_WORDS
+            # Ejemplo: Añadir términos médicos que deseas excluir
+            # self._stopwords.update({'term1', 'term2'})  # Añade términos personalizados si es necesario
+        return self._stopwords
+
+    @property
+    def lemmas(self):
+        """Tabla de lemas del modo 'fast'."""
+        if self._lemmas is None:
+            start = time.perf_counter()
+            self._lemmas = LemmaLookup.from_spacy_lookups()
+            self.load_seconds += time.perf_counter() - start
+        return self._lemmas
+
+    def load(self):
+        """
+        Carga por adelantado lo que necesita el modo configurado (p. ej. antes de
+        crear procesos con 'fork', para que lo hereden en lugar de cargarlo cada uno).
+        """
+        if self.mode == 'scispacy':
+            self.nlp
+        else:
+            self.lemmas
+        self.stopwords
+        return self
+
+    def disabled_components(self):
+        # Componentes del modelo que no influyen en la salida de summarize_doc
+        return [name for name in self.nlp.pipe_names if name not in self.components]
+
+    def _decide(self, token):
+        # Lema que se conserva de una palabra en el modo 'fast', o None si se descarta
+        if token in self.stopwords or len(token) <= 2:
+            return None
+        lemma = self.lemmas(token)
+        return None if lemma in LOW_INFORMATION_VERBS else lemma
+
+    def process_paragraphs(self, texts):
+        """
+        Procesa una lista de textos y devuelve (palabras, entidades) de cada uno.
+        """
+        if not texts:
+            return []
+        if self.mode == 'fast':
+            return [(tokens_words(preprocess_text(text), self.decide), []) for text in texts]
+        docs = self.nlp.pipe((preprocess_text(text) for text in texts),
+                             batch_size=len(texts), disable=self.disabled_components())
+        return [doc_words(doc) for doc in docs]
+
+    def process_batch(self, batch):
+        """
+        Procesa un lote de textos y devuelve (palabras, bigramas) de cada uno.
+        """
+        return [words_to_bigrams(words + entities) for words, entities in self.process_paragraphs(batch)]
+
+    def report(self):
+        """
+        Retorna:
+        - List[str]: Tasas de aciertos de las cachés de párrafos y de palabras.
+        """
+        lines = []
+        if self.paragraph_cache is not None:
+            lines.append(self.paragraph_cache.report())
+        info = self.decide.cache_info()
+        if self.mode == 'fast' and info.hits + info.misses:
+            lines.append(f"Caché de palabras: {info.hits} aciertos, {info.misses} fallos "
+                         f"(tasa de aciertos {info.hits / (info.hits + info.misses):.1%}), "
+                         f"{info.currsize} en caché")
+        return lines
+
+
+class LemmaLookup:
+    """
+    Lematizador por tabla de búsqueda para el modo 'fast': usa la tabla
+    `lemma_lookup` de spaCy (paquete `spacy-lookups-data`) si está instalada y,
+    para las palabras que no aparecen en ella, reglas de plurales en inglés.
+    """
+
+    def __init__(self, table=None):
+        self.table = table or {}
+
+    @classmethod
+    def from_spacy_lookups(cls):
+        from spacy.lookups import load_lookups
+        lookups = load_lookups('en', ['lemma_lookup'], strict=False)
+        # La tabla de spaCy indexa por el hash de la palabra; `get` acepta la palabra
+        return cls(lookups.get_table('lemma_lookup') if lookups.has_table('lemma_lookup') else None)
+
+    def __call__(self, word):
+        return self.table.get(word) or plural_to_singular(word)
+
+
+def plural_to_singular(word):
+    """
+    Reglas básicas de plurales en inglés (studies -> study, boxes -> box,
+    receptors -> receptor); deja sin cambios las terminaciones -ss, -us e -is.
+    """
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 4 and word.endswith(('sses', 'ches', 'shes', 'xes', 'zes')):
+        return word[:-2]
+    if len(word) > 3 and word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        return word[:-1]
+    return word
+
+
+# Instancia usada por las funciones del módulo (se puede sustituir con `configure`)
+text_pipeline = TextPipeline(mode=NLP_MODE, model=SPACY_MODEL, paragraph_cache_size=PARAGRAPH_CACHE_SIZE,
+                             skip_duplicates=SKIP_DUPLICATE_PARAGRAPHS, token_cache_size=TOKEN_CACHE_SIZE)
+
+def configure(mode=NLP_MODE, model=SPACY_MODEL, paragraph_cache_size=PARAGRAPH_CACHE_SIZE,
+              skip_duplicates=SKIP_DUPLICATE_PARAGRAPHS, token_cache_size=TOKEN_CACHE_SIZE):
+    """
+    Sustituye la configuración de la etapa de NLP del módulo.
+
+    Retorna:
+    - TextPipeline: La nueva instancia.
+    """
+    global text_pipeline
+    text_pipeline = TextPipeline(mode=mode, model=model, paragraph_cache_size=paragraph_cache_size,
+                                 skip_duplicates=skip_duplicates, token_cache_size=token_cache_size)
+    return text_pipeline
+
+def __getattr__(name):
+    # Compatibilidad con `pipeline.nlp`, `pipeline.session` y `pipeline.stopwords_set`,
+    # que antes se creaban al importar el módulo
+    if name == 'nlp':
+        return text_pipeline.nlp
+    if name == 'session':
+        return text_pipeline.session
+    if name == 'stopwords_set':
+        return text_pipeline.stopwords
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # === Funciones Auxiliares ===
 
@@ -59,29 +330,43 @@ def is_low_information_verb(token):
     """
     Determina si un token es un verbo de baja información.
     """
-    return token.pos_ == "VERB" and token.lemma_ in {
-        'be', 'have', 'do', 'say', 'go', 'can', 'get', 'would', 'make', 'know',
-        'will', 'think', 'take', 'see', 'come', 'could', 'want', 'look', 'use',
-        'find', 'give', 'tell', 'work', 'call', 'include'  # Añadido 'include' y 'use'
-    }
+    return token.pos_ == "VERB" and token.lemma_ in LOW_INFORMATION_VERBS
 
-def clean_text(text, language='english'):
+LOW_INFORMATION_VERBS = {
+    'be', 'have', 'do', 'say', 'go', 'can', 'get', 'would', 'make', 'know',
+    'will', 'think', 'take', 'see', 'come', 'could', 'want', 'look', 'use',
+    'find', 'give', 'tell', 'work', 'call', 'include'  # Añadido 'include' y 'use'
+}
+
+# Tokens del texto ya limpiado por preprocess_text (modo 'fast')
+TOKEN_PATTERN = re.compile(r'[a-z]+')
+
+def preprocess_text(text):
     """
-    Limpia y procesa el texto de entrada:
-    - Convierte a minúsculas
-    - Elimina caracteres especiales
-    - Tokeniza el texto
+    Limpieza básica previa a SciSpaCy: minúsculas y solo caracteres alfabéticos.
+    """
+    text = text.lower()
+    return re.sub(r'[^a-zA-Z\s]', '', text)
+
+def summarize_doc(doc):
+    """
+    Extrae de un documento procesado por SciSpaCy las palabras, entidades y bigramas:
     - Elimina stopwords y verbos de baja información
     - Extrae entidades nombradas
     - Genera bigramas de las palabras más comunes
     """
-    # Limpieza básica
-    text = text.lower()
-    text = re.sub(r'[^a-zA-Z\s]', '', text)
+    words, entities = doc_words(doc)
+    # Combinar palabras y entidades
+    return words_to_bigrams(words + entities)
 
-    # Procesar el texto con SciSpaCy
-    doc = nlp(text)
+def doc_words(doc):
+    """
+    Palabras (lemas sin stopwords ni verbos de baja información) y entidades
+    nombradas de un documento procesado por SciSpaCy.
 
+    Retorna:
+    - Tuple[List[str], List[str]]: Palabras y entidades.
+    """
     words = []
     entities = []
 
@@ -96,9 +381,24 @@ def clean_text(text, language='english'):
     # Extraer entidades nombradas
     for ent in doc.ents:
         entities.append(ent.text.lower())
+    return words, entities
 
-    # Combinar palabras y entidades
-    all_words = words + entities
+def tokens_words(text, decide):
+    """
+    Equivalente de doc_words sin modelo (modo 'fast'): tokeniza el texto ya
+    limpiado con una expresión regular y conserva el lema que `decide` devuelve
+    para cada palabra (None para las stopwords y los verbos de baja información).
+    """
+    return [lemma for lemma in map(decide, TOKEN_PATTERN.findall(text)) if lemma is not None]
+
+def words_to_bigrams(all_words):
+    """
+    Genera los bigramas de las palabras más comunes de un artículo.
+
+    Retorna:
+    - Tuple[List[str], List[str]]: Palabras (sin cambios) y bigramas.
+    """
+    from nltk.util import ngrams  # Importación diferida: nltk tarda en importarse
 
     # Contar frecuencia de palabras
     word_freq = Counter(all_words)
@@ -114,6 +414,172 @@ def clean_text(text, language='english'):
 
     return all_words, bigrams
 
+def clean_text(text, language='english'):
+    """
+    Limpia y procesa el texto de entrada:
+    - Convierte a minúsculas
+    - Elimina caracteres especiales
+    - Tokeniza el texto
+    - Elimina stopwords y verbos de baja información
+    - Extrae entidades nombradas
+    - Genera bigramas de las palabras más comunes
+    """
+    return text_pipeline.process_batch([text])[0]
+
+def _process_batch(batch):
+    """
+    Procesa un lote de textos con `text_pipeline` (se ejecuta en los procesos del pool).
+    """
+    return text_pipeline.process_batch(batch)
+
+def _process_paragraphs(paragraphs):
+    """
+    Procesa una lista de párrafos con `text_pipeline` (se ejecuta en los procesos del pool).
+    """
+    return text_pipeline.process_paragraphs(paragraphs)
+
+def _timed(function, texts):
+    # Ejecuta la etapa de NLP y devuelve también su duración (medida en el proceso del pool)
+    start = time.perf_counter()
+    results = function(texts)
+    return time.perf_counter() - start, results
+
+def _count_nlp(texts):
+    metrics.count('nlp_texts', len(texts))
+    metrics.count('nlp_tokens', sum(len(text.split()) for text in texts))
+
+def paragraph_separator():
+    """
+    Separador entre los párrafos del texto extraído: con la caché de párrafos se
+    conserva uno por línea para procesarlos por separado; sin ella se unen con
+    espacios y el modelo recibe el mismo texto que sin caché.
+    """
+    return '\n' if text_pipeline.paragraph_cache is not None else ' '
+
+def _split_paragraphs(text):
+    return [paragraph for paragraph in (line.strip() for line in text.split('\n')) if paragraph]
+
+def _prepare_batch(batch):
+    """
+    Prepara un lote de artículos para la etapa de NLP. Con la caché de párrafos
+    de `text_pipeline`, solo se procesan los párrafos que no están en ella (una
+    vez cada uno, aunque se repitan en el lote) y las palabras de cada artículo
+    se reconstruyen a partir de las de sus párrafos.
+
+    Retorna:
+    - Tuple[Callable, List[str], Callable]: Función que procesa los textos (se
+      ejecuta en el pool), textos que se le pasan y función que recibe sus
+      resultados y devuelve (clave, palabras, bigramas) de cada artículo.
+    """
+    keys = [key for key, _ in batch]
+    cache = text_pipeline.paragraph_cache
+    if cache is None:
+        def finish(results):
+            for key, (words, bigrams) in zip(keys, results):
+                yield key, words, bigrams
+        return _process_batch, [text for _, text in batch], finish
+
+    plan, known, missing = [], {}, {}
+    for _, text in batch:
+        digests = []
+        for paragraph in _split_paragraphs(text):
+            digest = cache.key(paragraph)
+            hit = digest in known or digest in missing
+            if not hit:
+                value = cache.get(digest)
+                hit = value is not None
+                if hit:
+                    known[digest] = value
+                else:
+                    missing[digest] = paragraph
+            cache.record(paragraph, hit)
+            if not (hit and cache.skip_duplicates):
+                digests.append(digest)
+        plan.append(digests)
+
+    def finish(results):
+        for digest, value in zip(missing, results):
+            cache.put(digest, value)
+            known[digest] = value
+        for key, digests in zip(keys, plan):
+            words, entities = [], []
+            for digest in digests:
+                paragraph_words, paragraph_entities = known[digest]
+                words.extend(paragraph_words)
+                entities.extend(paragraph_entities)
+            words, bigrams = words_to_bigrams(words + entities)
+            yield key, words, bigrams
+    return _process_paragraphs, list(missing.values()), finish
+
+def _batched(items, batch_size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def process_texts(texts_data, batch_size=NLP_BATCH_SIZE, n_process=NLP_N_PROCESS):
+    """
+    Etapa de NLP por lotes: procesa los textos de los artículos con `text_pipeline`
+    (con `nlp.pipe`, desactivando los componentes que la salida no necesita, o con
+    el modo 'fast').
+
+    La entrada se consume de forma perezosa, lote a lote, de modo que puede ser
+    el propio rastreo en curso: con `n_process` > 1 nunca hay más de dos lotes
+    por proceso pendientes, y el rastreo espera si la etapa de NLP va por detrás.
+
+    Parámetros:
+    - texts_data (Iterable[Tuple[Any, str]]): Pares (clave, texto); la clave (p. ej. la
+      URL) se devuelve sin cambios junto al resultado.
+    - batch_size (int): Número de artículos por lote.
+    - n_process (int): Número de procesos; con más de uno, cada proceso del pool
+      ejecuta `nlp.pipe` sobre lotes completos y devuelve solo las listas de palabras.
+
+    Con la caché de párrafos (`PARAGRAPH_CACHE_SIZE`), cada párrafo se procesa por
+    separado y los repetidos en el rastreo no vuelven a pasar por el modelo; la
+    caché vive en el proceso principal, así que también se comparte entre los
+    procesos del pool.
+
+    Retorna:
+    - Iterator[Tuple[Any, List[str], List[str]]]: (clave, palabras, bigramas) en el orden de entrada.
+    """
+    batches = _batched(texts_data, batch_size)
+    if n_process <= 1:
+        for batch in batches:
+            function, texts, finish = _prepare_batch(batch)
+            with metrics.stage('nlp'):
+                results = function(texts)
+            _count_nlp(texts)
+            yield from finish(results)
+        return
+
+    # 'fork' hereda el modelo ya cargado; en otras plataformas cada proceso lo carga al usarlo
+    text_pipeline.load()
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    with context.Pool(n_process) as pool:
+        pending = deque()
+
+        def drain():
+            finish, result = pending.popleft()
+            with metrics.stage('nlp_wait'):
+                seconds, results = result.get()
+            # Tiempo de NLP de los procesos del pool (suma de todos ellos)
+            metrics.add_time('nlp', seconds)
+            yield from finish(results)
+
+        for batch in batches:
+            function, texts, finish = _prepare_batch(batch)
+            _count_nlp(texts)
+            pending.append((finish, pool.apply_async(_timed, (function, texts))))
+            if len(pending) >= 2 * n_process:
+                yield from drain()
+        while pending:
+            yield from drain()
+
 def get_cooccurrence_edges(words, window_size=5):
     """
     Genera bordes de co-ocurrencia dentro de una ventana deslizante.
@@ -127,6 +593,38 @@ def get_cooccurrence_edges(words, window_size=5):
                 edges.append(edge)
     return edges
 
+def shared_word_bigram_pairs(bigrams):
+    """
+    Genera los pares de bigramas que comparten al menos una palabra.
+
+    Usa un índice invertido palabra -> posiciones de los bigramas que la contienen,
+    de modo que solo se examinan los pares que realmente comparten una palabra: el
+    coste depende del número de pares generados y no de N². Los pares se generan en
+    el mismo orden que la comparación de todos contra todos (i < j).
+
+    Parámetros:
+    - bigrams (List[str]): Bigramas (palabras separadas por espacios).
+
+    Retorna:
+    - Iterator[Tuple[str, str]]: Pares (bigrama i, bigrama j) con i < j.
+    """
+    index = {}
+    word_sets = []
+    for position, bigram in enumerate(bigrams):
+        words = set(bigram.split())
+        word_sets.append(words)
+        for word in words:
+            index.setdefault(word, []).append(position)
+
+    for i, words in enumerate(word_sets):
+        partners = set()
+        for word in words:
+            # Las posiciones de cada palabra están ordenadas: solo interesan las posteriores a i
+            positions = index[word]
+            partners.update(positions[bisect.bisect_right(positions, i):])
+        for j in sorted(partners):
+            yield bigrams[i], bigrams[j]
+
 def extract_wikipedia_links(soup, base_url):
     """
     Extrae enlaces válidos de artículos de Wikipedia desde el objeto soup.
@@ -135,36 +633,52 @@ def extract_wikipedia_links(soup, base_url):
     for link in soup.find_all('a', href=True):
         href = link['href']
         # Filtrar enlaces que no sean a otros artículos
-        if href.startswith('/wiki/') and ':' not in href and not href.startswith('/wiki/Main_Page') and '#' not in href:
+        if is_article_href(href):
             full_url = urljoin(base_url, href)
             links.add(full_url)
     return links
 
-def prune_links(links_data, min_freq=MIN_LINK_FREQ):
+def prune_links(links_data, titles, min_freq=MIN_LINK_FREQ):
     """
     Elimina enlaces que aparecen menos de `min_freq` veces.
+    Los enlaces son identificadores de `titles`; las redirecciones se resuelven
+    antes de contar, de modo que todas las variantes de un título cuentan juntas.
     
     Parámetros:
-    - links_data (List[Tuple[str, Set[str]]]): Lista de enlaces por artículo.
+    - links_data (Dict[int, numpy.ndarray]): Enlaces de cada artículo.
+    - titles (TitleTable): Tabla de títulos internados.
     - min_freq (int): Frecuencia mínima requerida para mantener un enlace.
     
     Retorna:
-    - Dict[str, Set[str]]: Mapa de artículos con sus enlaces filtrados.
+    - Dict[int, numpy.ndarray]: Mapa de artículos con sus enlaces filtrados.
     """
-    link_counter = Counter()
-    for _, links in links_data:
-        link_counter.update(links)
+    canonical = titles.canonical_ids()
+    articles = []
+    for source, links in links_data.items():
+        resolved = canonical[links]
+        # Un enlace a una redirección del propio artículo no es una arista
+        keep = (resolved != canonical[source]) | ((links == source) & (resolved == links))
+        articles.append((int(canonical[source]), np.unique(resolved[keep])))
+    link_counter = np.bincount(
+        np.concatenate([links for _, links in articles] + [np.zeros(0, dtype=np.int32)]),
+        minlength=len(titles)
+    )
     
     # Determinar enlaces a mantener
-    valid_links = {link for link, freq in link_counter.items() if freq >= min_freq}
+    valid_links = link_counter >= min_freq
     
     # Filtrar enlaces en cada artículo
     pruned_links_data = {}
-    for source, links in links_data:
-        pruned = links.intersection(valid_links)
-        if pruned:
+    for source, links in articles:
+        pruned = links[valid_links[links]]
+        if len(pruned):
+            if source in pruned_links_data:
+                # Artículo descargado también a través de una redirección
+                pruned = np.union1d(pruned_links_data[source], pruned)
             pruned_links_data[source] = pruned
     
+    metrics.count('links_generated', sum(len(links) for _, links in articles))
+    metrics.count('links_kept', sum(len(links) for links in pruned_links_data.values()))
     print(f"Enlaces retenidos después de la poda: {len(pruned_links_data)}")
     return pruned_links_data
 
@@ -226,85 +740,633 @@ def prune_nodes_by_percentile(graph, percentile=15, min_freq=5):
     print(f"Nodos eliminados durante la poda: {len(nodes_to_remove)}")
     return graph
 
-def crawl_wikipedia(article_url, base_url, max_depth, max_articles):
+def build_word_graph(word_freq, top_bigrams, cooccurrence, window_size=COOCCURRENCE_WINDOW,
+                     edge_percentile=EDGE_POD_PERCENTILE, min_edge_weight=MIN_EDGE_WEIGHT,
+                     node_percentile=NODE_POD_PERCENTILE, min_node_freq=MIN_NODE_FREQ,
+                     backend=GRAPH_BACKEND):
     """
-    Rastrear artículos de Wikipedia hasta una profundidad y número máximo especificados.
-    Extrae palabras individuales, bigramas y entidades nombradas.
-    Implementa una poda de enlaces basada en frecuencia.
+    Construye la red de palabras y bigramas ya podada.
+
+    Los umbrales de `prune_edges_by_percentile` y `prune_nodes_by_percentile` se
+    calculan con NumPy sobre los arrays de conteo, y en el grafo de NetworkX solo
+    se insertan los nodos y aristas que sobreviven a la poda. El resultado (también
+    el orden de nodos y aristas) es el mismo que construir el grafo completo y
+    podarlo después.
+
+    Parámetros:
+    - word_freq (collections.Counter | SketchCounter): Frecuencia global de cada palabra.
+    - top_bigrams (List[Tuple[str, int]]): Bigramas más frecuentes y su frecuencia.
+    - cooccurrence (CooccurrenceCounter | SketchCooccurrenceCounter): Co-ocurrencias
+      acumuladas. Con los contadores aproximados de `sketches` solo se consideran los
+      candidatos frecuentes, los percentiles de poda se estiman con su muestra uniforme
+      y se poda con la cota inferior de cada frecuencia (sin aristas de más).
+    - window_size (int): Ventana de co-ocurrencia a usar.
+    - edge_percentile, min_edge_weight: Poda de aristas (percentil o peso mínimo).
+    - node_percentile, min_node_freq: Poda de nodos de palabras (percentil o frecuencia mínima).
+    - backend (str): 'csr' (CSRGraph) o 'networkx' (networkx.Graph).
+
+    Retorna:
+    - CSRGraph | networkx.Graph: La red de palabras y bigramas podada.
     """
-    visited_articles = set()
-    articles_to_visit = [(article_url, 0)]  # (URL, profundidad)
-    words_data = []
-    bigrams_data = []
-    links_data = []
-    total_articles = 0
+    # Nodos en orden de inserción; un bigrama con el mismo texto que una palabra
+    # (p. ej. una entidad) sustituye sus atributos pero conserva su posición
+    nodes = {word: ('word', freq) for word, freq in word_freq.items()}
+    for bigram, freq in top_bigrams:
+        nodes[bigram] = ('bigram', freq)
 
-    while articles_to_visit and total_articles < max_articles:
-        current_url, depth = articles_to_visit.pop(0)
-        if current_url in visited_articles or depth > max_depth:
+    # Aristas estructurales (peso 1): bigrama -> palabras y bigrama <-> bigrama
+    structural = {}
+    for bigram, freq in top_bigrams:
+        split_bigram = bigram.split()
+        if len(split_bigram) != 2:
+            print(f"Bigram inválido detectado: '{bigram}'")
             continue
+        word1, word2 = split_bigram
+        if word1 in nodes and word2 in nodes:
+            structural[frozenset((bigram, word1))] = (bigram, word1, 'Contains')
+            structural[frozenset((bigram, word2))] = (bigram, word2, 'Contains')
+        else:
+            print(f"Una o ambas palabras del bigram '{bigram}' no están en el grafo de palabras.")
 
-        print(f"Scraping: {current_url} (Depth: {depth})")
+    print("\nConectando bigrams entre sí basados en palabras compartidas...")
+    for bigram1, bigram2 in shared_word_bigram_pairs([bigram for bigram, _ in top_bigrams]):
+        structural[frozenset((bigram1, bigram2))] = (bigram1, bigram2, 'Co-occurs')
 
-        # Retraso respetuoso entre solicitudes
-        time.sleep(random.uniform(1, 3))
+    # Aristas de co-ocurrencia; una arista estructural entre las mismas palabras
+    # sustituye su tipo y su peso en la posición de la co-ocurrencia
+    tokens = cooccurrence.vocab.tokens
+    vocab_index = cooccurrence.vocab.index
+    sources, targets, weights = cooccurrence.arrays(window_size)
+    overridden = {}
+    for pair, (u, v, edge_type) in structural.items():
+        if u in vocab_index and v in vocab_index:
+            a, b = sorted((vocab_index[u], vocab_index[v]))
+            overridden[(a << ID_BITS) | b] = pair
+    edge_types = {}
+    if overridden:
+        keys = (sources << ID_BITS) | targets
+        weights = weights.copy()
+        for position in np.flatnonzero(np.isin(keys, list(overridden))).tolist():
+            edge_types[position] = structural.pop(overridden[int(keys[position])])[2]
+            weights[position] = 1
+    structural_edges = list(structural.values())
+    all_weights = np.concatenate([weights, np.ones(len(structural_edges), dtype=weights.dtype)])
 
-        # Realizar la solicitud HTTP con manejo de errores
-        try:
-            response = session.get(current_url, timeout=10)
-            response.raise_for_status()
-        except requests.exceptions.HTTPError as errh:
-            print(f"HTTP Error para {current_url}: {errh}")
-            continue
-        except requests.exceptions.ConnectionError as errc:
-            print(f"Connection Error para {current_url}: {errc}")
-            continue
-        except requests.exceptions.Timeout as errt:
-            print(f"Timeout Error para {current_url}: {errt}")
-            continue
-        except requests.exceptions.RequestException as err:
-            print(f"Request Exception para {current_url}: {err}")
-            continue
+    # Con el conteo aproximado se poda con la cota inferior de cada peso: no
+    # sobrevive ninguna arista cuyo peso real quede por debajo de los umbrales
+    prune_weights = all_weights
+    if hasattr(cooccurrence, 'lower_bounds'):
+        lower = cooccurrence.lower_bounds(window_size)
+        lower[list(edge_types)] = 1
+        prune_weights = np.concatenate([lower, np.ones(len(structural_edges), dtype=lower.dtype)])
+
+    # Poda de aristas basada en percentil y peso mínimo
+    print("\nAplicando la poda de aristas basada en percentil y peso mínimo...")
+    keep_edges = np.ones(len(all_weights), dtype=bool)
+    if len(all_weights) == 0:
+        print("No hay aristas para podar.")
+    else:
+        population = all_weights
+        if hasattr(cooccurrence, 'sample_weights'):
+            # Conteo aproximado: el percentil se estima con una muestra uniforme de
+            # todos los pares vistos, no solo de los candidatos frecuentes
+            sample = cooccurrence.sample_weights(window_size)
+            structural_share = len(structural_edges) * len(sample) / max(1, cooccurrence.distinct(window_size))
+            population = np.concatenate([sample, np.ones(int(round(structural_share)), dtype=sample.dtype)])
+        threshold = np.percentile(population, edge_percentile)
+        keep_edges = (prune_weights >= threshold) & (prune_weights >= min_edge_weight)
+        print(f"Umbral de poda de aristas (percentil {edge_percentile} y peso mínimo {min_edge_weight}): {threshold}")
+        print(f"Aristas eliminadas durante la poda: {int(np.count_nonzero(~keep_edges))}")
+
+    # Poda de nodos de palabras basada en percentil y frecuencia mínima
+    print("\nAplicando la poda de nodos basada en percentil y frecuencia mínima...")
+    word_nodes = [(node, freq) for node, (group, freq) in nodes.items() if group == 'word']
+    removed = set()
+    if not word_nodes:
+        print("No hay nodos de palabras para podar.")
+    else:
+        frequencies = np.array([freq for _, freq in word_nodes])
+        population = frequencies
+        if hasattr(word_freq, 'lower_bounds'):
+            # Conteo aproximado: percentil de la muestra uniforme y poda con la cota inferior
+            population = word_freq.sample_counts()
+            lower = dict(word_freq.lower_bounds())
+            frequencies = np.array([lower.get(node, freq) for node, freq in word_nodes])
+        threshold_percentile = np.percentile(population, node_percentile)
+        low = (frequencies < threshold_percentile) | (frequencies < min_node_freq)
+        removed = {word_nodes[i][0] for i in np.flatnonzero(low).tolist()}
+        print(f"Umbral de poda de nodos (percentil {node_percentile} y frecuencia mínima {min_node_freq}): {threshold_percentile}")
+        print(f"Nodos eliminados durante la poda: {len(removed)}")
+
+    # Materializar solo los nodos y aristas supervivientes, en el orden original
+    token_removed = np.fromiter((token in removed for token in tokens), dtype=bool, count=len(tokens))
+    survivors = np.flatnonzero(keep_edges[:len(weights)] & ~token_removed[sources] & ~token_removed[targets])
+    structural_survivors = [
+        (u, v, edge_type)
+        for (u, v, edge_type), kept in zip(structural_edges, keep_edges[len(weights):].tolist())
+        if kept and u not in removed and v not in removed
+    ]
+    metrics.count('word_nodes_generated', len(nodes))
+    metrics.count('word_nodes_kept', len(nodes) - len(removed))
+    metrics.count('word_edges_generated', len(all_weights))
+    metrics.count('word_edges_kept', len(survivors) + len(structural_survivors))
+
+    if backend == 'csr':
+        labels = [node for node in nodes if node not in removed]
+        node_index = {label: i for i, label in enumerate(labels)}
+        token_nodes = np.fromiter((node_index.get(token, -1) for token in tokens), dtype=np.int64, count=len(tokens))
+        type_names = ['Undirected', 'Contains', 'Co-occurs']
+        edge_type_codes = np.zeros(len(survivors), dtype=np.int8)
+        for i, position in enumerate(survivors.tolist()):
+            if position in edge_types:
+                edge_type_codes[i] = type_names.index(edge_types[position])
+        return CSRGraph.from_edges(
+            labels, [nodes[label][0] for label in labels], [nodes[label][1] for label in labels],
+            np.concatenate([token_nodes[sources[survivors]], [node_index[u] for u, _, _ in structural_survivors]]),
+            np.concatenate([token_nodes[targets[survivors]], [node_index[v] for _, v, _ in structural_survivors]]),
+            np.concatenate([weights[survivors], np.ones(len(structural_survivors), dtype=np.int64)]),
+            (np.concatenate([edge_type_codes, [type_names.index(t) for _, _, t in structural_survivors]]), type_names),
+        )
+
+    graph = nx.Graph()
+    graph.add_nodes_from(
+        (node, {'Group': group, 'Attribute': attribute})
+        for node, (group, attribute) in nodes.items() if node not in removed
+    )
+    graph.add_edges_from(
+        (tokens[source], tokens[target], {'Type': edge_types.get(position, 'Undirected'), 'Weight': weight})
+        for position, source, target, weight in zip(
+            survivors.tolist(), sources[survivors].tolist(), targets[survivors].tolist(), weights[survivors].tolist()
+        )
+    )
+    for u, v, edge_type in structural_survivors:
+        graph.add_edge(u, v, Type=edge_type, Weight=1)
+    return graph
+
+def link_node_ids(links_data):
+    """
+    Identificadores de los nodos de la red de hipervínculos en orden de aparición
+    (cada artículo seguido de sus enlaces).
+
+    Retorna:
+    - numpy.ndarray: Identificadores de título, en el orden de los Id exportados.
+    """
+    if not links_data:
+        return np.zeros(0, dtype=np.int64)
+    order = np.concatenate([np.concatenate(([source], links)) for source, links in links_data.items()])
+    _, first = np.unique(order, return_index=True)
+    return order[np.sort(first)]
+
+def build_link_graph(links_data, titles, backend=GRAPH_BACKEND):
+    """
+    Construye la red dirigida de hipervínculos entre artículos.
+
+    Parámetros:
+    - links_data (Dict[int, numpy.ndarray]): Enlaces podados de cada artículo.
+    - titles (TitleTable): Tabla de títulos; las etiquetas de los nodos son sus URLs canónicas.
+    - backend (str): 'csr' (CSRGraph) o 'networkx' (networkx.DiGraph).
+
+    Retorna:
+    - CSRGraph | networkx.DiGraph: La red de hipervínculos.
+    """
+    node_ids = link_node_ids(links_data)
+    labels = [titles.url(title_id) for title_id in node_ids.tolist()]
+
+    if backend == 'csr':
+        position = np.zeros(len(titles), dtype=np.int64)
+        position[node_ids] = np.arange(len(node_ids))
+        sources = np.fromiter(links_data.keys(), dtype=np.int64, count=len(links_data))
+        counts = [len(links) for links in links_data.values()]
+        targets = np.concatenate(list(links_data.values()) + [np.zeros(0, dtype=np.int64)])
+        return CSRGraph.from_edges(
+            labels, ['link'] * len(labels), np.zeros(len(labels), dtype=np.int64),
+            np.repeat(position[sources], counts), position[targets], np.ones(len(targets), dtype=np.int64),
+            (np.zeros(len(targets), dtype=np.int8), ['Directed']), directed=True
+        )
+
+    url = dict(zip(node_ids.tolist(), labels))
+    G_links = nx.DiGraph()
+    for source, targets in links_data.items():
+        G_links.add_node(url[source], Group='link', Attribute=0)
+        for target in targets.tolist():
+            G_links.add_node(url[target], Group='link', Attribute=0)
+            G_links.add_edge(url[source], url[target], Type='Directed', Weight=1)
+    return G_links
+
+def extract_page(current_url, response, base_url):
+    """
+    Extrae el texto (se procesa en la etapa de NLP) y los enlaces de una página descargada.
 
-        # Verificar que el contenido es HTML
-        if 'html' not in response.headers.get('Content-Type', ''):
+    Retorna:
+    - Optional[Tuple[str, Set[str], str]]: Texto, enlaces (URLs canónicas) y URL
+      final del artículo, o None si el contenido no es un artículo.
+    """
+    content_type = response.headers.get('Content-Type', '')
+    with metrics.stage('parse'):
+        if 'html' in content_type:
+            text, links = extract_article(response.content, base_url, backend=HTML_BACKEND,
+                                          separator=paragraph_separator())
+        elif 'x-wiki' in content_type:
+            # Wikitexto de un volcado XML
+            text = wikitext_to_text(response.text)
+            links = extract_wikitext_links(response.text, base_url)
+        else:
             print(f"El contenido no es HTML para {current_url}")
-            continue
+            return None
+        links = {canonical_url(link, base_url) for link in links}
 
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # URL final del artículo (redirecciones de Wikipedia o del volcado)
+        page_url = canonical_link(response.content) if 'html' in content_type else None
+    metrics.count('pages_parsed')
+    metrics.count('links_extracted', len(links))
+    return text, links, page_url or response.url
 
-        # Extraer y limpiar el texto
-        paragraphs = soup.find_all('p')
-        text = ' '.join([para.get_text() for para in paragraphs])
-        words, bigrams = clean_text(text, language='english')
-        words_data.append((current_url, words))
-        bigrams_data.append((current_url, bigrams))
-        print(f"Palabras extraídas: {len(words)}")
-        print(f"Bigrams extraídos: {len(bigrams)}")
+def sketch_options(mode=COUNTING_MODE):
+    """
+    Retorna:
+    - Optional[dict]: Parámetros de los contadores aproximados de `CorpusAggregate`
+      según `COUNTING_MODE`, o None para el conteo exacto.
+    """
+    if mode == 'exact':
+        return None
+    if mode != 'sketch':
+        raise ValueError(f"Modo de conteo desconocido: {mode}")
+    return {'memory_mb': SKETCH_MEMORY_MB, 'depth': SKETCH_DEPTH,
+            'capacity': SKETCH_CANDIDATES, 'sample_size': SKETCH_SAMPLE}
+
+def iter_articles(article_url, base_url, max_depth, max_articles,
+                  max_in_flight=MAX_IN_FLIGHT, rate_per_host=HOST_RATE_LIMIT, burst=HOST_BURST,
+                  priority=FRONTIER_PRIORITY, state=None, cache=None, fetcher=None, titles=None,
+                  revisions=None, frontier=None):
+    """
+    Rastrea los artículos y devuelve el texto y los enlaces de cada uno a medida
+    que se descargan.
+
+    Si `state` (CrawlState) contiene un checkpoint, primero se devuelven los
+    artículos ya registrados y después se continúa el rastreo desde ese punto.
+    Los enlaces se devuelven como URLs canónicas (`titles.canonical_url`), y las
+    redirecciones detectadas se registran en `titles` (TitleTable). Si se indica
+    `revisions` (dict), se anota en él la revisión de cada página descargada.
+    Con `frontier` (p. ej. una `SharedFrontier`) se usa esa frontera en lugar de
+    una local con la prioridad `priority`.
+
+    Retorna:
+    - Iterator[Tuple[str, str, Set[str]]]: (URL, texto, enlaces).
+    """
+    if state is not None and state.has_checkpoint():
+        if titles is not None:
+            for source, target in state.redirects():
+                titles.add_redirect(source, target)
+        yield from state.articles()
+
+    def extract(current_url, response):
+        page = extract_page(current_url, response, base_url)
+        if page is None:
+            return None
+        text, links, page_url = page
+        if titles is not None and page_url and canonical_title(page_url) != canonical_title(current_url):
+            titles.add_redirect(current_url, page_url)
+            if state is not None:
+                state.record_redirect(current_url, page_url)
+        if revisions is not None:
+            revisions[current_url] = page_revision(response)
 
-        # Extraer enlaces de Wikipedia
-        links = extract_wikipedia_links(soup, base_url)
-        links_data.append((current_url, links))
         print(f"Enlaces encontrados: {len(links)}")
+        if state is not None:
+            state.record_article(current_url, text, links)
+        return links, (current_url, text, links)
+
+    if fetcher is None:
+        fetcher = ConcurrentFetcher(lambda: create_session(cache), max_in_flight=max_in_flight,
+                                    rate_per_host=rate_per_host, burst=burst, cache=cache)
+    with fetcher:
+        if frontier is None:
+            frontier = Frontier(priority)
+        yield from crawl(article_url, max_depth, max_articles, fetcher, extract,
+                         frontier=frontier, state=state, checkpoint_every=CHECKPOINT_EVERY)
+
+def crawl_wikipedia(article_url, base_url, max_depth, max_articles,
+                    max_in_flight=MAX_IN_FLIGHT, rate_per_host=HOST_RATE_LIMIT, burst=HOST_BURST,
+                    priority=FRONTIER_PRIORITY, checkpoint_path=CHECKPOINT_PATH, resume=RESUME_CRAWL,
+                    cache=None, fetcher=None, aggregate=None, store=None, frontier=None):
+    """
+    Rastrear artículos de Wikipedia hasta una profundidad y número máximo especificados.
+    Extrae palabras individuales, bigramas y entidades nombradas.
+    Implementa una poda de enlaces basada en frecuencia.
+
+    Las descargas se realizan de forma concurrente (hasta `max_in_flight` solicitudes
+    en curso) con un límite de `rate_per_host` solicitudes por segundo por host.
+    Si se indica `checkpoint_path`, el progreso se guarda en SQLite y un rastreo
+    interrumpido se reanuda desde el último checkpoint. Con `cache` (ResponseCache)
+    las páginas se leen de la caché HTTP local cuando es posible. Con `fetcher`
+    (p. ej. el de `dump_reader.open_dump`) las páginas se leen de un volcado local.
+
+    Cada artículo pasa de la descarga a la etapa de NLP (`process_texts`) y a las
+    frecuencias globales sin esperar al resto del rastreo, y su texto y sus
+    palabras se descartan después: la memoria depende del vocabulario, no del
+    número de artículos.
+
+    Parámetros:
+    - aggregate (CorpusAggregate): Agregado en el que acumular los resultados
+      (por defecto, uno nuevo con la ventana `COOCCURRENCE_WINDOW`).
+    - store (ArticleStore): Si se indica, se guardan la revisión y las contribuciones
+      de cada artículo para poder actualizar las redes con `refresh_wikipedia`.
+    - frontier (SharedFrontier): Frontera compartida con otros procesos (ver
+      `crawl_wikipedia_sharded`).
+
+    Retorna:
+    - Tuple[CorpusAggregate, Dict[int, numpy.ndarray]]: Frecuencias agregadas del corpus
+      y enlaces podados por artículo (identificadores de `aggregate.titles`).
+    """
+    if aggregate is None:
+        aggregate = CorpusAggregate(window_sizes=(COOCCURRENCE_WINDOW,), base_url=base_url,
+                                    sketch=sketch_options(COUNTING_MODE))
 
-        # Añadir nuevos artículos a la cola
-        for link in links:
-            if link not in visited_articles and depth + 1 <= max_depth:
-                articles_to_visit.append((link, depth + 1))
+    state = None
+    if checkpoint_path:
+        state = CrawlState(checkpoint_path, seed=article_url, resume=resume)
+        if state.has_checkpoint():
+            print(f"Reanudando el rastreo interrumpido guardado en {checkpoint_path}")
 
-        visited_articles.add(current_url)
-        total_articles += 1
-        print(f"Total de artículos procesados: {total_articles}/{max_articles}\n")
+    print(f"Etapa de NLP: lotes de {NLP_BATCH_SIZE} artículos, {NLP_N_PROCESS} procesos\n")
+    try:
+        revisions = {} if store is not None else None
+        articles = iter_articles(article_url, base_url, max_depth, max_articles,
+                                 max_in_flight=max_in_flight, rate_per_host=rate_per_host, burst=burst,
+                                 priority=priority, state=state, cache=cache, fetcher=fetcher,
+                                 titles=aggregate.titles, revisions=revisions, frontier=frontier)
+        texts = (((url, links), text) for url, text, links in articles)
+        for (url, links), words, bigrams in process_texts(texts):
+            with metrics.stage('count'):
+                aggregate.add_article(url, words, bigrams, links)
+            metrics.count('words_counted', len(words))
+            if store is not None:
+                # Los artículos repetidos desde un checkpoint no tienen revisión: se
+                # volverán a descargar en la próxima actualización
+                store.put(url, revisions.pop(url, None), words, bigrams, links)
+            print(f"{url} - Palabras extraídas: {len(words)}, Bigrams extraídos: {len(bigrams)}")
+        if state is not None:
+            state.complete()
+    finally:
+        if state is not None:
+            state.close()
+
+    if store is not None:
+        titles = aggregate.titles
+        for source, target in titles.redirects.items():
+            store.put_redirect(titles.url(source), titles.url(target))
+        store.commit(aggregate)
 
     # Poda de Enlaces
-    pruned_links_data = prune_links(links_data, min_freq=MIN_LINK_FREQ)
+    pruned_links_data = prune_links(aggregate.links_data, aggregate.titles, min_freq=MIN_LINK_FREQ)
+
+    return aggregate, pruned_links_data
+
+def run_crawl_worker(worker, workers, article_url, base_url, max_depth, max_articles,
+                     frontier_path=SHARED_FRONTIER_PATH, partials_dir=PARTIALS_DIR,
+                     dump_path=None, cache_dir=None, **crawl_options):
+    """
+    Proceso de rastreo del modo distribuido: extrae URLs de la frontera compartida
+    hasta que se agota, procesa sus artículos y guarda su agregado parcial en
+    `<partials_dir>/worker_<worker>.pkl`.
+
+    Puede ejecutarse en otra máquina que comparta el sistema de ficheros
+    (`python crawl_worker.py`). El volcado local y la caché HTTP se abren en cada
+    proceso a partir de sus rutas.
+
+    Retorna:
+    - str: Ruta del agregado parcial.
+    """
+    metrics.reset()  # Un proceso creado con 'fork' hereda las métricas del principal
+    fetcher = open_dump(dump_path) if dump_path else None
+    cache = ResponseCache(cache_dir, ttl=HTTP_CACHE_TTL, max_bytes=HTTP_CACHE_MAX_MB * 1024 ** 2,
+                          offline=HTTP_CACHE_OFFLINE) if cache_dir else None
+    frontier = SharedFrontier(frontier_path, worker=worker, workers=workers, max_urls=max_articles,
+                              lease=WORKER_TIMEOUT)
+    try:
+        # El límite de artículos lo aplica la frontera compartida, para todos los procesos
+        aggregate, _ = crawl_wikipedia(article_url, base_url, max_depth, max_articles, checkpoint_path=None,
+                                       cache=cache, fetcher=fetcher, frontier=frontier, **crawl_options)
+    finally:
+        frontier.close()
+        if cache is not None:
+            cache.close()
+    os.makedirs(partials_dir, exist_ok=True)
+    path = os.path.join(partials_dir, f"worker_{worker}.pkl")
+    # Las métricas se guardan antes que el agregado: su presencia indica que el proceso terminó
+    metrics.write(path[:-len('.pkl')] + '.metrics.json')
+    aggregate.save(path + '.tmp')
+    os.replace(path + '.tmp', path)
+    print(f"Proceso {worker}: {aggregate.articles} artículos guardados en {path}")
+    for line in text_pipeline.report():
+        print(f"Proceso {worker}: {line}")
+    return path
+
+def merge_partials(paths, base_url):
+    """
+    Combina los agregados parciales de los procesos de rastreo y poda los enlaces.
+
+    Retorna:
+    - Tuple[CorpusAggregate, Dict[int, numpy.ndarray]]: Agregado combinado y
+      enlaces podados por artículo.
+    """
+    aggregate = CorpusAggregate(window_sizes=(COOCCURRENCE_WINDOW,), base_url=base_url,
+                                sketch=sketch_options(COUNTING_MODE))
+    for path in paths:
+        with metrics.stage('merge'):
+            aggregate.merge(CorpusAggregate.load(path))
+        metrics_path = path[:-len('.pkl')] + '.metrics.json'
+        if os.path.exists(metrics_path):
+            with open(metrics_path, encoding='utf-8') as f:
+                metrics.merge(json.load(f))
+    print(f"Agregados parciales combinados: {len(paths)} procesos, {aggregate.articles} artículos")
+    pruned_links_data = prune_links(aggregate.links_data, aggregate.titles, min_freq=MIN_LINK_FREQ)
+    return aggregate, pruned_links_data
+
+def crawl_wikipedia_sharded(article_url, base_url, max_depth, max_articles, workers=CRAWL_WORKERS,
+                            local_workers=None, frontier_path=SHARED_FRONTIER_PATH, partials_dir=PARTIALS_DIR,
+                            dump_path=None, cache_dir=None, worker_timeout=WORKER_TIMEOUT, **crawl_options):
+    """
+    Rastreo distribuido: `workers` procesos extraen URLs de una frontera SQLite
+    compartida (repartidas por hash de la URL, sin repetir ninguna) y cada uno
+    descarga, procesa y agrega sus artículos de forma independiente. Al terminar
+    se combinan los agregados parciales antes de la poda.
+
+    Los procesos `local_workers` .. `workers - 1` (si `local_workers` < `workers`)
+    se ejecutan aparte con `crawl_worker.py`, p. ej. en otras máquinas con el
+    mismo sistema de ficheros; se espera a que guarden su agregado parcial y se
+    lanza RuntimeError si alguno pasa `worker_timeout` segundos sin dar señales
+    en la frontera compartida (o sin registrarse en ella).
+
+    El conjunto de artículos es el mismo que el de un rastreo en anchura mientras
+    no se alcance `max_articles`; si se alcanza, los últimos artículos pueden
+    diferir, porque el orden de extracción depende de la velocidad de cada proceso.
+
+    Retorna:
+    - Tuple[CorpusAggregate, Dict[int, numpy.ndarray]]: Agregado combinado y
+      enlaces podados por artículo.
+    """
+    local_workers = workers if local_workers is None else local_workers
+    SharedFrontier.create(frontier_path, article_url, workers)
+    paths = [os.path.join(partials_dir, f"worker_{worker}.pkl") for worker in range(workers)]
+    for path in paths:
+        for stale in (path, path[:-len('.pkl')] + '.metrics.json'):
+            if os.path.exists(stale):
+                os.remove(stale)
+
+    print(f"Rastreo distribuido: {workers} procesos ({local_workers} locales)\n")
+    # Los procesos creados con 'fork' heredan el modelo en lugar de cargarlo cada uno
+    text_pipeline.load()
+    context = multiprocessing.get_context('fork')
+    processes = [
+        context.Process(target=run_crawl_worker, args=(worker, workers, article_url, base_url, max_depth, max_articles),
+                        kwargs=dict(frontier_path=frontier_path, partials_dir=partials_dir, dump_path=dump_path,
+                                    cache_dir=cache_dir, **crawl_options))
+        for worker in range(local_workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    failed = [worker for worker, process in enumerate(processes) if process.exitcode != 0]
+    if failed:
+        raise RuntimeError(f"Los procesos de rastreo {failed} terminaron con error")
+    # Procesos externos: esperar a que guarden su agregado parcial mientras den señales
+    started = time.time()
+    while True:
+        missing = [worker for worker, path in enumerate(paths) if not os.path.exists(path)]
+        if not missing:
+            break
+        heartbeats = SharedFrontier.heartbeats(frontier_path)
+        now = time.time()
+        lost = [worker for worker in missing if now - heartbeats.get(worker, started) > worker_timeout]
+        if lost:
+            raise RuntimeError(f"Los procesos de rastreo {lost} no han guardado su agregado parcial "
+                               f"ni dado señales en {worker_timeout} s")
+        time.sleep(1)
+    return merge_partials(paths, base_url)
+
+def refresh_wikipedia(base_url, store, max_depth, max_articles,
+                      max_in_flight=MAX_IN_FLIGHT, rate_per_host=HOST_RATE_LIMIT, burst=HOST_BURST,
+                      cache=None, fetcher=None):
+    """
+    Actualiza las redes de un rastreo anterior guardado en `store` (ArticleStore)
+    procesando solo los artículos editados, borrados o nuevos.
+
+    Las revisiones actuales se consultan por lotes en la API de MediaWiki (o en el
+    índice del volcado con `fetcher`). Los artículos con otra revisión se vuelven a
+    descargar y a procesar: sus contribuciones antiguas se restan del agregado y se
+    suman las nuevas. Los enlaces de las páginas editadas a artículos que no estaban
+    en el rastreo se siguen mientras el total no supere `max_articles`. El coste es
+    proporcional al número de artículos editados, no al tamaño del corpus.
 
-    return words_data, bigrams_data, pruned_links_data
+    Retorna:
+    - Tuple[CorpusAggregate, Dict[int, numpy.ndarray]]: Agregado actualizado y
+      enlaces podados por artículo.
+    """
+    aggregate = store.load_aggregate(window_sizes=(COOCCURRENCE_WINDOW,), base_url=base_url)
+    if aggregate is None:
+        aggregate = CorpusAggregate(window_sizes=(COOCCURRENCE_WINDOW,), base_url=base_url)
+    known = store.revisions()
+
+    # Revisiones actuales de los artículos ya procesados
+    if fetcher is not None and hasattr(fetcher, 'revision'):
+        current = {url: fetcher.revision(url) for url in known}
+    elif fetcher is None:
+        current = fetch_revisions(text_pipeline.session, base_url, known)
+    else:
+        current = {}  # Sin revisiones: se comparan tras descargar las páginas
+    deleted = [url for url, revision in current.items() if revision is None]
+    changed = [url for url, revision in known.items() if current.get(url, '') != revision and url not in deleted]
+    print(f"Artículos guardados: {len(known)}, editados: {len(changed)}, borrados: {len(deleted)}\n")
+
+    for url in deleted:
+        _, words, bigrams, _ = store.get(url)
+        aggregate.remove_article(url, words, bigrams)
+        store.delete(url)
+
+    def extract(current_url, response):
+        page = extract_page(current_url, response, base_url)
+        if page is None:
+            return None
+        text, links, page_url = page
+        revision = page_revision(response)
+        if revision == known.get(current_url):
+            print(f"Sin cambios: {current_url}")
+            return None
+        if page_url and canonical_title(page_url) != canonical_title(current_url):
+            aggregate.titles.add_redirect(current_url, page_url)
+            store.put_redirect(current_url, page_url)
+        print(f"Enlaces encontrados: {len(links)}")
+        # Solo se encolan los artículos que todavía no están en el rastreo
+        new_links = [link for link in links if link not in known]
+        return new_links, (current_url, text, links, revision)
+
+    capacity = max(0, max_articles - (len(known) - len(deleted)))
+    if changed:
+        frontier = Frontier('fifo')
+        for url in changed:
+            frontier.push(url, 0)
+            if cache is not None:
+                # Revalidar la copia en caché de los artículos editados
+                cache.expire(url)
+        if fetcher is None:
+            fetcher = ConcurrentFetcher(lambda: create_session(cache), max_in_flight=max_in_flight,
+                                        rate_per_host=rate_per_host, burst=burst, cache=cache)
+        with fetcher:
+            articles = crawl(changed[0], max_depth, len(changed) + capacity, fetcher, extract, frontier=frontier)
+            texts = (((url, links, revision), text) for url, text, links, revision in articles)
+            for (url, links, revision), words, bigrams in process_texts(texts):
+                previous = store.get(url)
+                with metrics.stage('count'):
+                    if previous is not None:
+                        aggregate.remove_article(url, previous[1], previous[2])
+                    aggregate.add_article(url, words, bigrams, links)
+                metrics.count('words_counted', len(words))
+                store.put(url, revision, words, bigrams, links)
+                print(f"{url} - Palabras extraídas: {len(words)}, Bigrams extraídos: {len(bigrams)}")
 
-def export_graph(graph, output_nodes, output_edges, graph_type='word_bigram'):
+    store.commit(aggregate)
+    pruned_links_data = prune_links(aggregate.links_data, aggregate.titles, min_freq=MIN_LINK_FREQ)
+    return aggregate, pruned_links_data
+
+def export_graph(graph, output_nodes, output_edges, graph_type='word_bigram', binary_format=GRAPH_BINARY_FORMAT):
     """
     Exporta un grafo a archivos CSV separados para nodos y aristas.
     Soporta tipos de grafo: 'word', 'bigram', 'link', 'word_bigram'.
+    Un CSRGraph se exporta por bloques directamente desde sus arrays.
+    Con `binary_format` ('npy' o 'parquet') se guarda además una copia binaria
+    por columnas que los scripts de `src/` cargan sin analizar el CSV.
+    """
+    with metrics.stage('export'):
+        _export_graph(graph, output_nodes, output_edges, graph_type, binary_format)
+    metrics.count('export_rows', graph.number_of_nodes() + graph.number_of_edges())
+
+def _export_graph(graph, output_nodes, output_edges, graph_type, binary_format):
+    if isinstance(graph, CSRGraph):
+        print(f"Exportando nodos a {output_nodes}...")
+        try:
+            graph.write_nodes_csv(output_nodes)
+        except Exception as e:
+            print(f"Error al exportar nodos a {output_nodes}: {e}")
+        print(f"Exportando aristas a {output_edges}...")
+        try:
+            graph.write_edges_csv(output_edges)
+        except Exception as e:
+            print(f"Error al exportar aristas a {output_edges}: {e}")
+    else:
+        export_networkx_graph(graph, output_nodes, output_edges, graph_type)
+
+    if binary_format:
+        try:
+            paths = write_binary(graph, output_nodes, output_edges, binary_format)
+            print(f"Copia binaria ({binary_format}) guardada en: {', '.join(sorted(set(paths)))}")
+        except Exception as e:
+            print(f"Error al guardar la copia binaria ({binary_format}) de {output_nodes}: {e}")
+
+def export_networkx_graph(graph, output_nodes, output_edges, graph_type='word_bigram'):
+    """
+    Exporta un grafo de NetworkX a archivos CSV separados para nodos y aristas.
     """
     # Asignar IDs únicos a todos los nodos
     node_ids = {node: idx+1 for idx, node in enumerate(graph.nodes())}
@@ -339,6 +1401,28 @@ def export_graph(graph, output_nodes, output_edges, graph_type='word_bigram'):
         print(f"Error al exportar aristas a {output_edges}: {e}")
 
 # === Función Principal ===
+def compute_node_metrics(n_process=METRICS_N_PROCESS, pivots=BETWEENNESS_PIVOTS, overwrite=NODE_METRICS_OVERWRITE):
+    """
+    Calcula las métricas de nodos de las dos redes exportadas con `src/node_metrics.py`,
+    con el mismo esquema que los ficheros `*_metrics_nodes.csv` de Gephi. El script
+    se ejecuta en otro proceso, como los demás de `src/`, que importan sus módulos
+    hermanos desde ese directorio.
+
+    Parámetros:
+    - overwrite (bool): Sobrescribir `*_metrics_nodes.csv`; si es False se escribe
+      `*_metrics_nodes_pipeline.csv`.
+    """
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'node_metrics.py')
+    command = [sys.executable, script, '--red', 'ambas', '--procesos', str(n_process)]
+    if pivots is not None:
+        command += ['--pivotes', str(pivots)]
+    if not overwrite:
+        command += ['--sufijo', '_pipeline']
+    print()
+    sys.stdout.flush()
+    subprocess.run(command, check=True)
+
+
 def main():
     """
     Función principal para ejecutar el scraping y la generación de las redes.
@@ -356,99 +1440,94 @@ def main():
 
         # Crear el directorio 'data' si no existe
         os.makedirs('data', exist_ok=True)
+        metrics.configure(profile_stages=PROFILE_STAGES, trace_memory=TRACE_MEMORY)
 
-        # Iniciar el scraping
-        print("Iniciando el proceso de scraping...\n")
-        words_data, bigrams_data, links_data = crawl_wikipedia(
-            article_url="https://en.wikipedia.org/wiki/Fentanyl",
-            base_url="https://en.wikipedia.org",
-            max_depth=MAX_DEPTH,
-            max_articles=MAX_ARTICLES
-        )
+        # Caché HTTP local para reutilizar las descargas entre ejecuciones
+        cache = None
+        fetcher = None
+        if DUMP_PATH:
+            print(f"Leyendo los artículos del volcado local: {DUMP_PATH}\n")
+            fetcher = open_dump(DUMP_PATH)
+        elif HTTP_CACHE_DIR:
+            cache = ResponseCache(HTTP_CACHE_DIR, ttl=HTTP_CACHE_TTL,
+                                  max_bytes=HTTP_CACHE_MAX_MB * 1024 ** 2, offline=HTTP_CACHE_OFFLINE)
+
+        store = ArticleStore(ARTICLE_STORE_PATH) if ARTICLE_STORE_PATH else None
+        # Un almacén solo se actualiza si se rastreó con los mismos parámetros
+        crawl_parameters = {'seed': "https://en.wikipedia.org/wiki/Fentanyl", 'max_depth': MAX_DEPTH,
+                            'max_articles': MAX_ARTICLES, 'dump_path': DUMP_PATH}
+        refresh = store is not None and INCREMENTAL_REFRESH and COUNTING_MODE == 'exact' and store.generation() > 0
+        if refresh and store.parameters() != crawl_parameters:
+            print("Los parámetros del rastreo guardado no coinciden con la configuración; rastreo completo.\n")
+            refresh = False
+        if refresh:
+            # Actualizar las redes del rastreo anterior con los artículos editados
+            print("Actualizando el rastreo anterior con los artículos editados...\n")
+            aggregate, links_data = refresh_wikipedia(
+                base_url="https://en.wikipedia.org",
+                store=store,
+                max_depth=MAX_DEPTH,
+                max_articles=MAX_ARTICLES,
+                cache=cache,
+                fetcher=fetcher
+            )
+        else:
+            # Iniciar el scraping
+            print("Iniciando el proceso de scraping...\n")
+            if CRAWL_WORKERS > 1:
+                # Varios procesos con una frontera compartida (sin almacén incremental)
+                aggregate, links_data = crawl_wikipedia_sharded(
+                    article_url="https://en.wikipedia.org/wiki/Fentanyl",
+                    base_url="https://en.wikipedia.org",
+                    max_depth=MAX_DEPTH,
+                    max_articles=MAX_ARTICLES,
+                    workers=CRAWL_WORKERS,
+                    dump_path=DUMP_PATH,
+                    cache_dir=None if DUMP_PATH else HTTP_CACHE_DIR
+                )
+            else:
+                if store is not None:
+                    # El rastreo completo sustituye al contenido anterior del almacén
+                    store.clear()
+                    store.set_parameters(crawl_parameters)
+                aggregate, links_data = crawl_wikipedia(
+                    article_url="https://en.wikipedia.org/wiki/Fentanyl",
+                    base_url="https://en.wikipedia.org",
+                    max_depth=MAX_DEPTH,
+                    max_articles=MAX_ARTICLES,
+                    cache=cache,
+                    fetcher=fetcher,
+                    store=store
+                )
+        if store is not None:
+            store.close()
+
+        if aggregate.sketch is not None:
+            print(aggregate.word_freq.report("Palabras"))
+            print(aggregate.bigram_freq.report("Bigramas"))
+            print(aggregate.cooccurrence.report(COOCCURRENCE_WINDOW))
+        for line in text_pipeline.report():
+            print(line)
 
-        if not words_data:
+        if not aggregate.word_freq:
             print("No se recopilaron datos de palabras.")
-        if not bigrams_data:
+        if not aggregate.bigram_freq:
             print("No se recopilaron datos de bigramas.")
         if not links_data:
             print("No se recopilaron datos de enlaces.")
 
         # Generar la red de palabras y bigramas
         print("\nGenerando la red de palabras y bigramas...")
-        G_words = nx.Graph()
-        word_freq_global = Counter()
-        edge_freq_global = Counter()
-        bigram_freq_global = Counter()
-
-        # Actualizar frecuencias de palabras y bigramas
-        for url, words in words_data:
-            word_freq = Counter(words)
-            word_freq_global.update(word_freq)
-            cooccurrence_edges = get_cooccurrence_edges(words)
-            edge_freq = Counter(cooccurrence_edges)
-            edge_freq_global.update(edge_freq)
-
-        for url, bigrams in bigrams_data:
-            bigram_freq_global.update(bigrams)
-
-        # Añadir palabras al grafo con sus frecuencias
-        for word, freq in word_freq_global.items():
-            G_words.add_node(word, Group='word', Attribute=freq)
-
-        # Añadir bigrams al grafo
-        top_bigrams = bigram_freq_global.most_common(TOP_N_BIGRAMS)
-        for bigram, freq in top_bigrams:
-            G_words.add_node(bigram, Group='bigram', Attribute=freq)
-
-        # Conectar palabras entre sí
-        for (word1, word2), freq in edge_freq_global.items():
-            if word1 in G_words.nodes and word2 in G_words.nodes:
-                G_words.add_edge(word1, word2, Type='Undirected', Weight=freq)
-
-        # Conectar bigrams con sus palabras constituyentes
-        for bigram, freq in top_bigrams:
-            split_bigram = bigram.split()
-            if len(split_bigram) != 2:
-                print(f"Bigram inválido detectado: '{bigram}'")
-                continue
-            word1, word2 = split_bigram
-            if word1 in G_words.nodes and word2 in G_words.nodes:
-                G_words.add_edge(bigram, word1, Type='Contains', Weight=1)
-                G_words.add_edge(bigram, word2, Type='Contains', Weight=1)
-            else:
-                print(f"Una o ambas palabras del bigram '{bigram}' no están en el grafo de palabras.")
-
-        # Conectar bigrams entre sí si comparten una palabra
-        print("\nConectando bigrams entre sí basados en palabras compartidas...")
-        for i in range(len(top_bigrams)):
-            for j in range(i + 1, len(top_bigrams)):
-                bigram1, freq1 = top_bigrams[i]
-                bigram2, freq2 = top_bigrams[j]
-                words1 = set(bigram1.split())
-                words2 = set(bigram2.split())
-                if words1.intersection(words2):
-                    G_words.add_edge(bigram1, bigram2, Type='Co-occurs', Weight=1)
-
-        # **Aplicar la poda de aristas basada en percentil y peso mínimo**
-        print("\nAplicando la poda de aristas basada en percentil y peso mínimo...")
-        G_words = prune_edges_by_percentile(G_words, percentile=EDGE_POD_PERCENTILE, min_weight=MIN_EDGE_WEIGHT)
-
-        # **Aplicar la poda de nodos basada en percentil y frecuencia mínima**
-        print("\nAplicando la poda de nodos basada en percentil y frecuencia mínima...")
-        G_words = prune_nodes_by_percentile(G_words, percentile=NODE_POD_PERCENTILE, min_freq=MIN_NODE_FREQ)
+        # Frecuencias de bigramas y co-ocurrencias acumuladas durante el rastreo; la poda
+        # se aplica sobre los conteos antes de insertar nada en el grafo
+        top_bigrams = aggregate.bigram_freq.most_common(TOP_N_BIGRAMS)
+        with metrics.stage('word_graph'):
+            G_words = build_word_graph(aggregate.word_freq, top_bigrams, aggregate.cooccurrence)
 
         # Generar la red de hipervínculos con poda
         print("\nGenerando la red de hipervínculos con poda...")
-        G_links = nx.DiGraph()
-        link_nodes = set()
-
-        for source, targets in links_data.items():
-            G_links.add_node(source, Group='link', Attribute=0)
-            link_nodes.add(source)
-            for target in targets:
-                G_links.add_node(target, Group='link', Attribute=0)
-                link_nodes.add(target)
-                G_links.add_edge(source, target, Type='Directed', Weight=1)
+        with metrics.stage('link_graph'):
+            G_links = build_link_graph(links_data, aggregate.titles)
 
         # Exportar la red de palabras y bigramas
         print("\nExportando la red de palabras y bigramas...")
@@ -457,15 +1536,33 @@ def main():
         # Exportar la red de hipervínculos
         print("\nExportando la red de hipervínculos...")
         export_graph(G_links, "data/links/links_nodes.csv", "data/links/links_edges.csv", graph_type='link')
+        # Tabla de títulos con los mismos Id (antes la generaba src/clean_links_csv.py)
+        aggregate.titles.write_csv("data/links/links_nodes_clean.csv", link_node_ids(links_data))
 
         print("\n=== Exportación Completada ===")
         print(f"- Nodos y Aristas de palabras y bigrams guardados en: data/words/words_bigrams_nodes.csv, data/words/words_bigrams_edges.csv")
         print(f"- Nodos de hipervínculos guardados en: data/links/links_nodes.csv")
         print(f"- Aristas de hipervínculos guardadas en: data/links/links_edges.csv")
+        print(f"- Títulos de los hipervínculos guardados en: data/links/links_nodes_clean.csv")
+
+        # Métricas de nodos (grado, excentricidad, cercanía, intermediación y comunidades)
+        if NODE_METRICS:
+            with metrics.stage('node_metrics'):
+                compute_node_metrics()
+        if cache is not None:
+            print(cache.report())
+            cache.close()
 
     except Exception as e:
         print(f"Ocurrió un error inesperado: {e}")
         sys.exit(1)
+    finally:
+        # Las métricas se guardan también si la ejecución se interrumpe
+        if METRICS_PATH:
+            print("\n=== Métricas por Etapa ===")
+            print('\n'.join(metrics.report()))
+            paths = metrics.write(METRICS_PATH, METRICS_FORMAT, rates=METRIC_RATES)
+            print(f"- Métricas guardadas en: {', '.join(paths)}")
 
 # Mover la condición principal fuera de la función main()
 if __name__ == '__main__':
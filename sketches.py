@@ -0,0 +1,613 @@
+"""
+Conteo aproximado con memoria acotada para las frecuencias de palabras,
+bigramas y co-ocurrencias.
+
+Cada contador combina tres estructuras de tamaño fijo:
+
+- Un Count-Min sketch con actualización conservadora: `depth` filas de `width`
+  contadores. La estimación de un elemento nunca es menor que su frecuencia
+  real y, con probabilidad al menos 1 - e^-depth, la supera como mucho en
+  e / width veces el total de apariciones contadas (`error_bound`).
+- Una tabla de candidatos (heavy hitters) con los `capacity` elementos de mayor
+  estimación. Cuando se llena se descartan los de menor estimación; cualquier
+  elemento con frecuencia real mayor que la mayor estimación descartada
+  (`missed_bound`) está entre los candidatos. Son los elementos que se
+  devuelven, en orden de primera aparición. Desde que entra en la tabla, cada
+  candidato se cuenta de forma exacta, así que sus frecuencias son exactas
+  mientras no se haya descartado ninguno.
+- Una muestra uniforme de `sample_size` elementos distintos (los de menor hash),
+  con la que se estiman los percentiles de poda sobre todos los elementos
+  vistos y el número de elementos distintos.
+
+`memory_mb` es el presupuesto total de cada contador: primero se reserva la
+memoria de los candidatos y de la muestra (incluidas las copias temporales al
+agruparlos y, en `SketchCounter`, el texto de cada candidato) y el resto es la
+tabla del Count-Min sketch. Si el presupuesto no cubre la reserva se lanza
+`ValueError`.
+
+Las claves se derivan de un hash estable del texto, de modo que los contadores
+de distintos procesos se pueden combinar con `merge` si usan los mismos
+parámetros. La actualización conservadora no admite restas.
+"""
+import hashlib
+import math
+from collections import Counter
+
+import numpy as np
+
+from cooccurrence import ID_BITS, ID_MASK, Vocabulary, _reduce, window_pairs
+
+# Memoria máxima medida (bytes) por candidato, por texto de candidato y por
+# elemento de la muestra, con el búfer lleno y durante la agrupación
+CANDIDATE_BYTES = 288
+NAME_BYTES = 256
+SAMPLE_BYTES = 48
+
+_GOLDEN = 0x9E3779B97F4A7C15
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+
+def _mix(keys, seed):
+    # Mezcla splitmix64 (vectorizada) de claves de 64 bits
+    x = keys.astype(np.uint64) + np.uint64((seed + 1) * _GOLDEN % 2 ** 64)
+    x ^= x >> np.uint64(30)
+    x *= _MIX1
+    x ^= x >> np.uint64(27)
+    x *= _MIX2
+    x ^= x >> np.uint64(31)
+    return x
+
+
+def string_keys(items):
+    """
+    Retorna:
+    - numpy.ndarray: Clave estable de 64 bits (int64) de cada cadena.
+    """
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=8).digest(), 'little', signed=True)
+         for item in items),
+        dtype=np.int64, count=len(items)
+    )
+
+
+def sketch_memory(memory_mb, capacity, sample_size, per_candidate=CANDIDATE_BYTES):
+    """
+    Reparte el presupuesto de un contador entre sus estructuras.
+
+    Parámetros:
+    - memory_mb (float): Presupuesto total del contador.
+    - capacity (int): Número máximo de candidatos.
+    - sample_size (int): Tamaño de la muestra.
+    - per_candidate (int): Bytes reservados por candidato.
+
+    Retorna:
+    - float: Megabytes que quedan para la tabla del Count-Min sketch.
+    """
+    reserved = (capacity * per_candidate + sample_size * SAMPLE_BYTES) / 1024 ** 2
+    if memory_mb - reserved < 1 / 1024:
+        raise ValueError(f"El presupuesto de {memory_mb} MB no cubre los {capacity} candidatos y la muestra "
+                         f"de {sample_size} elementos ({reserved:.1f} MB más la tabla del sketch)")
+    return memory_mb - reserved
+
+
+class CountMinSketch:
+    """
+    Count-Min sketch sobre claves int64.
+
+    Parámetros:
+    - width (int): Contadores por fila (se redondea a una potencia de dos).
+    - depth (int): Número de filas (funciones hash).
+    - seed (int): Semilla de las funciones hash.
+    - conservative (bool): Actualización conservadora (solo se incrementan las
+      celdas necesarias para que la estimación cubra la nueva frecuencia).
+    """
+
+    def __init__(self, width=2 ** 20, depth=4, seed=0, conservative=True):
+        self.width = 1 << max(0, int(width) - 1).bit_length()
+        self.depth = depth
+        self.seed = seed
+        self.conservative = conservative
+        self.table = np.zeros((depth, self.width), dtype=np.int64)
+        self.total = 0
+
+    @classmethod
+    def from_memory(cls, memory_mb, depth=4, seed=0, conservative=True):
+        """
+        Crea el sketch más ancho cuya tabla cabe en `memory_mb` megabytes.
+        """
+        width = max(1, int(memory_mb * 1024 ** 2) // (8 * depth))
+        return cls(1 << (width.bit_length() - 1), depth, seed, conservative)
+
+    def _cells(self, keys):
+        # Posición plana en la tabla de cada clave en cada fila: (depth, n)
+        mask = np.uint64(self.width - 1)
+        rows = [(_mix(keys, self.seed + row) & mask).astype(np.int64) + row * self.width
+                for row in range(self.depth)]
+        return np.stack(rows) if rows else np.empty((0, len(keys)), dtype=np.int64)
+
+    def add(self, keys, counts):
+        """
+        Suma `counts` apariciones a cada clave de `keys` (sin repetir).
+        """
+        if len(keys) == 0:
+            return
+        cells = self._cells(keys)
+        flat = self.table.reshape(-1)
+        if self.conservative:
+            values = np.broadcast_to(flat[cells].min(axis=0) + counts, cells.shape).ravel()
+            cells = cells.ravel()
+            # Máximo por celda cuando varias claves del lote coinciden en ella
+            sort = np.argsort(cells)
+            cells = cells[sort]
+            starts = np.flatnonzero(np.r_[True, cells[1:] != cells[:-1]])
+            cells, values = cells[starts], np.maximum.reduceat(values[sort], starts)
+            flat[cells] = np.maximum(flat[cells], values)
+        else:
+            cells = cells.ravel()
+            values = np.broadcast_to(counts, (self.depth, len(counts))).ravel()
+            unique, inverse = np.unique(cells, return_inverse=True)
+            flat[unique] += np.bincount(inverse, weights=values, minlength=len(unique)).astype(np.int64)
+        self.total += int(counts.sum())
+
+    def query(self, keys):
+        """
+        Retorna:
+        - numpy.ndarray: Estimación (cota superior) de la frecuencia de cada clave.
+        """
+        if len(keys) == 0:
+            return np.empty(0, dtype=np.int64)
+        return self.table.reshape(-1)[self._cells(keys)].min(axis=0)
+
+    def error_bound(self):
+        """
+        Error aditivo máximo de las estimaciones con probabilidad `1 - failure_probability()`.
+        """
+        return math.e / self.width * self.total
+
+    def failure_probability(self):
+        return math.exp(-self.depth)
+
+    def merge(self, other):
+        if (other.width, other.depth, other.seed) != (self.width, self.depth, self.seed):
+            raise ValueError("Solo se pueden combinar sketches con el mismo tamaño y semilla")
+        self.table += other.table
+        self.total += other.total
+        return self
+
+    def nbytes(self):
+        return self.table.nbytes
+
+
+class HeavyHitters:
+    """
+    Candidatos a elementos frecuentes: como mucho `capacity` claves, con el orden
+    de su primera aparición.
+
+    Desde que una clave entra en la tabla sus apariciones se cuentan de forma
+    exacta (`counts`); `prior` acota las que tuvo antes de entrar. Mientras no se
+    haya descartado ninguna clave, `prior` es 0 y los conteos son exactos. La
+    estimación de una clave es el mínimo entre esa cota y la del Count-Min
+    sketch, y al llenarse la tabla se descartan las de menor estimación.
+    """
+
+    def __init__(self, capacity=200_000):
+        self.capacity = capacity
+        self.keys = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+        self.prior = np.empty(0, dtype=np.int64)
+        self.orders = np.empty(0, dtype=np.int64)
+        self.buffers = []
+        self.buffered = 0
+        self.lossy = False    # Se ha descartado alguna clave vista por esta tabla
+        self.evicted_max = 0  # Mayor estimación de una clave descartada
+
+    def offer(self, keys, counts, orders, sketch, prior=None):
+        """
+        Añade al búfer las apariciones de `keys` (sin repetir) y agrupa si se llena.
+        """
+        if prior is None:
+            prior = np.zeros(len(keys), dtype=np.int64)
+        self.buffers.append((keys, counts, prior, orders))
+        self.buffered += len(keys)
+        if self.buffered >= self.capacity:
+            self.compact(sketch)
+
+    def compact(self, sketch):
+        """
+        Agrupa las claves en búfer con los candidatos y conserva las de mayor estimación.
+        """
+        if not self.buffers:
+            return
+        parts = [(self.keys, self.counts, self.prior, self.orders)] + self.buffers
+        keys, counts, prior, orders = (np.concatenate(column) for column in zip(*parts))
+        known = np.zeros(len(keys), dtype=bool)
+        known[:len(self.keys)] = True
+        self.buffers = []
+        self.buffered = 0
+
+        sort = np.argsort(keys, kind='stable')
+        keys, counts, prior, orders, known = keys[sort], counts[sort], prior[sort], orders[sort], known[sort]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        keys = keys[starts]
+        counts = np.add.reduceat(counts, starts)
+        prior = np.add.reduceat(prior, starts)
+        orders = np.minimum.reduceat(orders, starts)
+        known = np.logical_or.reduceat(known, starts)
+        estimates = sketch.query(keys)
+        if self.lossy:
+            # Claves nuevas que pudieron verse y descartarse antes: sus apariciones
+            # anteriores no superan la estimación del sketch menos las contadas
+            new = ~known
+            prior[new] = np.maximum(prior[new], estimates[new] - counts[new])
+        estimates = np.minimum(estimates, counts + prior)
+
+        if len(keys) > self.capacity:
+            # Mayor estimación primero; a igualdad, la primera aparición
+            rank = np.lexsort((orders, -estimates))
+            evicted = rank[self.capacity:]
+            self.evicted_max = max(self.evicted_max, int(estimates[evicted].max()))
+            self.lossy = True
+            kept = np.sort(rank[:self.capacity])
+            keys, counts, prior, orders = keys[kept], counts[kept], prior[kept], orders[kept]
+        self.keys, self.counts, self.prior, self.orders = keys, counts, prior, orders
+
+    def estimates(self, sketch):
+        """
+        Retorna:
+        - numpy.ndarray: Estimación (cota superior) de la frecuencia de cada candidato.
+        """
+        self.compact(sketch)
+        return np.minimum(sketch.query(self.keys), self.counts + self.prior)
+
+    def lower_bounds(self, sketch, error):
+        """
+        Retorna:
+        - numpy.ndarray: Cota inferior de la frecuencia de cada candidato: sus
+          apariciones contadas desde que entró en la tabla o, si es mayor, la
+          estimación del sketch menos su error máximo `error`.
+        """
+        self.compact(sketch)
+        return np.maximum(self.counts, sketch.query(self.keys) - math.floor(error))
+
+    def merge(self, other, keys, orders, sketch):
+        """
+        Incorpora los candidatos de `other` (con `keys` y `orders` ya traducidos a esta tabla).
+        """
+        other_lossy = other.lossy
+        # Una clave descartada en ambas tablas puede sumar las dos cotas
+        self.evicted_max += other.evicted_max
+        self.offer(keys, other.counts, orders, sketch, prior=other.prior)
+        self.compact(sketch)
+        self.lossy = self.lossy or other_lossy
+
+    def nbytes(self):
+        arrays = [self.keys, self.counts, self.prior, self.orders]
+        arrays += [column for part in self.buffers for column in part]
+        return sum(array.nbytes for array in arrays)
+
+
+class KeySample:
+    """
+    Muestra uniforme de claves distintas: las `size` de menor hash.
+    """
+
+    def __init__(self, size=10_000, seed=0):
+        self.size = size
+        self.seed = seed
+        self.keys = np.empty(0, dtype=np.int64)
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    def offer(self, keys):
+        hashes = _mix(keys, self.seed)
+        if len(self.keys) >= self.size:
+            # Solo pueden entrar las claves con hash menor que el mayor de la muestra
+            below = hashes < self.hashes[-1]
+            keys, hashes = keys[below], hashes[below]
+            if len(keys) == 0:
+                return
+        hashes, first = np.unique(np.concatenate([self.hashes, hashes]), return_index=True)
+        keys = np.concatenate([self.keys, keys])[first]
+        self.keys, self.hashes = keys[:self.size], hashes[:self.size]
+
+    def distinct(self):
+        """
+        Estimación del número de claves distintas vistas (exacto si la muestra no está llena).
+        """
+        if len(self.keys) < self.size:
+            return len(self.keys)
+        return int((self.size - 1) / (float(self.hashes[-1]) / 2.0 ** 64))
+
+    def nbytes(self):
+        return self.keys.nbytes + self.hashes.nbytes
+
+
+class SketchCounter:
+    """
+    Sustituto aproximado de `collections.Counter` para cadenas (palabras o
+    bigramas) con memoria acotada.
+
+    `items()` y `most_common()` devuelven solo los candidatos frecuentes, con
+    su frecuencia estimada.
+
+    Parámetros:
+    - memory_mb (float): Presupuesto total de memoria del contador.
+    - depth (int): Filas del sketch.
+    - capacity (int): Número máximo de candidatos.
+    - sample_size (int): Tamaño de la muestra para percentiles.
+    - seed (int): Semilla de las funciones hash.
+    """
+
+    def __init__(self, memory_mb=128, depth=4, capacity=200_000, sample_size=10_000, seed=0):
+        self.memory_mb = memory_mb
+        table_mb = sketch_memory(memory_mb, capacity, sample_size, CANDIDATE_BYTES + NAME_BYTES)
+        self.sketch = CountMinSketch.from_memory(table_mb, depth=depth, seed=seed)
+        self.candidates = HeavyHitters(capacity)
+        self.sample = KeySample(sample_size, seed=seed + depth)
+        self.names = {}  # Clave -> cadena, solo para candidatos y muestra
+        self.seen = 0
+
+    def update(self, items):
+        """
+        Cuenta una aparición de cada elemento de `items` (puede haber repetidos).
+        """
+        # Elementos distintos en orden de primera aparición: solo se calcula su hash una vez
+        counted = Counter(items)
+        if not counted:
+            return
+        names = list(counted)
+        keys = string_keys(names)
+        counts = np.fromiter(counted.values(), dtype=np.int64, count=len(names))
+        orders = np.arange(self.seen, self.seen + len(names), dtype=np.int64)
+        self.seen += len(names)
+        self.sketch.add(keys, counts)
+        self.names.update(zip(keys.tolist(), names))
+        self.sample.offer(keys)
+        self.candidates.offer(keys, counts, orders, self.sketch)
+        if not self.candidates.buffers:
+            self._forget()
+
+    def _forget(self):
+        # Solo se conservan los textos de los candidatos y de la muestra
+        keep = set(self.candidates.keys.tolist()) | set(self.sample.keys.tolist())
+        self.names = {key: name for key, name in self.names.items() if key in keep}
+
+    def _compact(self):
+        self.candidates.compact(self.sketch)
+        self._forget()
+
+    def __len__(self):
+        self._compact()
+        return len(self.candidates.keys)
+
+    def __bool__(self):
+        return self.sketch.total > 0
+
+    def __getitem__(self, item):
+        return int(self.sketch.query(string_keys([item]))[0])
+
+    def items(self):
+        """
+        Retorna:
+        - List[Tuple[str, int]]: Candidatos y su frecuencia estimada, en orden de primera aparición.
+        """
+        self._compact()
+        estimates = self.candidates.estimates(self.sketch)
+        order = np.argsort(self.candidates.orders, kind='stable')
+        keys = self.candidates.keys[order]
+        return list(zip((self.names[key] for key in keys.tolist()), estimates[order].tolist()))
+
+    def lower_bounds(self):
+        """
+        Retorna:
+        - List[Tuple[str, int]]: Candidatos y una cota inferior de su frecuencia
+          (con probabilidad `1 - failure_probability()`), en el orden de `items()`.
+        """
+        self._compact()
+        lower = self.candidates.lower_bounds(self.sketch, self.sketch.error_bound())
+        order = np.argsort(self.candidates.orders, kind='stable')
+        keys = self.candidates.keys[order]
+        return list(zip((self.names[key] for key in keys.tolist()), lower[order].tolist()))
+
+    def most_common(self, n=None):
+        items = self.items()
+        # Orden estable: a igual frecuencia, la primera aparición (como Counter)
+        items.sort(key=lambda item: item[1], reverse=True)
+        return items if n is None else items[:n]
+
+    def sample_counts(self):
+        """
+        Retorna:
+        - numpy.ndarray: Frecuencias estimadas de la muestra uniforme de elementos distintos.
+        """
+        return self.sketch.query(self.sample.keys)
+
+    def distinct(self):
+        return self.sample.distinct()
+
+    def error_bound(self):
+        return self.sketch.error_bound()
+
+    def missed_bound(self):
+        """
+        Todo elemento con frecuencia real mayor que este valor está entre los candidatos.
+        """
+        self._compact()
+        return self.candidates.evicted_max
+
+    def merge(self, other):
+        other._compact()
+        self.sketch.merge(other.sketch)
+        self.names.update(other.names)
+        self.sample.offer(other.sample.keys)
+        self.candidates.merge(other.candidates, other.candidates.keys, other.candidates.orders + self.seen,
+                              self.sketch)
+        self.seen += other.seen
+        self._compact()
+        return self
+
+    def nbytes(self):
+        # El texto de los candidatos se estima con NAME_BYTES por cadena
+        return (self.sketch.nbytes() + self.candidates.nbytes() + self.sample.nbytes()
+                + len(self.names) * NAME_BYTES)
+
+    def report(self, name):
+        """
+        Resumen de las cotas de error del contador.
+        """
+        return (f"{name} (sketch {self.sketch.depth}x{self.sketch.width}): {len(self)} candidatos de "
+                f"~{self.distinct()} distintos, error ≤ {self.error_bound():.1f} con probabilidad "
+                f"{1 - self.sketch.failure_probability():.3f}, ningún elemento con frecuencia "
+                f"> {self.missed_bound()} omitido ({self.nbytes() / 1024 ** 2:.1f} MB de "
+                f"{self.memory_mb} MB)")
+
+
+class SketchCooccurrenceCounter:
+    """
+    Sustituto aproximado de `cooccurrence.CooccurrenceCounter` con memoria
+    acotada: las co-ocurrencias de cada ventana se cuentan en un Count-Min
+    sketch y `arrays` devuelve solo los pares candidatos.
+
+    Los parámetros son los de `SketchCounter` más `window_sizes`; el
+    presupuesto `memory_mb` se reparte a partes iguales entre las ventanas.
+    """
+
+    def __init__(self, window_sizes=(5,), memory_mb=128, depth=4, capacity=200_000, sample_size=10_000, seed=0):
+        self.window_sizes = tuple(dict.fromkeys(window_sizes))
+        self.vocab = Vocabulary()
+        self.word_keys = np.empty(0, dtype=np.int64)  # Clave estable de cada palabra del vocabulario
+        self.windows_seen = {w: 0 for w in self.window_sizes}
+        self.memory_mb = memory_mb
+        table_mb = sketch_memory(memory_mb / len(self.window_sizes), capacity, sample_size)
+        self.sketches = {w: CountMinSketch.from_memory(table_mb, depth=depth, seed=seed) for w in self.window_sizes}
+        self.candidates = {w: HeavyHitters(capacity) for w in self.window_sizes}
+        self.samples = {w: KeySample(sample_size, seed=seed + depth) for w in self.window_sizes}
+
+    def _encode(self, words):
+        ids = self.vocab.encode(words)
+        if len(self.vocab) > len(self.word_keys):
+            new_tokens = self.vocab.tokens[len(self.word_keys):]
+            self.word_keys = np.concatenate([self.word_keys, string_keys(new_tokens)])
+        return ids
+
+    def _stable(self, keys):
+        # Clave del par independiente del vocabulario (para combinar contadores)
+        a = self.word_keys[keys >> ID_BITS]
+        b = self.word_keys[keys & ID_MASK]
+        low, high = np.minimum(a, b), np.maximum(a, b)
+        return (_mix(low, 0) ^ high.astype(np.uint64)).view(np.int64)
+
+    def add(self, words):
+        """
+        Añade las co-ocurrencias de la lista de palabras de un artículo.
+        """
+        ids = self._encode(words)
+        for w in self.window_sizes:
+            keys, counts, orders = window_pairs(ids, w)
+            if len(keys) == 0:
+                continue
+            orders += self.windows_seen[w] * (w * (w - 1) // 2)
+            self.windows_seen[w] += len(ids) - w + 1
+            keys, counts, orders = _reduce(keys, counts, orders)
+            stable = self._stable(keys)
+            self.sketches[w].add(stable, counts)
+            self.samples[w].offer(stable)
+            self.candidates[w].offer(keys, counts, orders, _PairSketch(self, w))
+
+    def subtract(self, words):
+        raise ValueError("El conteo aproximado no admite restar artículos; use el conteo exacto.")
+
+    def merge(self, other):
+        """
+        Suma a este contador las co-ocurrencias de `other` (con los mismos parámetros).
+        """
+        remap = self._encode(other.vocab.tokens)
+        for w in self.window_sizes:
+            if w not in other.window_sizes:
+                raise ValueError(f"El contador a combinar no tiene la ventana {w}")
+            other.candidates[w].compact(_PairSketch(other, w))
+            self.sketches[w].merge(other.sketches[w])
+            self.samples[w].offer(other.samples[w].keys)
+            keys = other.candidates[w].keys
+            a, b = remap[keys >> ID_BITS], remap[keys & ID_MASK]
+            keys = (np.minimum(a, b) << ID_BITS) | np.maximum(a, b)
+            orders = other.candidates[w].orders + self.windows_seen[w] * (w * (w - 1) // 2)
+            self.windows_seen[w] += other.windows_seen[w]
+            self.candidates[w].merge(other.candidates[w], keys, orders, _PairSketch(self, w))
+
+    def arrays(self, window_size=5):
+        """
+        Devuelve los pares candidatos en orden de primera aparición.
+
+        Retorna:
+        - Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: IDs de origen y destino
+          (según el vocabulario) y pesos estimados.
+        """
+        candidates = self.candidates[window_size]
+        estimates = candidates.estimates(_PairSketch(self, window_size))
+        sort = np.argsort(candidates.orders, kind='stable')
+        keys = candidates.keys[sort]
+        return keys >> ID_BITS, keys & ID_MASK, estimates[sort]
+
+    def lower_bounds(self, window_size=5):
+        """
+        Retorna:
+        - numpy.ndarray: Cota inferior del peso de cada par de `arrays`, en el mismo orden.
+        """
+        candidates = self.candidates[window_size]
+        pair_sketch = _PairSketch(self, window_size)
+        lower = candidates.lower_bounds(pair_sketch, self.error_bound(window_size))
+        return lower[np.argsort(candidates.orders, kind='stable')]
+
+    def to_counter(self, window_size=5):
+        """
+        Retorna:
+        - collections.Counter: {(palabra1, palabra2): peso estimado} de los pares candidatos.
+        """
+        sources, targets, weights = self.arrays(window_size)
+        tokens = self.vocab.tokens
+        counter = Counter()
+        for source, target, weight in zip(sources.tolist(), targets.tolist(), weights.tolist()):
+            word1, word2 = tokens[source], tokens[target]
+            counter[(word1, word2) if word1 <= word2 else (word2, word1)] = weight
+        return counter
+
+    def sample_weights(self, window_size=5):
+        """
+        Retorna:
+        - numpy.ndarray: Pesos estimados de una muestra uniforme de todos los pares vistos.
+        """
+        return self.sketches[window_size].query(self.samples[window_size].keys)
+
+    def distinct(self, window_size=5):
+        return self.samples[window_size].distinct()
+
+    def error_bound(self, window_size=5):
+        return self.sketches[window_size].error_bound()
+
+    def missed_bound(self, window_size=5):
+        self.candidates[window_size].compact(_PairSketch(self, window_size))
+        return self.candidates[window_size].evicted_max
+
+    def nbytes(self):
+        return sum(self.sketches[w].nbytes() + self.candidates[w].nbytes() + self.samples[w].nbytes()
+                   for w in self.window_sizes) + self.word_keys.nbytes
+
+    def report(self, window_size=5):
+        sketch = self.sketches[window_size]
+        missed = self.missed_bound(window_size)
+        return (f"Co-ocurrencias (sketch {sketch.depth}x{sketch.width}): "
+                f"{len(self.candidates[window_size].keys)} pares candidatos de ~{self.distinct(window_size)} "
+                f"distintos, error ≤ {self.error_bound(window_size):.1f} con probabilidad "
+                f"{1 - sketch.failure_probability():.3f}, ningún par con peso > {missed} omitido "
+                f"({self.nbytes() / 1024 ** 2:.1f} MB de {self.memory_mb} MB)")
+
+
+class _PairSketch:
+    # Consulta el sketch de una ventana con las claves de pares del vocabulario
+    def __init__(self, counter, window_size):
+        self.counter = counter
+        self.sketch = counter.sketches[window_size]
+
+    def query(self, keys):
+        return self.sketch.query(self.counter._stable(keys))
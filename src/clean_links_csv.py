@@ -1,12 +1,14 @@
-import pandas as pd
+# El pipeline ya escribe data/links/links_nodes_clean.csv con los títulos normalizados
+# (ver titles.TitleTable); este script solo hace falta para exportaciones anteriores.
+from graph_store import cargar_nodos
 
 # Definir el nombre del archivo de entrada y salida
 archivo_entrada = 'data/links/links_nodes.csv'
 archivo_salida = 'data/links/links_nodes_clean.csv'
 
-# Leer el archivo CSV
+# Leer el archivo CSV (o su copia binaria, si existe)
 # Se asume que el separador es una coma y que las comillas están correctamente manejadas
-df = pd.read_csv(archivo_entrada)
+df = cargar_nodos(archivo_entrada)
 
 
 
@@ -0,0 +1,281 @@
+"""
+Detección de comunidades ponderada sobre arrays CSR, sin pasar por Gephi.
+
+Algoritmos:
+- 'louvain': optimización de la modularidad por niveles (movimiento local de
+  nodos y agregación de comunidades) usando los pesos de las aristas. Al final
+  las comunidades desconectadas se dividen en sus componentes conexas, como
+  garantiza Leiden; dividirlas siempre aumenta la modularidad.
+- 'propagacion': propagación de etiquetas ponderada, más rápida pero sin
+  optimizar la modularidad de forma explícita.
+
+El grafo se trata como no dirigido: en la red de hipervínculos, los enlaces
+recíprocos se suman en una sola arista de peso 2. El resultado se escribe como
+la tabla de nodos con las columnas `modularity_class` y `degree` que consume
+`top_modularity.py`.
+
+Uso:
+    python src/community.py --nodos data/words/words_bigrams_nodes.csv \\
+        --aristas data/words/words_bigrams_edges.csv --salida data/words/words_communities_nodes.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+import graph_store
+
+METODOS = ('louvain', 'propagacion')
+
+
+def matriz_simetrica(origenes, destinos, pesos, n):
+    """
+    Construye la matriz de adyacencia simétrica en formato CSR.
+
+    Cada arista u-v aparece en las filas de u y de v; un bucle u-u se guarda una
+    vez con el doble de peso, de modo que la suma de cada fila es el grado ponderado.
+
+    Retorna:
+    - Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: offsets, vecinos y pesos.
+    """
+    origenes = np.asarray(origenes, dtype=np.int64)
+    destinos = np.asarray(destinos, dtype=np.int64)
+    pesos = np.asarray(pesos, dtype=np.float64)
+    bucles = origenes == destinos
+    filas = np.concatenate([origenes, destinos[~bucles]])
+    columnas = np.concatenate([destinos, origenes[~bucles]])
+    valores = np.concatenate([np.where(bucles, 2 * pesos, pesos), pesos[~bucles]])
+    # Agrupar aristas repetidas (p. ej. enlaces recíprocos en la red dirigida)
+    claves, inversa = np.unique(filas * n + columnas, return_inverse=True)
+    valores = np.bincount(inversa, weights=valores, minlength=len(claves))
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(claves // n, minlength=n), out=offsets[1:])
+    return offsets, claves % n, valores
+
+
+def modularidad(offsets, vecinos, pesos, clases, resolucion=1.0):
+    """
+    Calcula la modularidad ponderada de una partición (misma definición que
+    `networkx.algorithms.community.modularity`).
+    """
+    total = pesos.sum()
+    if total == 0:
+        return 0.0
+    filas = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    internas = pesos[clases[filas] == clases[vecinos]].sum()
+    grados = np.bincount(clases[filas], weights=pesos)
+    return float(internas / total - resolucion * np.sum((grados / total) ** 2))
+
+
+def _numerar(clases):
+    # Numera las comunidades 0..k-1 por orden de primera aparición
+    _, primeras, inversa = np.unique(clases, return_index=True, return_inverse=True)
+    orden = np.argsort(np.argsort(primeras, kind='stable'), kind='stable')
+    return orden[inversa]
+
+
+def _mover_nodos(offsets, vecinos, pesos, total, resolucion, rng):
+    # Fase local de Louvain: cada nodo pasa a la comunidad vecina con mayor ganancia
+    n = len(offsets) - 1
+    off = offsets.tolist()
+    vec = vecinos.tolist()
+    pes = pesos.tolist()
+    filas = np.repeat(np.arange(n), np.diff(offsets))
+    grados = np.bincount(filas, weights=pesos, minlength=n).tolist()
+    comunidad = list(range(n))
+    totales = list(grados)
+    orden = rng.permutation(n).tolist()
+    hubo_movimientos = False
+
+    while True:
+        movimientos = 0
+        for i in orden:
+            actual = comunidad[i]
+            grado = grados[i]
+            conexiones = {}
+            for p in range(off[i], off[i + 1]):
+                j = vec[p]
+                if j != i:
+                    c = comunidad[j]
+                    conexiones[c] = conexiones.get(c, 0.0) + pes[p]
+            totales[actual] -= grado
+            factor = resolucion * grado / total
+            mejor = actual
+            mejor_ganancia = conexiones.get(actual, 0.0) - factor * totales[actual]
+            for c, peso in conexiones.items():
+                ganancia = peso - factor * totales[c]
+                if ganancia > mejor_ganancia + 1e-12:
+                    mejor, mejor_ganancia = c, ganancia
+            totales[mejor] += grado
+            if mejor != actual:
+                comunidad[i] = mejor
+                movimientos += 1
+        if movimientos == 0:
+            break
+        hubo_movimientos = True
+    return np.array(comunidad, dtype=np.int64), hubo_movimientos
+
+
+def _agregar(offsets, vecinos, pesos, clases, k):
+    # Grafo de comunidades: el peso entre dos comunidades es la suma de sus aristas
+    filas = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    claves, inversa = np.unique(clases[filas] * k + clases[vecinos], return_inverse=True)
+    nuevos_pesos = np.bincount(inversa, weights=pesos, minlength=len(claves))
+    nuevos_offsets = np.zeros(k + 1, dtype=np.int64)
+    np.cumsum(np.bincount(claves // k, minlength=k), out=nuevos_offsets[1:])
+    return nuevos_offsets, claves % k, nuevos_pesos
+
+
+def _dividir_desconectadas(offsets, vecinos, clases):
+    # Etiqueta cada nodo con el menor índice alcanzable dentro de su comunidad
+    n = len(offsets) - 1
+    filas = np.repeat(np.arange(n), np.diff(offsets))
+    internas = clases[filas] == clases[vecinos]
+    filas, columnas = filas[internas], vecinos[internas]
+    etiquetas = np.arange(n)
+    while True:
+        nuevas = etiquetas.copy()
+        np.minimum.at(nuevas, filas, etiquetas[columnas])
+        if np.array_equal(nuevas, etiquetas):
+            return _numerar(etiquetas)
+        etiquetas = nuevas
+
+
+def louvain(offsets, vecinos, pesos, resolucion=1.0, semilla=None):
+    """
+    Detecta comunidades con el método de Louvain ponderado.
+
+    Parámetros:
+    - offsets, vecinos, pesos (numpy.ndarray): Matriz simétrica (ver `matriz_simetrica`).
+    - resolucion (float): Resolución de la modularidad (> 1 da comunidades más pequeñas).
+    - semilla (int): Semilla del orden de visita de los nodos, para resultados reproducibles.
+
+    Retorna:
+    - numpy.ndarray: Comunidad (0..k-1) de cada nodo.
+    """
+    rng = np.random.default_rng(semilla)
+    n = len(offsets) - 1
+    total = pesos.sum()
+    clases = np.arange(n)
+    if total == 0:
+        return clases
+    nivel = (offsets, vecinos, pesos)
+    while True:
+        comunidades, hubo_movimientos = _mover_nodos(*nivel, total, resolucion, rng)
+        comunidades = _numerar(comunidades)
+        clases = comunidades[clases]
+        k = int(comunidades.max()) + 1
+        if not hubo_movimientos or k == len(nivel[0]) - 1:
+            break
+        nivel = _agregar(*nivel, comunidades, k)
+    return _dividir_desconectadas(offsets, vecinos, clases)
+
+
+def propagacion_etiquetas(offsets, vecinos, pesos, semilla=None, max_iteraciones=100):
+    """
+    Detecta comunidades por propagación de etiquetas ponderada: cada nodo adopta
+    la etiqueta con mayor peso entre sus vecinos hasta que ninguna cambia.
+
+    Retorna:
+    - numpy.ndarray: Comunidad (0..k-1) de cada nodo.
+    """
+    rng = np.random.default_rng(semilla)
+    n = len(offsets) - 1
+    off = offsets.tolist()
+    vec = vecinos.tolist()
+    pes = pesos.tolist()
+    etiquetas = list(range(n))
+    for _ in range(max_iteraciones):
+        cambios = 0
+        for i in rng.permutation(n).tolist():
+            conteo = {}
+            for p in range(off[i], off[i + 1]):
+                j = vec[p]
+                if j != i:
+                    conteo[etiquetas[j]] = conteo.get(etiquetas[j], 0.0) + pes[p]
+            if not conteo:
+                continue
+            maximo = max(conteo.values())
+            mejores = [etiqueta for etiqueta, peso in conteo.items() if peso >= maximo - 1e-12]
+            if etiquetas[i] in mejores:
+                continue
+            etiquetas[i] = mejores[int(rng.integers(len(mejores)))]
+            cambios += 1
+        if cambios == 0:
+            break
+    return _numerar(np.array(etiquetas, dtype=np.int64))
+
+
+def cargar_aristas(nodos_df, aristas_df):
+    """
+    Convierte los Id de las aristas en posiciones de la tabla de nodos.
+
+    Retorna:
+    - Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: Orígenes, destinos y pesos.
+    """
+    indice = pd.Index(nodos_df['Id'])
+    origenes = indice.get_indexer(aristas_df['Source'])
+    destinos = indice.get_indexer(aristas_df['Target'])
+    if (origenes < 0).any() or (destinos < 0).any():
+        raise ValueError("Hay aristas cuyos extremos no están en la tabla de nodos.")
+    return origenes, destinos, aristas_df['Weight'].to_numpy(dtype=np.float64)
+
+
+def detectar_comunidades(nodos_df, aristas_df, metodo='louvain', semilla=None, resolucion=1.0):
+    """
+    Detecta las comunidades de una red exportada.
+
+    Parámetros:
+    - nodos_df, aristas_df (pandas.DataFrame): Tablas de nodos y aristas.
+    - metodo (str): 'louvain' o 'propagacion'.
+    - semilla (int): Semilla para resultados reproducibles.
+    - resolucion (float): Resolución de la modularidad (solo Louvain).
+
+    Retorna:
+    - Tuple[pandas.DataFrame, float]: Tabla de nodos con `modularity_class` y `degree`,
+      y modularidad ponderada de la partición.
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"Método desconocido '{metodo}'. Opciones: {METODOS}")
+    n = len(nodos_df)
+    origenes, destinos, pesos = cargar_aristas(nodos_df, aristas_df)
+    matriz = matriz_simetrica(origenes, destinos, pesos, n)
+    if metodo == 'louvain':
+        clases = louvain(*matriz, resolucion=resolucion, semilla=semilla)
+    else:
+        clases = propagacion_etiquetas(*matriz, semilla=semilla)
+
+    resultado = nodos_df.copy()
+    resultado['modularity_class'] = clases
+    # Grado como en Gephi/NetworkX: aristas incidentes (un bucle cuenta dos veces)
+    resultado['degree'] = np.bincount(origenes, minlength=n) + np.bincount(destinos, minlength=n)
+    return resultado, modularidad(*matriz, clases, resolucion)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detección de comunidades ponderada.")
+    parser.add_argument('--nodos', default='data/words/words_bigrams_nodes.csv')
+    parser.add_argument('--aristas', default='data/words/words_bigrams_edges.csv')
+    parser.add_argument('--salida', default='data/words/words_communities_nodes.csv')
+    parser.add_argument('--metodo', choices=METODOS, default='louvain')
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--resolucion', type=float, default=1.0)
+    args = parser.parse_args()
+
+    nodos_df, aristas_df = graph_store.cargar_datos(args.nodos, args.aristas)
+    print(f"Detectando comunidades ({args.metodo}) en {len(nodos_df)} nodos y {len(aristas_df)} aristas...\n")
+    resultado, q = detectar_comunidades(nodos_df, aristas_df, metodo=args.metodo,
+                                        semilla=args.semilla, resolucion=args.resolucion)
+    resultado.to_csv(args.salida, index=False)
+
+    tamanos = resultado['modularity_class'].value_counts()
+    print("=== Resultados Finales ===")
+    print(f"Modularidad: {q:.4f}")
+    print(f"Número de comunidades: {len(tamanos)}")
+    for clase, tamano in tamanos.head(10).items():
+        print(f" - Comunidad {clase}: {tamano} nodos")
+    print(f"\nNodos con su comunidad guardados en: {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
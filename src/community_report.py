@@ -0,0 +1,199 @@
+"""
+Informe de comunidades en una sola pasada agrupada: tamaño, porcentaje y los
+k nodos con mayor valor de cualquier columna de métricas (degree,
+betweenesscentrality, closnesscentrality...) para todas las comunidades a la vez.
+
+El fichero de métricas puede leerse por bloques (`chunksize`): de cada bloque
+solo se conservan los k mejores nodos de cada comunidad, así que la memoria no
+depende del tamaño del fichero sino de k por el número de comunidades. Los
+empates se resuelven por orden de aparición en el fichero.
+
+El informe puede guardarse en CSV (una fila por comunidad y posición) o JSON.
+
+Uso:
+    python src/community_report.py data/words/words_metrics_nodes.csv \\
+        --metricas degree betweenesscentrality --k 10 --salida data/words/words_communities_report.json
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+COLUMNA_CLASE = 'modularity_class'
+# Nombres de las métricas en el informe por consola
+NOMBRES_METRICAS = {
+    'degree': 'grado',
+    'indegree': 'grado de entrada',
+    'outdegree': 'grado de salida',
+    'Eccentricity': 'excentricidad',
+    'closnesscentrality': 'cercanía',
+    'harmonicclosnesscentrality': 'cercanía armónica',
+    'betweenesscentrality': 'intermediación',
+}
+
+
+def _top_por_clase(df, metrica, k, columna_clase):
+    # Orden estable: a igual valor se mantiene el orden del fichero
+    ordenado = df.sort_values(metrica, ascending=False, kind='stable')
+    return ordenado.groupby(columna_clase, sort=False).head(k)
+
+
+def resumir(bloques, metricas=('degree',), k=10, columna_clase=COLUMNA_CLASE):
+    """
+    Recorre una vez los bloques de la tabla de nodos y calcula el informe de comunidades.
+
+    Parámetros:
+    - bloques (Iterable[pandas.DataFrame]): Tabla de nodos completa o por bloques.
+    - metricas (Sequence[str]): Columnas por las que ordenar los nodos de cada comunidad.
+    - k (int): Número de nodos por comunidad y métrica.
+    - columna_clase (str): Columna con la comunidad de cada nodo.
+
+    Retorna:
+    - dict: 'total' (nodos), 'comunidades' (DataFrame con la clase, `size` y `share`
+      ordenado por tamaño descendente) y 'top' (métrica -> DataFrame con la clase,
+      `rank`, `Id`, `Label` y la métrica).
+    """
+    metricas = list(metricas)
+    columnas = [columna_clase, 'Id', 'Label'] + metricas
+    tamanos = pd.Series(dtype=np.int64)
+    tops = {metrica: None for metrica in metricas}
+    total = 0
+    for bloque in bloques:
+        faltan = set(columnas) - set(bloque.columns)
+        if faltan:
+            raise KeyError(f"Faltan las columnas {sorted(faltan)} en la tabla de nodos.")
+        total += len(bloque)
+        tamanos = tamanos.add(bloque[columna_clase].value_counts(sort=False), fill_value=0)
+        for metrica in metricas:
+            candidatos = bloque[[columna_clase, 'Id', 'Label', metrica]]
+            if tops[metrica] is not None:
+                # Los candidatos anteriores van delante para conservar el orden del fichero
+                candidatos = pd.concat([tops[metrica], candidatos], ignore_index=True)
+            tops[metrica] = _top_por_clase(candidatos, metrica, k, columna_clase)
+
+    comunidades = tamanos.astype(np.int64).rename_axis(columna_clase).reset_index(name='size')
+    comunidades = comunidades.sort_values(columna_clase, kind='stable')
+    comunidades = comunidades.sort_values('size', ascending=False, kind='stable').reset_index(drop=True)
+    comunidades['share'] = comunidades['size'] / total if total else 0.0
+
+    resultado = {}
+    for metrica, top in tops.items():
+        if top is None:
+            top = pd.DataFrame(columns=[columna_clase, 'Id', 'Label', metrica])
+        top = top.sort_values(columna_clase, kind='stable').reset_index(drop=True)
+        top.insert(1, 'rank', top.groupby(columna_clase).cumcount() + 1)
+        resultado[metrica] = top
+    return {'total': total, 'comunidades': comunidades, 'top': resultado, 'columna_clase': columna_clase}
+
+
+def informe_comunidades(csv_path, metricas=('degree',), k=10, chunksize=None, columna_clase=COLUMNA_CLASE):
+    """
+    Calcula el informe de comunidades de un fichero de métricas de nodos.
+
+    Parámetros:
+    - csv_path (str): Ruta al CSV de nodos con la columna de comunidad y las métricas.
+    - chunksize (int): Si se indica, el fichero se lee en bloques de este número de filas.
+
+    Retorna:
+    - dict: Ver `resumir`.
+    """
+    columnas = list(dict.fromkeys([columna_clase, 'Id', 'Label'] + list(metricas)))
+    lectura = pd.read_csv(csv_path, usecols=lambda columna: columna in columnas, chunksize=chunksize)
+    bloques = lectura if chunksize else [lectura]
+    return resumir(bloques, metricas=metricas, k=k, columna_clase=columna_clase)
+
+
+def _registros(informe):
+    # Una fila por comunidad, métrica y posición (formato largo para CSV)
+    columna_clase = informe['columna_clase']
+    tablas = []
+    for metrica, top in informe['top'].items():
+        tabla = top.rename(columns={metrica: 'value'})
+        # Sin conversión a float al mezclar métricas enteras y reales
+        tabla['value'] = tabla['value'].astype(object)
+        tabla.insert(1, 'metric', metrica)
+        tablas.append(tabla)
+    if not tablas:
+        return informe['comunidades']
+    largo = pd.concat(tablas, ignore_index=True)
+    return informe['comunidades'].merge(largo, on=columna_clase, how='left')
+
+
+def guardar_informe(informe, ruta):
+    """
+    Guarda el informe en CSV o JSON según la extensión de `ruta`.
+    """
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    if ruta.endswith('.json'):
+        columna_clase = informe['columna_clase']
+        tops = {metrica: dict(tuple(top.groupby(columna_clase))) for metrica, top in informe['top'].items()}
+        comunidades = []
+        for fila in informe['comunidades'].itertuples(index=False):
+            clase = getattr(fila, columna_clase)
+            entrada = {columna_clase: clase, 'size': fila.size, 'share': fila.share, 'top': {}}
+            for metrica, grupos in tops.items():
+                grupo = grupos.get(clase)
+                entrada['top'][metrica] = [] if grupo is None else \
+                    grupo[['Id', 'Label', metrica]].to_dict(orient='records')
+            comunidades.append(entrada)
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump({'total': informe['total'], 'communities': comunidades}, f,
+                      ensure_ascii=False, indent=2, default=lambda valor: valor.item())
+    else:
+        _registros(informe).to_csv(ruta, index=False)
+
+
+def imprimir_informe(informe, top_n=10, metrica='degree', k=10):
+    """
+    Muestra por consola las `top_n` comunidades más grandes con sus `k` nodos de mayor `metrica`.
+    """
+    comunidades = informe['comunidades']
+    columna_clase = informe['columna_clase']
+    top = informe['top'][metrica]
+    grupos = dict(tuple(top.groupby(columna_clase)))
+    # Número de comunidad: posición de la clase entre todas las clases ordenadas
+    posiciones = {clase: i for i, clase in enumerate(sorted(comunidades[columna_clase]))}
+    seleccion = comunidades.head(top_n)
+
+    print(f"\nMostrando las top {min(top_n, len(seleccion))} comunidades más relevantes por tamaño:\n")
+    for fila in seleccion.itertuples(index=False):
+        clase = getattr(fila, columna_clase)
+        print(f"=== Comunidad {posiciones[clase] + 1} ===")
+        print(f"Clase de Modularidad: {clase}")
+        print(f"Cantidad de nodos en esta clase: {fila.size}")
+        print(f"Porcentaje de la clase: {fila.share * 100:.2f}%")
+
+        if fila.size > 0:
+            print(f"\nTop {k} nodos con mayor {NOMBRES_METRICAS.get(metrica, metrica)}:")
+            print(grupos[clase].head(k)[['Id', 'Label', metrica]].to_string(index=False))
+        else:
+            print("Esta comunidad no contiene nodos.")
+
+        print("\n" + "-"*50 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Informe de comunidades en una sola pasada.")
+    parser.add_argument('csv_path', nargs='?', default='data/words/words_metrics_nodes.csv')
+    parser.add_argument('--metricas', nargs='+', default=['degree'], help="Columnas por las que ordenar los nodos")
+    parser.add_argument('--k', type=int, default=10, help="Nodos por comunidad y métrica")
+    parser.add_argument('--top', type=int, default=10, help="Comunidades a mostrar por consola")
+    parser.add_argument('--chunksize', type=int, help="Filas por bloque al leer el fichero")
+    parser.add_argument('--clase', default=COLUMNA_CLASE, help="Columna con la comunidad de cada nodo")
+    parser.add_argument('--salida', help="Fichero de salida (.csv o .json)")
+    args = parser.parse_args()
+
+    informe = informe_comunidades(args.csv_path, metricas=args.metricas, k=args.k,
+                                  chunksize=args.chunksize, columna_clase=args.clase)
+    imprimir_informe(informe, top_n=args.top, metrica=args.metricas[0], k=args.k)
+    if args.salida:
+        guardar_informe(informe, args.salida)
+        print(f"Informe guardado en: {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
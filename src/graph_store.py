@@ -0,0 +1,194 @@
+"""
+Carga de las redes exportadas por `pipeline.export_graph` para los scripts de análisis.
+
+Si junto a los CSV existe la copia binaria (`GRAPH_BINARY_FORMAT` en pipeline.py),
+se carga esa en lugar de analizar el CSV:
+- 'npy': directorio `<prefijo>.graph/` (p. ej. `data/words/words_bigrams.graph/`
+  para `words_bigrams_nodes.csv`/`words_bigrams_edges.csv`). Los arrays de aristas
+  se abren con memory-map, de modo que solo se leen de disco las páginas usadas.
+- 'parquet': `<prefijo>_nodes.parquet` y `<prefijo>_edges.parquet` (requiere pyarrow).
+Si no hay copia binaria, o el CSV es más reciente que ella, se lee el CSV como antes.
+"""
+import json
+import os
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+
+class GrafoBinario:
+    """
+    Red cargada desde el formato 'npy': columnas de nodos y aristas como arrays.
+
+    Atributos:
+    - grupos, atributos (numpy.ndarray): Código de grupo y atributo de cada nodo.
+    - origenes, destinos (numpy.ndarray): Posición (Id - 1) de los extremos de cada arista.
+    - pesos, tipos (numpy.ndarray): Peso y código de tipo de cada arista.
+    - nombres_grupos, nombres_tipos (List[str]): Tablas de nombres de los códigos.
+    - dirigido (bool): Si la red es dirigida.
+    """
+
+    def __init__(self, directorio, mmap=True):
+        modo = 'r' if mmap else None
+        with open(os.path.join(directorio, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        self.directorio = directorio
+        self.dirigido = meta['directed']
+        self.nombres_grupos = meta['group_names']
+        self.nombres_tipos = meta['type_names']
+
+        def cargar(nombre):
+            return np.load(os.path.join(directorio, nombre + '.npy'), mmap_mode=modo)
+
+        self.offsets_etiquetas = cargar('label_offsets')
+        self.grupos = cargar('groups')
+        self.atributos = cargar('attributes')
+        self.origenes = cargar('sources')
+        self.destinos = cargar('targets')
+        self.pesos = cargar('weights')
+        self.tipos = cargar('types')
+        self._etiquetas = None
+
+    def __len__(self):
+        return len(self.grupos)
+
+    def etiquetas(self):
+        """
+        Retorna:
+        - List[str]: Etiqueta de cada nodo (se decodifican una sola vez).
+        """
+        if self._etiquetas is None:
+            with open(os.path.join(self.directorio, 'labels.bin'), 'rb') as f:
+                datos = f.read()
+            offsets = self.offsets_etiquetas.tolist()
+            self._etiquetas = [
+                datos[inicio:fin].decode('utf-8') for inicio, fin in zip(offsets[:-1], offsets[1:])
+            ]
+        return self._etiquetas
+
+    def nodos_df(self):
+        """
+        Retorna:
+        - pandas.DataFrame: Columnas `Id,Label,Group,Attribute`, como el CSV de nodos.
+        """
+        return pd.DataFrame({
+            'Id': np.arange(1, len(self) + 1, dtype=np.int64),
+            'Label': self.etiquetas(),
+            'Group': pd.Categorical.from_codes(np.asarray(self.grupos), self.nombres_grupos),
+            'Attribute': self.atributos,
+        })
+
+    def aristas_df(self):
+        """
+        Retorna:
+        - pandas.DataFrame: Columnas `Source,Target,Type,Weight`, como el CSV de aristas.
+        """
+        return pd.DataFrame({
+            'Source': self.origenes.astype(np.int64) + 1,
+            'Target': self.destinos.astype(np.int64) + 1,
+            'Type': pd.Categorical.from_codes(np.asarray(self.tipos), self.nombres_tipos),
+            'Weight': self.pesos,
+        })
+
+
+def rutas_binarias(nodos_path, aristas_path):
+    """
+    Rutas de la copia binaria correspondientes a los CSV de nodos y aristas.
+
+    Retorna:
+    - Tuple[str, str, str]: Directorio 'npy' y ficheros Parquet de nodos y aristas.
+    """
+    prefijo = nodos_path[:-len('_nodes.csv')] if nodos_path.endswith('_nodes.csv') \
+        else os.path.splitext(nodos_path)[0]
+    return (
+        prefijo + '.graph',
+        os.path.splitext(nodos_path)[0] + '.parquet',
+        os.path.splitext(aristas_path)[0] + '.parquet',
+    )
+
+
+def _vigente(ruta_binaria, ruta_csv):
+    # La copia binaria se escribe después del CSV; si el CSV es posterior, se ha modificado
+    if not os.path.exists(ruta_binaria):
+        return False
+    return not os.path.exists(ruta_csv) or os.path.getmtime(ruta_binaria) >= os.path.getmtime(ruta_csv)
+
+
+def cargar_grafo_binario(nodos_path, aristas_path, mmap=True):
+    """
+    Carga la copia 'npy' de una red exportada, si existe.
+
+    Retorna:
+    - Optional[GrafoBinario]: La red, o None si no hay copia 'npy'.
+    """
+    directorio, _, _ = rutas_binarias(nodos_path, aristas_path)
+    meta = os.path.join(directorio, 'meta.json')
+    if not (_vigente(meta, nodos_path) and _vigente(meta, aristas_path)):
+        return None
+    return GrafoBinario(directorio, mmap=mmap)
+
+
+def cargar_datos(nodos_path, aristas_path):
+    """
+    Carga los nodos y aristas de una red como DataFrames con las columnas del CSV,
+    usando la copia binaria ('npy' o 'parquet') cuando existe.
+
+    Retorna:
+    - Tuple[pandas.DataFrame, pandas.DataFrame]: Nodos y aristas.
+    """
+    grafo = cargar_grafo_binario(nodos_path, aristas_path)
+    if grafo is not None:
+        return grafo.nodos_df(), grafo.aristas_df()
+    _, parquet_nodos, parquet_aristas = rutas_binarias(nodos_path, aristas_path)
+    if _vigente(parquet_nodos, nodos_path) and _vigente(parquet_aristas, aristas_path):
+        return pd.read_parquet(parquet_nodos), pd.read_parquet(parquet_aristas)
+    return pd.read_csv(nodos_path), pd.read_csv(aristas_path)
+
+
+def cargar_nodos(nodos_path):
+    """
+    Carga solo la tabla de nodos de una red (binaria si existe, si no el CSV).
+    """
+    grafo = cargar_grafo_binario(nodos_path, nodos_path)
+    if grafo is not None:
+        return grafo.nodos_df()
+    _, parquet_nodos, _ = rutas_binarias(nodos_path, nodos_path)
+    if _vigente(parquet_nodos, nodos_path):
+        return pd.read_parquet(parquet_nodos)
+    return pd.read_csv(nodos_path)
+
+
+def construir_grafo(nodos_df, aristas_df, dirigido=False):
+    """
+    Construye un grafo de NetworkX a partir de los DataFrames de nodos y aristas.
+
+    Las columnas se convierten a listas de una vez y los nodos y aristas se
+    insertan en bloque con `add_nodes_from`/`add_edges_from`, en lugar de crear
+    una Series por fila con `iterrows`. El grafo resultante (nodos por `Id` con
+    los atributos label/group/attribute y aristas con type/weight) es el mismo.
+
+    Parámetros:
+    - nodos_df (pandas.DataFrame): Columnas `Id,Label,Group,Attribute`.
+    - aristas_df (pandas.DataFrame): Columnas `Source,Target,Type,Weight`.
+    - dirigido (bool): Si es True se construye un `networkx.DiGraph`.
+
+    Retorna:
+    - networkx.Graph | networkx.DiGraph: El grafo.
+    """
+    G = nx.DiGraph() if dirigido else nx.Graph()
+    G.add_nodes_from(
+        (id_, {'label': label, 'group': group, 'attribute': attribute})
+        for id_, label, group, attribute in zip(
+            nodos_df['Id'].tolist(), nodos_df['Label'].tolist(),
+            nodos_df['Group'].tolist(), nodos_df['Attribute'].tolist()
+        )
+    )
+    G.add_edges_from(
+        (source, target, {'type': type_, 'weight': weight})
+        for source, target, type_, weight in zip(
+            aristas_df['Source'].tolist(), aristas_df['Target'].tolist(),
+            aristas_df['Type'].tolist(), aristas_df['Weight'].tolist()
+        )
+    )
+    return G
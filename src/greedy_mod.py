@@ -1,30 +1,20 @@
-import pandas as pd
 import networkx as nx
 from networkx.algorithms.community import greedy_modularity_communities
 
+import graph_store
+
 def cargar_datos(nodos_path, aristas_path):
     """
-    Carga los datos de nodos y aristas desde archivos CSV.
+    Carga los datos de nodos y aristas desde archivos CSV, o desde su copia
+    binaria si `export_graph` la ha generado (ver graph_store.py).
     """
-    nodos_df = pd.read_csv(nodos_path)
-    aristas_df = pd.read_csv(aristas_path)
-    return nodos_df, aristas_df
+    return graph_store.cargar_datos(nodos_path, aristas_path)
 
 def construir_grafo(nodos_df, aristas_df):
     """
     Construye un grafo no dirigido a partir de los DataFrames de nodos y aristas.
     """
-    G = nx.Graph()
-    
-    # Añadir nodos con sus atributos
-    for _, row in nodos_df.iterrows():
-        G.add_node(row['Id'], label=row['Label'], group=row['Group'], attribute=row['Attribute'])
-    
-    # Añadir aristas con sus atributos
-    for _, row in aristas_df.iterrows():
-        G.add_edge(row['Source'], row['Target'], type=row['Type'], weight=row['Weight'])
-    
-    return G
+    return graph_store.construir_grafo(nodos_df, aristas_df)
 
 def aplicar_modularidad_codiciosa(G):
     """
@@ -0,0 +1,332 @@
+"""
+Métricas de nodos de las redes exportadas, con el mismo esquema que los
+`*_metrics_nodes.csv` generados antes en Gephi.
+
+- Red de palabras (`words_metrics_nodes.csv`): `modularity_class`, `degree`,
+  `Eccentricity`, `closnesscentrality`, `harmonicclosnesscentrality` y
+  `betweenesscentrality`, sobre el grafo no dirigido y sin pesos, con las
+  mismas definiciones que Gephi (cercanía y cercanía armónica calculadas sobre
+  los nodos alcanzables; intermediación sin normalizar).
+- Red de hipervínculos (`links_metrics_nodes.csv`): `indegree`, `outdegree`,
+  `degree` y `modularity_class`.
+
+Las medidas de todos los pares se reparten entre procesos por particiones de
+los nodos de origen. Las distancias se calculan con BFS simultáneos de 64
+orígenes (un bit por origen) y la intermediación con el algoritmo de Brandes
+vectorizado por niveles. La intermediación puede aproximarse con una muestra
+de pivotes: con k pivotes, el error de cada nodo es menor que
+ε·n·(n-2)/2 con probabilidad 1-δ para ε = sqrt(ln(2n/δ) / (2k)) (Hoeffding con
+cota de la unión sobre los n nodos).
+
+Uso:
+    python src/node_metrics.py --red palabras --procesos 4
+    python src/node_metrics.py --red palabras --epsilon 0.05 --delta 0.1
+    python src/node_metrics.py --sufijo _pipeline   # data/*/*_metrics_nodes_pipeline.csv
+"""
+import argparse
+import math
+import multiprocessing
+import os
+
+import numpy as np
+
+import community
+import graph_store
+
+BITS = 64
+REDES = {
+    'palabras': ('data/words/words_bigrams_nodes.csv', 'data/words/words_bigrams_edges.csv',
+                 'data/words/words_metrics_nodes.csv'),
+    'enlaces': ('data/links/links_nodes.csv', 'data/links/links_edges.csv',
+                'data/links/links_metrics_nodes.csv'),
+}
+
+# Grafo compartido con los procesos del pool (se hereda con 'fork' o se recibe en el inicializador)
+_grafo = None
+
+
+def _inicializar(offsets, vecinos):
+    global _grafo
+    _grafo = (offsets, vecinos)
+
+
+def _conteos_por_bit(bits):
+    # Número de nodos con cada uno de los 64 bits activos
+    return np.unpackbits(bits.astype('<u8').view(np.uint8).reshape(-1, 8), axis=1, bitorder='little').sum(axis=0)
+
+
+def _distancias_lote(fuentes):
+    """
+    BFS simultáneo desde hasta 64 orígenes usando un bit por origen.
+
+    Retorna:
+    - Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]: Para cada
+      origen, excentricidad, nodos alcanzables, suma de distancias y suma de inversas.
+    """
+    offsets, vecinos = _grafo
+    n = len(offsets) - 1
+    b = len(fuentes)
+    excentricidad = np.zeros(b, dtype=np.int64)
+    alcanzables = np.zeros(b, dtype=np.int64)
+    suma = np.zeros(b, dtype=np.float64)
+    armonica = np.zeros(b, dtype=np.float64)
+    if len(vecinos) == 0:
+        return excentricidad, alcanzables, suma, armonica
+
+    grados = np.diff(offsets)
+    aislados = grados == 0
+    inicios = np.minimum(offsets[:-1], len(vecinos) - 1)
+    frontera = np.zeros(n, dtype=np.uint64)
+    for bit, fuente in enumerate(fuentes):
+        frontera[fuente] |= np.uint64(1) << np.uint64(bit)
+    visitados = frontera.copy()
+    distancia = 0
+    while True:
+        siguiente = np.bitwise_or.reduceat(frontera[vecinos], inicios)
+        siguiente[aislados] = 0
+        nuevos = siguiente & ~visitados
+        if not nuevos.any():
+            break
+        distancia += 1
+        visitados |= nuevos
+        frontera = nuevos
+        conteos = _conteos_por_bit(nuevos)[:b].astype(np.int64)
+        alcanzados = conteos > 0
+        excentricidad[alcanzados] = distancia
+        alcanzables += conteos
+        suma += distancia * conteos
+        armonica += conteos / distancia
+    return excentricidad, alcanzables, suma, armonica
+
+
+def _acumular(destino, indices, valores):
+    # bincount recorre los n nodos: compensa frente a np.add.at salvo en niveles muy pequeños
+    if len(indices) * 16 >= len(destino):
+        destino += np.bincount(indices, weights=valores, minlength=len(destino))
+    else:
+        np.add.at(destino, indices, valores)
+
+
+def _dependencias(fuentes):
+    """
+    Suma de las dependencias de Brandes de cada nodo para los orígenes `fuentes`.
+    """
+    offsets, vecinos = _grafo
+    n = len(offsets) - 1
+    total = np.zeros(n, dtype=np.float64)
+    for fuente in fuentes:
+        distancia = np.full(n, -1, dtype=np.int64)
+        sigma = np.zeros(n, dtype=np.float64)
+        distancia[fuente] = 0
+        sigma[fuente] = 1.0
+        frontera = np.array([fuente], dtype=np.int64)
+        niveles = []
+        d = 0
+        while len(frontera):
+            # Aristas que salen de la frontera
+            inicios = offsets[frontera]
+            cuentas = offsets[frontera + 1] - inicios
+            posiciones = np.repeat(inicios - np.cumsum(cuentas) + cuentas, cuentas) + np.arange(cuentas.sum())
+            u = np.repeat(frontera, cuentas)
+            w = vecinos[posiciones]
+            nuevos = w[distancia[w] < 0]
+            distancia[nuevos] = d + 1
+            if len(nuevos) * 16 >= n:
+                frontera = np.flatnonzero(distancia == d + 1)
+            else:
+                frontera = np.unique(nuevos)
+            # Caminos mínimos: aristas hacia el siguiente nivel
+            siguiente = distancia[w] == d + 1
+            u, w = u[siguiente], w[siguiente]
+            _acumular(sigma, w, sigma[u])
+            niveles.append((u, w))
+            d += 1
+        delta = np.zeros(n, dtype=np.float64)
+        for u, w in reversed(niveles):
+            _acumular(delta, u, sigma[u] / sigma[w] * (1.0 + delta[w]))
+        delta[fuente] = 0.0
+        total += delta
+    return total
+
+
+def _particiones(nodos, tamano):
+    return [nodos[i:i + tamano] for i in range(0, len(nodos), tamano)]
+
+
+def _mapear(funcion, tareas, offsets, vecinos, n_procesos):
+    # Ejecuta `funcion` sobre cada partición de orígenes, en paralelo si n_procesos > 1
+    if n_procesos <= 1:
+        _inicializar(offsets, vecinos)
+        return [funcion(tarea) for tarea in tareas]
+    metodos = multiprocessing.get_all_start_methods()
+    contexto = multiprocessing.get_context('fork' if 'fork' in metodos else None)
+    with contexto.Pool(n_procesos, initializer=_inicializar, initargs=(offsets, vecinos)) as pool:
+        return pool.map(funcion, tareas)
+
+
+def metricas_distancia(offsets, vecinos, n_procesos=1):
+    """
+    Excentricidad, cercanía y cercanía armónica (definiciones de Gephi) de cada nodo.
+
+    Retorna:
+    - Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: Excentricidad, cercanía
+      (alcanzables / suma de distancias) y cercanía armónica (suma de 1/d / alcanzables).
+    """
+    n = len(offsets) - 1
+    resultados = _mapear(_distancias_lote, _particiones(np.arange(n), BITS), offsets, vecinos, n_procesos)
+    if not resultados:
+        return np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0)
+    excentricidad, alcanzables, suma, armonica = (np.concatenate(columna) for columna in zip(*resultados))
+    con_alcance = alcanzables > 0
+    cercania = np.zeros(n)
+    cercania[con_alcance] = alcanzables[con_alcance] / suma[con_alcance]
+    cercania_armonica = np.zeros(n)
+    cercania_armonica[con_alcance] = armonica[con_alcance] / alcanzables[con_alcance]
+    return excentricidad, cercania, cercania_armonica
+
+
+def pivotes_necesarios(n, epsilon, delta):
+    """
+    Número de pivotes para que el error de la intermediación de todos los nodos sea
+    menor que ε·n·(n-2)/2 con probabilidad 1-δ.
+    """
+    return min(n, math.ceil(math.log(2 * n / delta) / (2 * epsilon ** 2)))
+
+
+def error_pivotes(n, pivotes, delta):
+    """
+    Cota ε del error normalizado de la intermediación estimada con `pivotes` pivotes.
+    """
+    return math.sqrt(math.log(2 * n / delta) / (2 * pivotes))
+
+
+def intermediacion(offsets, vecinos, pivotes=None, semilla=None, n_procesos=1):
+    """
+    Intermediación sin normalizar de un grafo no dirigido (como Gephi).
+
+    Parámetros:
+    - pivotes (int): Si se indica y es menor que n, se estima a partir de una
+      muestra uniforme de `pivotes` orígenes, escalada por n / pivotes.
+    - semilla (int): Semilla de la muestra de pivotes.
+    - n_procesos (int): Procesos entre los que se reparten los orígenes.
+    """
+    n = len(offsets) - 1
+    fuentes = np.arange(n)
+    escala = 1.0
+    if pivotes is not None and pivotes < n:
+        fuentes = np.sort(np.random.default_rng(semilla).choice(n, size=pivotes, replace=False))
+        escala = n / pivotes
+    tamano = max(1, math.ceil(len(fuentes) / max(1, n_procesos * 4)))
+    resultados = _mapear(_dependencias, _particiones(fuentes, tamano), offsets, vecinos, n_procesos)
+    total = np.sum(resultados, axis=0) if resultados else np.zeros(n)
+    # Cada par no ordenado se cuenta desde sus dos extremos
+    return total * escala / 2.0
+
+
+def _grados(origenes, destinos, n):
+    return np.bincount(origenes, minlength=n), np.bincount(destinos, minlength=n)
+
+
+def metricas_palabras(nodos_df, aristas_df, n_procesos=1, pivotes=None, semilla=42):
+    """
+    Calcula las métricas de la red de palabras con el esquema de `words_metrics_nodes.csv`.
+    """
+    n = len(nodos_df)
+    origenes, destinos, pesos = community.cargar_aristas(nodos_df, aristas_df)
+    matriz = community.matriz_simetrica(origenes, destinos, pesos, n)
+    offsets, vecinos, _ = matriz
+    salidas, entradas = _grados(origenes, destinos, n)
+
+    resultado = nodos_df[['Id', 'Label']].copy()
+    resultado['group'] = nodos_df['Group'].to_numpy()
+    resultado['attribute'] = nodos_df['Attribute'].to_numpy()
+    resultado['modularity_class'] = community.louvain(*matriz, semilla=semilla)
+    resultado['degree'] = salidas + entradas
+    excentricidad, cercania, cercania_armonica = metricas_distancia(offsets, vecinos, n_procesos)
+    resultado['Eccentricity'] = excentricidad
+    resultado['closnesscentrality'] = cercania.round(6)
+    resultado['harmonicclosnesscentrality'] = cercania_armonica.round(6)
+    resultado['betweenesscentrality'] = intermediacion(
+        offsets, vecinos, pivotes=pivotes, semilla=semilla, n_procesos=n_procesos
+    ).round(6)
+    return resultado
+
+
+def metricas_enlaces(nodos_df, aristas_df, semilla=42):
+    """
+    Calcula las métricas de la red de hipervínculos con el esquema de `links_metrics_nodes.csv`.
+    """
+    n = len(nodos_df)
+    origenes, destinos, pesos = community.cargar_aristas(nodos_df, aristas_df)
+    salidas, entradas = _grados(origenes, destinos, n)
+
+    resultado = nodos_df[['Id', 'Label']].copy()
+    resultado['group'] = nodos_df['Group'].to_numpy()
+    resultado['attribute'] = nodos_df['Attribute'].to_numpy()
+    resultado['indegree'] = entradas
+    resultado['outdegree'] = salidas
+    resultado['degree'] = entradas + salidas
+    resultado['modularity_class'] = community.louvain(
+        *community.matriz_simetrica(origenes, destinos, pesos, n), semilla=semilla
+    )
+    return resultado
+
+
+def ruta_salida(red, sufijo=''):
+    """
+    Ruta del fichero de métricas de `red` con `sufijo` antes de la extensión.
+    """
+    base, extension = os.path.splitext(REDES[red][2])
+    return base + sufijo + extension
+
+
+def calcular_metricas(red, n_procesos=1, pivotes=None, semilla=42, rutas=None, delta=0.1):
+    """
+    Calcula y guarda las métricas de nodos de una red ('palabras' o 'enlaces').
+
+    Parámetros:
+    - rutas (Tuple[str, str, str]): Nodos, aristas y salida (por defecto, las de `REDES`).
+    - delta (float): Probabilidad de la cota de error que se informa en el modo aproximado.
+
+    Retorna:
+    - str: Ruta del fichero de métricas escrito.
+    """
+    nodos_path, aristas_path, salida = rutas or REDES[red]
+    nodos_df, aristas_df = graph_store.cargar_datos(nodos_path, aristas_path)
+    if red == 'palabras':
+        if pivotes is not None and pivotes < len(nodos_df):
+            print(f"Intermediación aproximada con {pivotes} pivotes "
+                  f"(error < {error_pivotes(len(nodos_df), pivotes, delta):.4f}·n·(n-2)/2 con probabilidad {1 - delta:g})")
+        resultado = metricas_palabras(nodos_df, aristas_df, n_procesos=n_procesos, pivotes=pivotes, semilla=semilla)
+    else:
+        resultado = metricas_enlaces(nodos_df, aristas_df, semilla=semilla)
+    resultado.to_csv(salida, index=False)
+    return salida
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Métricas de nodos de las redes exportadas.")
+    parser.add_argument('--red', choices=list(REDES) + ['ambas'], default='ambas')
+    parser.add_argument('--procesos', type=int, default=multiprocessing.cpu_count())
+    parser.add_argument('--pivotes', type=int, help="Pivotes para la intermediación aproximada")
+    parser.add_argument('--epsilon', type=float, help="Error normalizado máximo de la intermediación aproximada")
+    parser.add_argument('--delta', type=float, default=0.1, help="Probabilidad de superar el error")
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--sufijo', default='', help="Sufijo de los ficheros de salida (por defecto se sobrescriben)")
+    args = parser.parse_args()
+
+    redes = list(REDES) if args.red == 'ambas' else [args.red]
+    for red in redes:
+        pivotes = args.pivotes
+        if args.epsilon is not None and red == 'palabras':
+            nodos_df = graph_store.cargar_nodos(REDES[red][0])
+            pivotes = pivotes_necesarios(len(nodos_df), args.epsilon, args.delta)
+        print(f"Calculando las métricas de la red de {red}...")
+        rutas = REDES[red][:2] + (ruta_salida(red, args.sufijo),)
+        salida = calcular_metricas(red, n_procesos=args.procesos, pivotes=pivotes, semilla=args.semilla,
+                                    rutas=rutas, delta=args.delta)
+        print(f"Métricas guardadas en: {salida}\n")
+
+
+if __name__ == "__main__":
+    main()
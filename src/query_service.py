@@ -0,0 +1,677 @@
+"""
+Servicio local de consultas (HTTP/JSON) sobre las redes exportadas.
+
+Cada red se carga una sola vez en un índice de adyacencia CSR guardado en
+`<prefijo>.index/` junto a sus CSV (p. ej. `data/words/words_bigrams.index/`)
+y abierto con memory-map, de modo que al arrancar de nuevo no se vuelve a leer
+el CSV. Las etiquetas se indexan en un diccionario etiqueta -> posición; los
+nodos también se encuentran sin distinguir mayúsculas y, en la red de
+hipervínculos, por su título (`Opioid` en lugar de la URL completa).
+
+La adyacencia de cada nodo se guarda ordenada por peso descendente, así que
+los k vecinos más fuertes son los k primeros. La red de hipervínculos, que es
+dirigida, tiene además la adyacencia de salida y la de entrada. Las
+comunidades (`modularity_class`) se leen de `*_communities_nodes.csv`
+(`src/community.py`) o, si no existe, de `*_metrics_nodes.csv`.
+
+Un hilo vigila los ficheros de cada red (los CSV, su copia binaria y el de
+comunidades) y, cuando `pipeline.py` escribe una nueva exportación y los
+ficheros dejan de cambiar, reconstruye el índice y lo sustituye sin detener
+el servicio. Las consultas en curso terminan con el índice anterior.
+
+Consultas (GET, respuesta JSON; `nodo` es una etiqueta o título e `id` el Id del CSV):
+- /redes: redes cargadas, tamaño y fecha de carga.
+- /nodo?red=palabras&nodo=fentanyl: grupo, atributo, grado y comunidad.
+- /vecinos?red=palabras&nodo=fentanyl&k=20[&direccion=salida]: vecinos por peso.
+- /top?red=palabras&k=20&por=grado|fuerza|atributo[&grupo=bigram]: nodos principales.
+- /ego?red=enlaces&nodo=Opioid&radio=2[&max_nodos=1000]: red ego (nodos y aristas).
+- /camino?red=enlaces&origen=Fentanyl&destino=Morphine: camino más corto en saltos.
+- /comunidad?red=palabras&nodo=fentanyl&k=10: comunidad del nodo y sus nodos de mayor grado.
+- /recargar?red=palabras (POST): reconstruye el índice sin esperar a la vigilancia.
+
+Uso:
+    python src/query_service.py --redes palabras enlaces --puerto 8765
+    curl 'http://127.0.0.1:8765/vecinos?red=palabras&nodo=fentanyl&k=10'
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+import community
+import graph_store
+
+# Red -> (nodos, aristas, ficheros de comunidades por orden de preferencia)
+REDES = {
+    'palabras': ('data/words/words_bigrams_nodes.csv', 'data/words/words_bigrams_edges.csv',
+                 ('data/words/words_communities_nodes.csv', 'data/words/words_metrics_nodes.csv')),
+    'enlaces': ('data/links/links_nodes.csv', 'data/links/links_edges.csv',
+                ('data/links/links_communities_nodes.csv', 'data/links/links_metrics_nodes.csv')),
+}
+DIRECCIONES = ('todas', 'salida', 'entrada')
+OPUESTAS = {'todas': 'todas', 'salida': 'entrada', 'entrada': 'salida'}
+CRITERIOS_TOP = ('grado', 'fuerza', 'atributo')
+MAX_K = 10_000
+MAX_NODOS_EGO = 1000
+INTERVALO_VIGILANCIA = 2.0   # Segundos entre comprobaciones de los ficheros de las redes
+INDICE_VERSION = 1
+
+
+class ConsultaInvalida(ValueError):
+    """Parámetros de una consulta incorrectos (respuesta 400)."""
+
+
+class NodoNoEncontrado(KeyError):
+    """El nodo pedido no está en la red (respuesta 404)."""
+
+
+def fuentes(nodos_path, aristas_path, comunidades=()):
+    """
+    Ficheros de los que depende el índice de una red: los CSV, su copia binaria
+    ('npy' o 'parquet') y los ficheros de comunidades.
+    """
+    directorio, parquet_nodos, parquet_aristas = graph_store.rutas_binarias(nodos_path, aristas_path)
+    return [nodos_path, aristas_path, os.path.join(directorio, 'meta.json'), parquet_nodos, parquet_aristas,
+            *comunidades]
+
+
+def firma(rutas):
+    """
+    Huella del estado de los ficheros (ruta, tamaño y fecha de modificación de los que existen).
+    """
+    h = hashlib.sha1(str(INDICE_VERSION).encode())
+    for ruta in rutas:
+        if os.path.exists(ruta):
+            estado = os.stat(ruta)
+            h.update(f"{ruta}:{estado.st_size}:{estado.st_mtime_ns};".encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+def _enteros(valores):
+    # Los pesos exportados son enteros: se guardan como tales si las sumas lo son
+    return valores.astype(np.int64) if np.array_equal(valores, np.round(valores)) else valores
+
+
+def adyacencia(origenes, destinos, pesos, n):
+    """
+    Matriz de adyacencia en formato CSR con los vecinos de cada nodo ordenados
+    por peso descendente (y por posición en caso de empate). Las aristas
+    repetidas (p. ej. un enlace recíproco en la adyacencia no dirigida) suman sus pesos.
+
+    Retorna:
+    - Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: offsets, vecinos y pesos.
+    """
+    claves, inversa = np.unique(origenes.astype(np.int64) * n + destinos, return_inverse=True)
+    pesos = np.bincount(inversa, weights=pesos, minlength=len(claves))
+    filas, vecinos = claves // n, claves % n
+    orden = np.lexsort((vecinos, -pesos, filas))
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(filas, minlength=n), out=offsets[1:])
+    return offsets, vecinos[orden].astype(np.int32), _enteros(pesos[orden])
+
+
+def _clave(texto):
+    # Clave de búsqueda sin distinguir mayúsculas; de una URL de Wikipedia solo se usa el título
+    texto = unquote(str(texto))
+    if '/wiki/' in texto:
+        texto = texto.split('/wiki/', 1)[1]
+    return texto.replace(' ', '_').lower()
+
+
+def _clases_comunidad(etiquetas, comunidades):
+    # Comunidad de cada nodo (por etiqueta, para no depender de los Id de una exportación anterior)
+    for ruta in comunidades:
+        if os.path.exists(ruta):
+            tabla = pd.read_csv(ruta, usecols=['Label', 'modularity_class'])
+            posiciones = pd.Index(etiquetas).get_indexer(tabla['Label'])
+            clases = np.full(len(etiquetas), -1, dtype=np.int64)
+            validas = posiciones >= 0
+            clases[posiciones[validas]] = tabla['modularity_class'].to_numpy()[validas]
+            return clases, ruta
+    return None, None
+
+
+def construir_indice(nodos_path, aristas_path, comunidades, directorio):
+    """
+    Construye el índice de una red y lo guarda en `directorio`.
+
+    Arrays: `ids`, `label_offsets` (+ `labels.bin`), `groups`, `attributes`,
+    `degree` (aristas incidentes, como en Gephi), `strength` (suma de pesos),
+    `modularity_class` (si hay comunidades) y la adyacencia CSR
+    `<direccion>_offsets`, `<direccion>_vecinos` y `<direccion>_pesos` para
+    'todas' y, en las redes dirigidas, 'salida' y 'entrada'. `meta.json` se
+    escribe al final: un directorio sin él está incompleto.
+    """
+    nodos_df, aristas_df = graph_store.cargar_datos(nodos_path, aristas_path)
+    n = len(nodos_df)
+    origenes, destinos, _ = community.cargar_aristas(nodos_df, aristas_df)
+    pesos = aristas_df['Weight'].to_numpy(dtype=np.float64)
+    dirigido = bool(len(aristas_df)) and str(aristas_df['Type'].iloc[0]) == 'Directed'
+    etiquetas = nodos_df['Label'].astype(str).tolist()
+    grupos = pd.Categorical(nodos_df['Group'].astype(str))
+
+    bucles = origenes == destinos
+    arrays = {
+        'ids': nodos_df['Id'].to_numpy(dtype=np.int64),
+        'groups': grupos.codes.astype(np.int8),
+        'attributes': nodos_df['Attribute'].to_numpy(),
+        'degree': np.bincount(origenes, minlength=n) + np.bincount(destinos, minlength=n),
+        'strength': _enteros(np.bincount(origenes, weights=pesos, minlength=n)
+                             + np.bincount(destinos[~bucles], weights=pesos[~bucles], minlength=n)),
+    }
+    direcciones = {'todas': (np.concatenate([origenes, destinos[~bucles]]),
+                             np.concatenate([destinos, origenes[~bucles]]),
+                             np.concatenate([pesos, pesos[~bucles]]))}
+    if dirigido:
+        direcciones['salida'] = (origenes, destinos, pesos)
+        direcciones['entrada'] = (destinos, origenes, pesos)
+    for direccion, (filas, columnas, valores) in direcciones.items():
+        offsets, vecinos, valores = adyacencia(filas, columnas, valores, n)
+        arrays.update({f'{direccion}_offsets': offsets, f'{direccion}_vecinos': vecinos,
+                       f'{direccion}_pesos': valores})
+    clases, ruta_comunidades = _clases_comunidad(etiquetas, comunidades)
+    if clases is not None:
+        arrays['modularity_class'] = clases
+
+    os.makedirs(directorio, exist_ok=True)
+    codificadas = [etiqueta.encode('utf-8') for etiqueta in etiquetas]
+    arrays['label_offsets'] = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum([len(etiqueta) for etiqueta in codificadas], out=arrays['label_offsets'][1:])
+    with open(os.path.join(directorio, 'labels.bin'), 'wb') as f:
+        f.write(b''.join(codificadas))
+    for nombre, array in arrays.items():
+        np.save(os.path.join(directorio, nombre + '.npy'), array)
+    meta = {
+        'version': INDICE_VERSION, 'nodes': n, 'edges': len(aristas_df), 'directed': dirigido,
+        'group_names': list(grupos.categories), 'directions': list(direcciones),
+        'communities': ruta_comunidades, 'sources': [nodos_path, aristas_path],
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    with open(os.path.join(directorio, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+
+def abrir_indice(nodos_path, aristas_path, comunidades=(), directorio=None):
+    """
+    Abre el índice de una red, construyéndolo antes si no existe o si los
+    ficheros de la red han cambiado desde que se construyó.
+
+    Cada versión del índice se guarda en un subdirectorio con la firma de los
+    ficheros, de modo que reconstruirlo no modifica los arrays que un índice
+    anterior tiene abiertos con memory-map; las versiones antiguas se borran.
+
+    Retorna:
+    - IndiceGrafo: El índice.
+    """
+    if directorio is None:
+        directorio = graph_store.rutas_binarias(nodos_path, aristas_path)[0][:-len('.graph')] + '.index'
+    actual = firma(fuentes(nodos_path, aristas_path, comunidades))
+    destino = os.path.join(directorio, actual)
+    if not os.path.exists(os.path.join(destino, 'meta.json')):
+        temporal = f"{destino}.{os.getpid()}.{threading.get_ident()}.tmp"
+        construir_indice(nodos_path, aristas_path, comunidades, temporal)
+        if os.path.exists(destino):
+            shutil.rmtree(destino)
+        os.replace(temporal, destino)
+    for nombre in os.listdir(directorio):
+        if nombre != actual and not nombre.endswith('.tmp'):
+            shutil.rmtree(os.path.join(directorio, nombre), ignore_errors=True)
+    return IndiceGrafo(destino, firma=actual)
+
+
+class IndiceGrafo:
+    """
+    Índice de una red abierto con memory-map, con las consultas del servicio.
+
+    Parámetros:
+    - directorio (str): Directorio escrito por `construir_indice`.
+    - firma (str): Firma de los ficheros de la red a partir de los que se construyó.
+    """
+
+    def __init__(self, directorio, firma=None):
+        with open(os.path.join(directorio, 'meta.json'), encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.directorio = directorio
+        self.firma = firma
+        self.cargado = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.dirigido = self.meta['directed']
+        self.nombres_grupos = self.meta['group_names']
+
+        def cargar(nombre):
+            return np.load(os.path.join(directorio, nombre + '.npy'), mmap_mode='r')
+
+        self.ids = cargar('ids')
+        self.grupos = cargar('groups')
+        self.atributos = cargar('attributes')
+        self.grados = cargar('degree')
+        self.fuerzas = cargar('strength')
+        self.clases = cargar('modularity_class') if self.meta['communities'] else None
+        self.adyacencias = {direccion: (cargar(f'{direccion}_offsets'), cargar(f'{direccion}_vecinos'),
+                                        cargar(f'{direccion}_pesos'))
+                            for direccion in self.meta['directions']}
+
+        with open(os.path.join(directorio, 'labels.bin'), 'rb') as f:
+            datos = f.read()
+        offsets = cargar('label_offsets').tolist()
+        self.etiquetas = [datos[inicio:fin].decode('utf-8') for inicio, fin in zip(offsets[:-1], offsets[1:])]
+        self.posiciones = {etiqueta: posicion for posicion, etiqueta in enumerate(self.etiquetas)}
+        self.alias = {}
+        for posicion, etiqueta in enumerate(self.etiquetas):
+            self.alias.setdefault(_clave(etiqueta), posicion)
+        self.posiciones_id = {id_: posicion for posicion, id_ in enumerate(self.ids.tolist())}
+
+    def __len__(self):
+        return len(self.etiquetas)
+
+    def info(self):
+        return {'nodes': len(self), 'edges': self.meta['edges'], 'directed': self.dirigido,
+                'groups': self.nombres_grupos, 'communities': self.meta['communities'],
+                'built': self.meta['created'], 'loaded': self.cargado}
+
+    def buscar(self, nodo=None, id_=None):
+        """
+        Posición de un nodo por su etiqueta (o título, sin distinguir mayúsculas) o por su Id.
+        """
+        if id_ is not None:
+            posicion = self.posiciones_id.get(id_)
+        elif nodo is not None:
+            posicion = self.posiciones.get(nodo)
+            if posicion is None:
+                posicion = self.alias.get(_clave(nodo))
+        else:
+            raise ConsultaInvalida("Falta el parámetro 'nodo' o 'id'")
+        if posicion is None:
+            raise NodoNoEncontrado(f"El nodo '{nodo if id_ is None else id_}' no está en la red")
+        return posicion
+
+    def _adyacencia(self, direccion):
+        if direccion not in self.adyacencias:
+            raise ConsultaInvalida(f"Dirección '{direccion}' no disponible; opciones: {list(self.adyacencias)}")
+        return self.adyacencias[direccion]
+
+    def nodo(self, posicion):
+        registro = {
+            'Id': int(self.ids[posicion]),
+            'Label': self.etiquetas[posicion],
+            'Group': self.nombres_grupos[self.grupos[posicion]],
+            'Attribute': self.atributos[posicion].item(),
+            'degree': int(self.grados[posicion]),
+            'strength': self.fuerzas[posicion].item(),
+        }
+        if self.clases is not None:
+            registro['modularity_class'] = int(self.clases[posicion])
+        return registro
+
+    def vecinos(self, posicion, k=20, direccion='todas'):
+        """
+        Retorna:
+        - dict: El nodo y sus `k` vecinos de mayor peso (`Weight`), con el total de vecinos.
+        """
+        offsets, vecinos, pesos = self._adyacencia(direccion)
+        inicio, fin = int(offsets[posicion]), int(offsets[posicion + 1])
+        tope = min(fin, inicio + k)
+        resultado = [dict(self.nodo(vecino), Weight=peso)
+                     for vecino, peso in zip(vecinos[inicio:tope].tolist(), pesos[inicio:tope].tolist())]
+        return {'node': self.nodo(posicion), 'direction': direccion, 'total': fin - inicio, 'neighbors': resultado}
+
+    def top(self, k=20, por='grado', grupo=None):
+        """
+        Retorna:
+        - dict: Los `k` nodos de mayor grado, fuerza (suma de pesos) o atributo, opcionalmente de un grupo.
+        """
+        if por not in CRITERIOS_TOP:
+            raise ConsultaInvalida(f"Criterio '{por}' desconocido; opciones: {CRITERIOS_TOP}")
+        valores = {'grado': self.grados, 'fuerza': self.fuerzas, 'atributo': self.atributos}[por]
+        candidatos = np.arange(len(self))
+        if grupo is not None:
+            if grupo not in self.nombres_grupos:
+                raise ConsultaInvalida(f"Grupo '{grupo}' desconocido; opciones: {self.nombres_grupos}")
+            candidatos = np.flatnonzero(np.asarray(self.grupos) == self.nombres_grupos.index(grupo))
+        valores = np.asarray(valores)[candidatos]
+        if k < len(candidatos):
+            seleccion = np.argpartition(-valores, k)[:k]
+        else:
+            seleccion = np.arange(len(candidatos))
+        seleccion = seleccion[np.lexsort((seleccion, -valores[seleccion]))]
+        return {'by': por, 'group': grupo, 'nodes': [self.nodo(posicion) for posicion in candidatos[seleccion].tolist()]}
+
+    @staticmethod
+    def _entradas(offsets, frontera):
+        # Posiciones en la adyacencia de todos los vecinos de la frontera y el nodo
+        # del que procede cada una, sin bucles de Python
+        inicios = np.asarray(offsets[frontera])
+        longitudes = np.asarray(offsets[frontera + 1]) - inicios
+        total = int(longitudes.sum())
+        desplazamientos = np.repeat(inicios - (np.cumsum(longitudes) - longitudes), longitudes)
+        return desplazamientos + np.arange(total), np.repeat(frontera, longitudes)
+
+    def ego(self, posicion, radio=1, max_nodos=MAX_NODOS_EGO, direccion='todas'):
+        """
+        Red ego del nodo: los nodos a distancia <= `radio` (como mucho `max_nodos`,
+        los más cercanos y, dentro de un nivel, en el orden de peso de sus vecinos)
+        y las aristas entre ellos.
+        """
+        offsets, vecinos, _ = self._adyacencia(direccion)
+        distancias = np.full(len(self), -1, dtype=np.int64)
+        distancias[posicion] = 0
+        seleccion = [np.array([posicion], dtype=np.int64)]
+        frontera = seleccion[0]
+        total, truncado = 1, False
+        for distancia in range(1, radio + 1):
+            entradas, _ = self._entradas(offsets, frontera)
+            alcanzados = np.asarray(vecinos[entradas], dtype=np.int64)
+            alcanzados = alcanzados[distancias[alcanzados] < 0]
+            # Primer alcance de cada nodo, en orden de aparición
+            nuevos, primeros = np.unique(alcanzados, return_index=True)
+            frontera = nuevos[np.argsort(primeros)]
+            if total + len(frontera) > max_nodos:
+                # El nodo central siempre se incluye, aunque `max_nodos` sea menor que 1
+                frontera = frontera[:max(0, max_nodos - total)]
+                truncado = True
+            distancias[frontera] = distancia
+            seleccion.append(frontera)
+            total += len(frontera)
+            if truncado or not len(frontera):
+                break
+        nodos = np.concatenate(seleccion)
+
+        # Aristas entre los nodos seleccionados (en la red no dirigida, una vez cada una)
+        aristas_direccion = 'salida' if self.dirigido else 'todas'
+        offsets, vecinos, pesos = self.adyacencias[aristas_direccion]
+        entradas, origenes = self._entradas(offsets, nodos)
+        destinos, pesos_aristas = np.asarray(vecinos[entradas], dtype=np.int64), pesos[entradas]
+        dentro = distancias[destinos] >= 0
+        if not self.dirigido:
+            dentro &= origenes <= destinos
+        aristas = [{'Source': int(self.ids[u]), 'Target': int(self.ids[v]), 'Weight': w}
+                   for u, v, w in zip(origenes[dentro].tolist(), destinos[dentro].tolist(),
+                                      pesos_aristas[dentro].tolist())]
+        return {
+            'center': self.nodo(posicion), 'radius': radio, 'direction': direccion, 'truncated': truncado,
+            'nodes': [dict(self.nodo(nodo), distance=int(distancias[nodo])) for nodo in nodos.tolist()],
+            'edges': aristas,
+        }
+
+    def camino(self, origen, destino, direccion='todas'):
+        """
+        Camino más corto en número de saltos. La búsqueda en anchura avanza por
+        niveles desde los dos extremos (en sentido contrario desde el destino),
+        expandiendo cada vez la frontera con menos aristas, hasta que se encuentran.
+
+        Retorna:
+        - dict: Nodos del camino y peso de cada salto; `path` es None si no hay camino.
+        """
+        offsets, vecinos, pesos = self._adyacencia(direccion)
+        lados = []
+        for inicio, sentido in ((origen, direccion), (destino, OPUESTAS[direccion])):
+            previos = np.full(len(self), -1, dtype=np.int64)   # nodo anterior en la búsqueda de ese lado
+            distancias = np.full(len(self), -1, dtype=np.int64)
+            previos[inicio], distancias[inicio] = inicio, 0
+            lados.append([self._adyacencia(sentido), previos, distancias, np.array([inicio], dtype=np.int64)])
+        encuentro = origen if origen == destino else -1
+        while encuentro < 0 and all(len(lado[3]) for lado in lados):
+            aristas = [int(np.sum(lado[0][0][lado[3] + 1] - lado[0][0][lado[3]])) for lado in lados]
+            lado, otro = (lados[0], lados[1]) if aristas[0] <= aristas[1] else (lados[1], lados[0])
+            (offsets_lado, vecinos_lado, _), previos, distancias, frontera = lado
+            entradas, procedencias = self._entradas(offsets_lado, frontera)
+            alcanzados = np.asarray(vecinos_lado[entradas], dtype=np.int64)
+            nuevos = previos[alcanzados] < 0
+            alcanzados, procedencias = alcanzados[nuevos], procedencias[nuevos]
+            frontera, primeros = np.unique(alcanzados, return_index=True)
+            previos[frontera] = procedencias[primeros]
+            distancias[frontera] = distancias[procedencias[primeros]] + 1
+            lado[3] = frontera
+            comunes = frontera[otro[2][frontera] >= 0]
+            if len(comunes):
+                # El nivel está completo: el camino más corto pasa por el nodo común más cercano al otro extremo
+                encuentro = int(comunes[np.argmin(otro[2][comunes])])
+        resultado = {'source': self.nodo(origen), 'target': self.nodo(destino), 'direction': direccion}
+        if encuentro < 0:
+            return dict(resultado, hops=None, path=None)
+        camino = [encuentro]
+        while camino[-1] != origen:
+            camino.append(int(lados[0][1][camino[-1]]))
+        camino.reverse()
+        while camino[-1] != destino:
+            camino.append(int(lados[1][1][camino[-1]]))
+        saltos = []
+        for u, v in zip(camino[:-1], camino[1:]):
+            inicio, fin = int(offsets[u]), int(offsets[u + 1])
+            posicion = inicio + int(np.flatnonzero(np.asarray(vecinos[inicio:fin]) == v)[0])
+            saltos.append(pesos[posicion].item())
+        return dict(resultado, hops=len(camino) - 1,
+                    path=[self.nodo(nodo) for nodo in camino], weights=saltos)
+
+    def comunidad(self, posicion, k=10):
+        """
+        Retorna:
+        - dict: Comunidad del nodo, su tamaño y proporción, y sus `k` nodos de mayor grado.
+        """
+        if self.clases is None:
+            raise NodoNoEncontrado("La red no tiene comunidades: ejecuta src/community.py o src/node_metrics.py")
+        clase = int(self.clases[posicion])
+        if clase < 0:
+            raise NodoNoEncontrado(f"El nodo '{self.etiquetas[posicion]}' no tiene comunidad asignada")
+        miembros = np.flatnonzero(np.asarray(self.clases) == clase)
+        grados = np.asarray(self.grados)[miembros]
+        orden = np.lexsort((miembros, -grados))[:k]
+        return {
+            'node': self.nodo(posicion), 'modularity_class': clase, 'size': len(miembros),
+            'share': len(miembros) / len(self),
+            'top': [self.nodo(miembro) for miembro in miembros[orden].tolist()],
+        }
+
+
+class ServicioConsultas:
+    """
+    Índices de las redes y su recarga cuando cambian los ficheros.
+
+    Parámetros:
+    - redes (Dict[str, Tuple[str, str, Tuple[str, ...]]]): Red -> (nodos, aristas, comunidades), como `REDES`.
+    """
+
+    def __init__(self, redes):
+        self.redes = redes
+        self.indices = {}
+        self._firmas_vistas = {}
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        for red in redes:
+            self.recargar(red)
+
+    def recargar(self, red):
+        """
+        Abre (o reconstruye) el índice de `red` y lo sustituye por el actual.
+        Si falla (p. ej. un CSV a medio escribir), se conserva el anterior.
+        """
+        nodos_path, aristas_path, comunidades = self.redes[red]
+        with self._lock:
+            inicio = time.perf_counter()
+            try:
+                indice = abrir_indice(nodos_path, aristas_path, comunidades)
+            except Exception as e:
+                print(f"Error al cargar la red '{red}': {e}")
+                return False
+            anterior = self.indices.get(red)
+            self.indices[red] = indice
+        if anterior is None or anterior.firma != indice.firma:
+            print(f"Red '{red}' cargada: {len(indice)} nodos, {indice.meta['edges']} aristas "
+                  f"({time.perf_counter() - inicio:.2f} s)")
+        return True
+
+    def comprobar(self):
+        """
+        Recarga las redes cuyos ficheros han cambiado y llevan una comprobación
+        sin cambiar (la exportación ha terminado de escribirlos).
+        """
+        for red, (nodos_path, aristas_path, comunidades) in self.redes.items():
+            actual = firma(fuentes(nodos_path, aristas_path, comunidades))
+            anterior = self._firmas_vistas.get(red)
+            self._firmas_vistas[red] = actual
+            indice = self.indices.get(red)
+            if actual == anterior and (indice is None or indice.firma != actual):
+                self.recargar(red)
+
+    def vigilar(self, intervalo=INTERVALO_VIGILANCIA):
+        """
+        Comprueba los ficheros cada `intervalo` segundos en un hilo en segundo plano.
+        """
+        def bucle():
+            while not self._parar.wait(intervalo):
+                self.comprobar()
+        hilo = threading.Thread(target=bucle, daemon=True)
+        hilo.start()
+        return hilo
+
+    def detener(self):
+        self._parar.set()
+
+    def consultar(self, ruta, parametros):
+        """
+        Resuelve una consulta.
+
+        Parámetros:
+        - ruta (str): Consulta ('/vecinos', '/ego'...).
+        - parametros (Dict[str, str]): Parámetros de la URL.
+
+        Retorna:
+        - dict: Respuesta.
+        """
+        if ruta == '/redes':
+            return {red: dict(indice.info(), files=self.redes[red][:2]) for red, indice in self.indices.items()}
+        red = parametros.get('red', next(iter(self.redes)))
+        if red not in self.redes:
+            raise ConsultaInvalida(f"Red '{red}' desconocida; opciones: {list(self.redes)}")
+        if ruta == '/recargar':
+            return {'reloaded': self.recargar(red), **self.indices[red].info()}
+        indice = self.indices.get(red)
+        if indice is None:
+            raise NodoNoEncontrado(f"La red '{red}' no está cargada")
+
+        def entero(nombre, defecto, maximo=MAX_K, minimo=0):
+            try:
+                valor = int(parametros.get(nombre, defecto))
+            except ValueError:
+                raise ConsultaInvalida(f"El parámetro '{nombre}' debe ser un entero")
+            if not minimo <= valor <= maximo:
+                raise ConsultaInvalida(f"El parámetro '{nombre}' debe estar entre {minimo} y {maximo}")
+            return valor
+
+        def nodo(nombre='nodo'):
+            # El nodo se indica por etiqueta (`nodo`, `origen`...) o por Id (`id`, `origen_id`...)
+            nombre_id = 'id' if nombre == 'nodo' else f'{nombre}_id'
+            if nombre_id in parametros:
+                return indice.buscar(id_=entero(nombre_id, 0, 2 ** 62))
+            if nombre not in parametros:
+                raise ConsultaInvalida(f"Falta el parámetro '{nombre}' o '{nombre_id}'")
+            return indice.buscar(parametros[nombre])
+
+        direccion = parametros.get('direccion')
+        if direccion is not None and direccion not in DIRECCIONES:
+            raise ConsultaInvalida(f"Dirección '{direccion}' desconocida; opciones: {DIRECCIONES}")
+        if ruta == '/nodo':
+            return indice.nodo(nodo())
+        if ruta == '/vecinos':
+            return indice.vecinos(nodo(), k=entero('k', 20), direccion=direccion or 'todas')
+        if ruta == '/top':
+            return indice.top(k=entero('k', 20), por=parametros.get('por', 'grado'), grupo=parametros.get('grupo'))
+        if ruta == '/ego':
+            return indice.ego(nodo(), radio=entero('radio', 1, 10),
+                              max_nodos=entero('max_nodos', MAX_NODOS_EGO, minimo=1),
+                              direccion=direccion or 'todas')
+        if ruta == '/camino':
+            # En la red de hipervínculos el camino sigue por defecto el sentido de los enlaces
+            defecto = 'salida' if indice.dirigido else 'todas'
+            return indice.camino(nodo('origen'), nodo('destino'), direccion=direccion or defecto)
+        if ruta == '/comunidad':
+            return indice.comunidad(nodo(), k=entero('k', 10))
+        raise NodoNoEncontrado(f"Consulta desconocida: {ruta}")
+
+
+class ManejadorConsultas(BaseHTTPRequestHandler):
+    servicio = None
+
+    def do_GET(self):
+        partes = urlsplit(self.path)
+        if partes.path == '/recargar':
+            self.responder(405, {'error': "Usa POST para /recargar"})
+            return
+        self.atender(partes)
+
+    def do_POST(self):
+        self.atender(urlsplit(self.path))
+
+    def atender(self, partes):
+        parametros = {nombre: valores[-1] for nombre, valores in parse_qs(partes.query).items()}
+        inicio = time.perf_counter()
+        try:
+            respuesta = self.servicio.consultar(partes.path.rstrip('/') or '/redes', parametros)
+        except ConsultaInvalida as e:
+            self.responder(400, {'error': str(e)})
+            return
+        except NodoNoEncontrado as e:
+            self.responder(404, {'error': e.args[0]})
+            return
+        except Exception as e:
+            self.responder(500, {'error': f"{type(e).__name__}: {e}"})
+            return
+        respuesta['elapsed_ms'] = (time.perf_counter() - inicio) * 1000
+        self.responder(200, respuesta)
+
+    def responder(self, estado, contenido):
+        cuerpo = json.dumps(contenido, ensure_ascii=False).encode('utf-8')
+        self.send_response(estado)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def iniciar_servidor(servicio, host='127.0.0.1', puerto=8765):
+    """
+    Arranca el servidor HTTP en un hilo en segundo plano.
+
+    Retorna:
+    - Tuple[ThreadingHTTPServer, str]: El servidor y su URL base.
+    """
+    manejador = type('Manejador', (ManejadorConsultas,), {'servicio': servicio})
+    servidor = ThreadingHTTPServer((host, puerto), manejador)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://{host}:{servidor.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio local de consultas sobre las redes exportadas.")
+    parser.add_argument('--redes', nargs='+', choices=list(REDES), default=list(REDES))
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--intervalo', type=float, default=INTERVALO_VIGILANCIA,
+                        help="Segundos entre comprobaciones de los ficheros (0 para no recargar)")
+    args = parser.parse_args()
+
+    servicio = ServicioConsultas({red: REDES[red] for red in args.redes})
+    if args.intervalo > 0:
+        servicio.vigilar(args.intervalo)
+    servidor, url = iniciar_servidor(servicio, args.host, args.puerto)
+    print(f"Servicio de consultas escuchando en {url} (p. ej. {url}/vecinos?red={args.redes[0]}&nodo=...)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        servicio.detener()
+        servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
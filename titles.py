@@ -0,0 +1,147 @@
+"""
+Canonicalización e internado de los títulos de los artículos enlazados.
+
+Cada enlace se reduce una sola vez a su título normalizado (sin codificación
+porcentual ni fragmento, con guiones bajos y la primera letra en mayúscula,
+como MediaWiki) y se asocia a un identificador entero. Los conjuntos de
+enlaces, los contadores y las aristas de la red de hipervínculos se guardan
+como arrays de enteros en lugar de URLs completas, y las variantes de un mismo
+título (codificadas de otra forma o redirecciones) comparten identificador.
+"""
+import csv
+import re
+
+import numpy as np
+
+from dump_reader import title_to_url, url_to_title
+
+CANONICAL_LINK_RE = re.compile(rb'<link\b[^>]*\brel="canonical"[^>]*\bhref="([^"]+)"')
+
+
+def canonical_title(url):
+    """
+    Título normalizado de la URL (o título) de un artículo.
+    """
+    return url_to_title(url.split('#', 1)[0])
+
+
+def canonical_url(url, base_url):
+    """
+    URL canónica de un artículo: la de su título normalizado.
+    """
+    return title_to_url(canonical_title(url), base_url)
+
+
+def canonical_link(content):
+    """
+    URL del `<link rel="canonical">` de una página HTML (Wikipedia sirve las
+    redirecciones con el contenido del destino y su URL canónica), o None.
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    match = CANONICAL_LINK_RE.search(content)
+    return match.group(1).decode('utf-8') if match else None
+
+
+class TitleTable:
+    """
+    Tabla de títulos internados: título normalizado <-> identificador entero.
+
+    Parámetros:
+    - base_url (str): URL base con la que se reconstruyen las URLs de los artículos.
+    """
+
+    def __init__(self, base_url='https://en.wikipedia.org'):
+        self.base_url = base_url
+        self.titles = []
+        self.ids = {}
+        self.redirects = {}  # Identificador de una redirección -> identificador del destino
+        self._raw = {}       # Caché de URL sin normalizar -> identificador
+
+    def __len__(self):
+        return len(self.titles)
+
+    def intern(self, url):
+        """
+        Retorna:
+        - int: Identificador del título de `url` (se crea si no existía).
+        """
+        title_id = self._raw.get(url)
+        if title_id is None:
+            title_id = self._raw[url] = self._intern_title(canonical_title(url))
+        return title_id
+
+    def _intern_title(self, title):
+        title_id = self.ids.get(title)
+        if title_id is None:
+            title_id = self.ids[title] = len(self.titles)
+            self.titles.append(title)
+        return title_id
+
+    def intern_many(self, urls):
+        """
+        Retorna:
+        - numpy.ndarray: Identificadores (int32, ordenados y sin repetir) de `urls`.
+        """
+        ids = np.fromiter((self.intern(url) for url in urls), dtype=np.int32)
+        return np.unique(ids)
+
+    def add_redirect(self, source_url, target_url):
+        """
+        Registra que `source_url` redirige a `target_url`; ambos títulos pasan a ser el mismo nodo.
+        """
+        source, target = self.intern(source_url), self.intern(target_url)
+        if source != target:
+            self.redirects[source] = target
+
+    def canonical_ids(self):
+        """
+        Retorna:
+        - numpy.ndarray: Para cada identificador, el de su destino tras seguir las redirecciones.
+        """
+        canonical = np.arange(len(self.titles), dtype=np.int32)
+        for source in self.redirects:
+            target, seen = self.redirects[source], {source}
+            while target in self.redirects and target not in seen:
+                seen.add(target)
+                target = self.redirects[target]
+            canonical[source] = target
+        return canonical
+
+    def title(self, title_id):
+        return self.titles[title_id]
+
+    def url(self, title_id):
+        return title_to_url(self.titles[title_id], self.base_url)
+
+    def merge(self, other):
+        """
+        Incorpora los títulos y redirecciones de otra tabla.
+
+        Retorna:
+        - numpy.ndarray: Identificador en esta tabla de cada identificador de `other`.
+        """
+        mapping = np.fromiter((self._intern_title(title) for title in other.titles), dtype=np.int32,
+                              count=len(other.titles))
+        for source, target in other.redirects.items():
+            if mapping[source] != mapping[target]:
+                self.redirects[int(mapping[source])] = int(mapping[target])
+        return mapping
+
+    def write_csv(self, path, title_ids, group='link', attribute=0):
+        """
+        Exporta los títulos de `title_ids` como tabla de nodos (Id, Label, Group,
+        Attribute), con los mismos Id que la red exportada y el título como Label.
+        """
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Id', 'Label', 'Group', 'Attribute'])
+            writer.writerows(
+                (i, self.titles[title_id], group, attribute) for i, title_id in enumerate(title_ids, start=1)
+            )
+
+    def __getstate__(self):
+        # La caché de URLs sin normalizar se reconstruye bajo demanda
+        state = self.__dict__.copy()
+        state['_raw'] = {}
+        return state